@@ -4,6 +4,8 @@ from app.models.place import Place
 class Amenity(BaseModel):
     """Represents an amenity that can be associated with a place."""
 
+    __slots__ = ('name', 'place_id', 'user_id')
+
     def __init__(self, name, place_id):
         super().__init__()  # Call BaseModel to generate ID and timestamps
 
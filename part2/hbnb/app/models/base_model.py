@@ -1,21 +1,73 @@
+import time
 import uuid
+import weakref
 from datetime import datetime
 
+def _timestamp(slot):
+    """Property exposing integer microseconds since the epoch, kept in `slot`, as a local datetime."""
+    def get(self):
+        micros = getattr(self, slot)
+        return datetime.fromtimestamp(micros // 1000000).replace(microsecond=micros % 1000000)
+
+    def set(self, value):
+        setattr(self, slot, int(value.replace(microsecond=0).timestamp()) * 1000000 + value.microsecond)
+    return property(get, set)
+
+def _now():
+    return time.time_ns() // 1000
+
 class BaseModel:
-    """A base class for all models to handle common attributes and methods."""
+    """
+    A base class for all models to handle common attributes and methods.
+
+    Models are kept by the million in the in-memory repositories, so they use
+    __slots__ (subclasses must declare theirs too) and store the id as its 16
+    raw UUID bytes and the timestamps as integer microseconds. The public id,
+    created_at and updated_at are built from those on access.
+    """
 
-    _instances = {}  # Store instances in memory
+    __slots__ = ('_uuid', '_created', '_updated', '__weakref__')
+
+    # Live instances by storage key, one registry per class. The repositories own the
+    # objects; the registry only holds weak references, so an object deleted from
+    # its repository is freed instead of being kept alive here forever.
+    _instances = weakref.WeakValueDictionary()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._instances = weakref.WeakValueDictionary()
 
     def __init__(self):
-        self.id = str(uuid.uuid4())  # Store UUID as a string
-        self.created_at = datetime.now()
-        self.updated_at = datetime.now()
+        self._uuid = uuid.uuid4().bytes
+        self._created = self._updated = _now()
+
+        self._instances[self._uuid] = self  # Register instance in its class's registry
 
-        self._instances[self.id] = self  # Register instance
+    @property
+    def id(self):
+        """The id as a canonical UUID string."""
+        digits = self._uuid.hex()
+        return f"{digits[:8]}-{digits[8:12]}-{digits[12:16]}-{digits[16:20]}-{digits[20:]}"
+
+    created_at = _timestamp('_created')
+    updated_at = _timestamp('_updated')
+
+    @staticmethod
+    def storage_key(value):
+        """
+        Key the repositories and registries store a model under: its 16 UUID bytes.
+        `value` is a model or a public id; None is returned for an id that is not a UUID.
+        """
+        if isinstance(value, BaseModel):
+            return value._uuid
+        try:
+            return uuid.UUID(value).bytes
+        except (TypeError, ValueError, AttributeError):
+            return None
 
     def save(self):
         """Update the updated_at timestamp whenever the object is modified."""
-        self.updated_at = datetime.now()
+        self._updated = _now()
 
     def update(self, data):
         """
@@ -23,28 +75,43 @@ class BaseModel:
         Ensures that only existing attributes are updated.
         """
         for key, value in data.items():
+            if key == 'id':
+                raise ValueError("Attribute 'id' cannot be updated")
             if hasattr(self, key):  # Only update existing attributes
                 setattr(self, key, value)
             else:
                 raise ValueError(f"Attribute '{key}' does not exist in {self.__class__.__name__}")
         self.save()
 
+    @classmethod
+    def _registries(cls):
+        """Yield the registries of this class and of its subclasses."""
+        yield cls._instances
+        for subclass in cls.__subclasses__():
+            yield from subclass._registries()
+
     @classmethod
     def get_by_id(cls, obj_id):
-        """Retrieve an instance by its ID, return None if not found."""
-        return cls._instances.get(obj_id)
+        """Retrieve an instance of this class (or a subclass) by its ID, return None if not found."""
+        key = cls.storage_key(obj_id)
+        for registry in cls._registries():
+            obj = registry.get(key)
+            if obj is not None:
+                return obj
+        return None
 
     @classmethod
     def all_instances(cls):
-        """Retrieve all instances of the class."""
-        return list(cls._instances.values())
+        """Retrieve all live instances of the class and its subclasses."""
+        return [obj for registry in cls._registries() for obj in list(registry.values())]
 
     @classmethod
     def delete(cls, obj_id):
         """Delete an instance by its ID, ensuring safe deletion."""
-        if obj_id in cls._instances:
-            del cls._instances[obj_id]
-            return True
+        key = cls.storage_key(obj_id)
+        for registry in cls._registries():
+            if registry.pop(key, None) is not None:
+                return True
         return False  # Return False if object wasn't found
 
     def __repr__(self):
@@ -4,6 +4,8 @@ from app.models.user import User  # Ensure User is imported
 class Place(BaseModel):
     """Represents a rental place owned by a User."""
 
+    __slots__ = ('title', 'description', 'price', 'latitude', 'longitude', 'owner', 'reviews', 'amenities')
+
     def __init__(self, title, description, price, latitude, longitude, owner):
         super().__init__()  # Call BaseModel to generate ID and timestamps
 
@@ -32,16 +34,28 @@ class Place(BaseModel):
         self.latitude = latitude
         self.longitude = longitude
         self.owner = owner  # One-to-Many relationship with User
-        self.reviews = []  # One-to-Many relationship with Review
-        self.amenities = set()  # Many-to-Many relationship with Amenity
+        self.reviews = ()  # One-to-Many relationship with Review; a list once the first one is added
+        self.amenities = ()  # Many-to-Many relationship with Amenity, as a tuple
 
         # Link this place to the owner
         owner.add_place(self)
 
     def add_review(self, review):
         """Add a review to this place."""
+        if not self.reviews:
+            self.reviews = []
         self.reviews.append(review)
 
+    def add_amenity(self, amenity):
+        """Link an amenity to this place."""
+        if amenity not in self.amenities:
+            self.amenities += (amenity,)
+
+    def remove_review(self, review):
+        """Unlink a deleted review from this place."""
+        if review in self.reviews:
+            self.reviews.remove(review)
+
     def __repr__(self):
         """Returns a readable string representation of the place."""
         return f"Place(Title: {self.title}, Owner: {self.owner.first_name}, Price: {self.price}, Amenities: {len(self.amenities)})"
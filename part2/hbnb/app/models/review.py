@@ -5,6 +5,8 @@ from app.models.user import User
 class Review(BaseModel):
     """Represents a review for a place written by a user."""
 
+    __slots__ = ('text', 'rating', 'place', 'user')
+
     def __init__(self, text, rating, place, user):
         super().__init__()  # Call BaseModel to generate ID and timestamps
 
@@ -1,10 +1,13 @@
 import re
+import weakref
 from app.models.base_model import BaseModel
 
 class User(BaseModel):
     """A simple User class with basic attributes and relationships."""
 
-    _users = {}  # Dictionary to store users and ensure unique emails
+    __slots__ = ('first_name', 'last_name', 'email', 'is_admin', 'places')
+
+    _users = weakref.WeakValueDictionary()  # Live users by email, to ensure unique emails
 
     def __init__(self, first_name, last_name, email, is_admin=False):
         super().__init__()  # Call the BaseModel constructor (sets id, timestamps)
@@ -29,7 +32,7 @@ class User(BaseModel):
         self.last_name = last_name.strip()
         self.email = email.strip()
         self.is_admin = is_admin
-        self.places = []  # List to store places owned by this user
+        self.places = ()  # Places owned by this user; a list once the first one is added
 
         # Store the user by email to ensure uniqueness
         self._users[email] = self  
@@ -38,6 +41,8 @@ class User(BaseModel):
         """Link a place to this user."""
         from app.models.place import Place  # Avoid circular import
         if isinstance(place, Place) and place.owner == self:
+            if not self.places:
+                self.places = []
             self.places.append(place)
         else:
             raise ValueError("Invalid place or owner mismatch.")
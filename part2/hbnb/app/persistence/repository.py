@@ -1,4 +1,6 @@
+import threading
 from abc import ABC, abstractmethod
+from operator import attrgetter
 
 class Repository(ABC):
     @abstractmethod
@@ -26,27 +28,219 @@ class Repository(ABC):
         pass
 
 
+class SecondaryIndex:
+    """
+    Maps the value of one attribute to the storage keys of the objects holding it.
+    `attr_name` may be a dotted path such as 'place.id'. A unique index rejects
+    a second object with the same value.
+
+    Most values are held by one object, so an entry is that object's key itself
+    and only becomes an insertion-ordered dict of keys once a second object
+    shares the value: an index costs no container per object.
+    """
+
+    def __init__(self, attr_name, unique=False):
+        self.attr_name = attr_name
+        self.unique = unique
+        self.value = attrgetter(attr_name)
+        self._entries = {}
+
+    def check(self, key, value):
+        """Raise ValueError if `value` is taken by another object in a unique index."""
+        if self.unique and self._entries.get(value, key) != key:
+            raise ValueError(f"Duplicate value for unique attribute '{self.attr_name}'.")
+
+    def add(self, obj, key):
+        value = self.value(obj)
+        holders = self._entries.get(value)
+        if holders is None:
+            self._entries[value] = key
+        elif type(holders) is dict:
+            holders[key] = None
+        elif holders != key:
+            self._entries[value] = {holders: None, key: None}
+
+    def remove(self, obj, key, value=None):
+        """Drop `obj` from the index, under `value` when given (its value before an update)."""
+        value = self.value(obj) if value is None else value
+        holders = self._entries.get(value)
+        if type(holders) is dict:
+            holders.pop(key, None)
+            if len(holders) == 1:
+                self._entries[value] = next(iter(holders))
+        elif holders is not None and holders == key:
+            del self._entries[value]
+
+    def find(self, value):
+        """Return the keys holding `value`, oldest first."""
+        holders = self._entries.get(value)
+        if holders is None:
+            return []
+        return list(holders) if type(holders) is dict else [holders]
+
+    def rebuild(self, items):
+        """Index the (key, object) pairs `items` in one pass, trusting them to satisfy the unique constraint."""
+        self._entries = {}
+        for key, obj in items:
+            self.add(obj, key)
+
+
+def _default_key(value):
+    return getattr(value, 'id', value)
+
+
 class InMemoryRepository(Repository):
-    def __init__(self):
+    """
+    Dict-backed repository. `indexes` declares SecondaryIndex objects kept up to date
+    by add/update/delete; get_by_attribute and find_by_attribute use them when one
+    covers the attribute and fall back to a scan otherwise. Indexed attributes must
+    therefore only change through update().
+
+    `key` maps an object, or the id callers pass to get/update/delete, to the key
+    it is stored under; by default that is the id itself.
+    """
+
+    def __init__(self, indexes=(), key=None):
         self._storage = {}
+        self._indexes = {index.attr_name: index for index in indexes}
+        self.key = key or _default_key
+        # Optional callable(kind, payload) told about every write, see snapshot.Persistence.
+        self.journal = None
 
     def add(self, obj):
-        self._storage[obj.id] = obj
+        key = self.key(obj)
+        for index in self._indexes.values():
+            index.check(key, index.value(obj))
+        if key in self._storage:
+            self._unindex(self._storage[key], key)
+        self._storage[key] = obj
+        self._index(obj, key)
+        if self.journal is not None:
+            self._journal('add', obj)
 
     def get(self, obj_id):
-        return self._storage.get(obj_id)
+        return self._storage.get(self.key(obj_id))
+
+    def load(self, objects):
+        """
+        Replace the contents with `objects`, a mapping of storage key to object
+        (e.g. restored from a snapshot), and rebuild the indexes in one pass.
+        No checks run and nothing is journaled.
+        """
+        self._storage = dict(objects)
+        for index in self._indexes.values():
+            index.rebuild(self._storage.items())
 
     def get_all(self):
         return list(self._storage.values())
 
     def update(self, obj_id, data):
-        obj = self.get(obj_id)
+        key = self.key(obj_id)
+        obj = self._storage.get(key)
         if obj:
-            obj.update(data)
+            for attr_name, value in data.items():
+                if attr_name in self._indexes:
+                    self._indexes[attr_name].check(key, value)
+            old_values = {name: index.value(obj) for name, index in self._indexes.items()}
+            try:
+                obj.update(data)
+            finally:
+                # Index the new value before dropping the old one, so a lookup never misses.
+                for name, index in self._indexes.items():
+                    if index.value(obj) != old_values[name]:
+                        index.add(obj, key)
+                        index.remove(obj, key, old_values[name])
+            if self.journal is not None:
+                self._journal('update', (key, dict(data, updated_at=obj.updated_at)))
 
     def delete(self, obj_id):
-        if obj_id in self._storage:
-            del self._storage[obj_id]
+        key = self.key(obj_id)
+        if key in self._storage:
+            self._unindex(self._storage.pop(key), key)
+            if self.journal is not None:
+                self._journal('delete', key)
+
+    def _journal(self, kind, payload):
+        self.journal(kind, payload)
 
     def get_by_attribute(self, attr_name, attr_value):
-        return next((obj for obj in self._storage.values() if getattr(obj, attr_name) == attr_value), None)
\ No newline at end of file
+        index = self._indexes.get(attr_name)
+        if index is not None:
+            return next(iter(self.find_by_attribute(attr_name, attr_value)), None)
+        getter = attrgetter(attr_name)
+        return next((obj for obj in self._storage.values() if getter(obj) == attr_value), None)
+
+    def find_by_attribute(self, attr_name, attr_value):
+        """Return every object whose `attr_name` equals `attr_value`."""
+        index = self._indexes.get(attr_name)
+        if index is not None:
+            found = (self._storage.get(key) for key in index.find(attr_value))
+            return [obj for obj in found if obj is not None]
+        getter = attrgetter(attr_name)
+        return [obj for obj in self._storage.values() if getter(obj) == attr_value]
+
+    def _index(self, obj, key):
+        for index in self._indexes.values():
+            index.add(obj, key)
+
+    def _unindex(self, obj, key):
+        for index in self._indexes.values():
+            index.remove(obj, key)
+
+
+class ConcurrentInMemoryRepository(InMemoryRepository):
+    """
+    InMemoryRepository safe to share between the threads of a WSGI server.
+
+    Writes are serialized by one lock, so unique-index checks and index maintenance
+    cannot interleave. Reads take no lock: get() and the index lookups are single
+    dict operations, atomic under the GIL. get_all() returns an immutable tuple
+    snapshot that is rebuilt only after a write and otherwise shared between calls,
+    so a reader always iterates over a consistent set of objects without copying
+    the storage each time. Objects themselves are updated in place: a reader
+    racing update() may see some of the new attribute values before the others.
+    """
+
+    def __init__(self, indexes=(), key=None):
+        super().__init__(indexes, key)
+        self._write_lock = threading.Lock()
+        self._version = 0
+        self._snapshot = (-1, ())
+
+    def add(self, obj):
+        with self._write_lock:
+            super().add(obj)
+            self._version += 1
+
+    def update(self, obj_id, data):
+        with self._write_lock:
+            try:
+                super().update(obj_id, data)
+            finally:
+                self._version += 1
+
+    def delete(self, obj_id):
+        with self._write_lock:
+            super().delete(obj_id)
+            self._version += 1
+
+    def load(self, objects):
+        with self._write_lock:
+            super().load(objects)
+            self._version += 1
+
+    def _journal(self, kind, payload):
+        # Invalidate get_all() before the write reaches the log: a snapshot rotating the
+        # log meanwhile must capture this write, since it deletes the log holding it.
+        self._version += 1
+        super()._journal(kind, payload)
+
+    def get_all(self):
+        version, snapshot = self._snapshot
+        current = self._version
+        if version != current:
+            # tuple() over dict values runs without releasing the GIL, so the copy is
+            # consistent. It can only be newer than `current`, never older.
+            snapshot = tuple(self._storage.values())
+            self._snapshot = (current, snapshot)
+        return snapshot
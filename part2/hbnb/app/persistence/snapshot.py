@@ -0,0 +1,306 @@
+"""
+Durability for the in-memory repositories: periodic binary snapshots plus an
+append-only write log.
+
+Every write made through a repository is appended to the current log segment
+(wal-<seq>.log) before the call returns. A snapshot (snapshot-<seq>.bin) holds
+every entity as of the start of segment <seq>; it is taken in a background
+thread from the repositories' get_all() views, so requests keep running while it
+is encoded and written. The snapshot may already contain some writes that are
+also in segment <seq>; replaying them is harmless because every log operation
+is idempotent (add replaces, update sets fields, delete ignores missing ids).
+
+A snapshot file is a sequence of pickled (repository, rows) frames.
+On startup recover() memory-maps the newest snapshot, replays the log segments
+from its sequence number on, then rebuilds the objects and their links.
+A torn record at the end of a log (a crash mid-append) is detected by its
+length and checksum and ignored.
+"""
+import gc
+import glob
+import mmap
+import os
+import pickle
+import struct
+import threading
+import zlib
+from functools import lru_cache
+from app.models.base_model import BaseModel
+from app.models.user import User
+from app.models.place import Place
+from app.models.review import Review
+from app.models.amenity import Amenity
+
+_HEADER = struct.Struct('>II')  # payload length, crc32
+# Rows pickled per snapshot frame. pickle holds the GIL for a whole dump, so
+# smaller frames keep request threads from stalling while a snapshot is written.
+FRAME_SIZE = 5000
+
+# Repositories in dependency order: an entity only references entities of earlier ones.
+# For each: facade attribute, model, {attribute: referenced repository} for single
+# references, the same for collections of references, and derived back-references.
+SCHEMA = (
+    ('users', 'user_repo', User, {}, {}, ('places',)),
+    ('amenities', 'amenity_repo', Amenity, {}, {}, ()),
+    ('places', 'place_repo', Place, {'owner': 'users'}, {'amenities': 'amenities'}, ('reviews',)),
+    ('reviews', 'review_repo', Review, {'place': 'places', 'user': 'users'}, {}, ()),
+)
+
+def _ref_id(value):
+    return value._uuid if isinstance(value, BaseModel) else value
+
+@lru_cache(maxsize=None)
+def fields(model):
+    """Every slot of `model` and its bases, i.e. every attribute a record holds."""
+    return tuple(name for cls in reversed(model.__mro__) for name in getattr(cls, '__slots__', ())
+                 if name != '__weakref__')
+
+def encode(obj, references, collections, derived):
+    """Flatten `obj` to a dict of plain values, replacing references by storage keys."""
+    record = {}
+    for key in fields(type(obj)):
+        if key in derived:
+            continue
+        value = getattr(obj, key)
+        if key in references:
+            value = _ref_id(value)
+        elif key in collections:
+            # Copy first: another thread may be updating the object while a snapshot runs.
+            value = [_ref_id(item) for item in list(value)]
+        record[key] = value
+    return record
+
+def encode_data(data, references, collections):
+    return {key: [_ref_id(item) for item in value] if key in collections
+            else _ref_id(value) if key in references else value
+            for key, value in data.items()}
+
+def _link(children, attribute, derived):
+    """Set the `derived` list of each parent to the children whose `attribute` points at it."""
+    groups = {}
+    for child in children:
+        parent = getattr(child, attribute)
+        if parent is not None:
+            groups.setdefault(parent, []).append(child)
+    for parent, items in groups.items():
+        setattr(parent, derived, items)
+
+class WriteLog:
+    """Append-only file of length-prefixed, checksummed pickled operations."""
+
+    def __init__(self, path, fsync=False):
+        self.path = path
+        self.fsync = fsync
+        self._file = open(path, 'ab')
+
+    def append(self, operation):
+        payload = pickle.dumps(operation, protocol=pickle.HIGHEST_PROTOCOL)
+        self._file.write(_HEADER.pack(len(payload), zlib.crc32(payload)) + payload)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+    @staticmethod
+    def read(path):
+        """Yield the operations of a log, stopping at the first torn or corrupt record."""
+        with open(path, 'rb') as f:
+            data = f.read()
+        offset = 0
+        while offset + _HEADER.size <= len(data):
+            length, checksum = _HEADER.unpack_from(data, offset)
+            payload = data[offset + _HEADER.size:offset + _HEADER.size + length]
+            if len(payload) < length or zlib.crc32(payload) != checksum:
+                return
+            yield pickle.loads(payload)
+            offset += _HEADER.size + length
+
+class Persistence:
+    """
+    Snapshot + write-log durability for a facade's in-memory repositories.
+
+    Usage:
+        persistence = Persistence(facade, '/var/lib/hbnb')
+        persistence.recover()        # load the last snapshot and replay the log
+        persistence.start(300)       # snapshot every 5 minutes in the background
+    """
+
+    def __init__(self, facade, directory, fsync=False):
+        self.facade = facade
+        self.directory = directory
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()
+        self._log = None
+        self._seq = 0
+        self._writes = 0
+        self._stop = threading.Event()
+        self._thread = None
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def _extension(kind):
+        return 'bin' if kind == 'snapshot' else 'log'
+
+    def _path(self, kind, seq):
+        return os.path.join(self.directory, f'{kind}-{seq:012d}.{self._extension(kind)}')
+
+    def _sequences(self, kind):
+        # Only final names: a snapshot-<seq>.bin.tmp left by a crash is not a snapshot.
+        pattern = os.path.join(self.directory, f'{kind}-*.{self._extension(kind)}')
+        return sorted(int(os.path.basename(path).split('-')[1].split('.')[0]) for path in glob.glob(pattern))
+
+    # --- Recovery ---
+    def recover(self):
+        """Load the newest snapshot, replay the logs after it and attach the write log."""
+        # Loading allocates millions of long-lived objects; the cyclic GC would
+        # rescan them over and over while nothing here becomes garbage.
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return self._recover()
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    def _recover(self):
+        # Snapshots interrupted by a crash before their rename.
+        for stale in glob.glob(os.path.join(self.directory, 'snapshot-*.bin.tmp')):
+            os.remove(stale)
+        snapshots = self._sequences('snapshot')
+        start = snapshots[-1] if snapshots else 0
+        records = {name: {} for name, *_ in SCHEMA}
+        if snapshots:
+            with open(self._path('snapshot', start), 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                while mapped.tell() < mapped.size():
+                    name, rows = pickle.load(mapped)
+                    records[name].update((row['_uuid'], row) for row in rows)
+        logs = [seq for seq in self._sequences('wal') if seq >= start]
+        for seq in logs:
+            for operation in WriteLog.read(self._path('wal', seq)):
+                self._replay(records, operation)
+        self._load(records)
+        self._seq = max(logs + [start]) + 1
+        self._open_log()
+        return sum(len(rows) for rows in records.values())
+
+    @staticmethod
+    def _replay(records, operation):
+        kind, name, payload = operation
+        table = records[name]
+        if kind == 'add':
+            table[payload['_uuid']] = payload
+        elif kind == 'update':
+            key, data = payload
+            if key in table:
+                table[key] = dict(table[key], **data)
+        elif kind == 'delete':
+            table.pop(payload, None)
+
+    def _load(self, records):
+        """Rebuild model objects from records without running their constructors."""
+        objects = {}
+        for name, attribute, model, references, collections, derived in SCHEMA:
+            loaded = objects[name] = {}
+            new = model.__new__
+            for key, record in records[name].items():
+                obj = new(model)
+                for attr, target in references.items():
+                    record[attr] = objects[target].get(record.get(attr))
+                for attr, target in collections.items():
+                    targets = objects[target]
+                    # References to entities deleted since are dropped, not left as raw keys.
+                    found = (targets.get(item) for item in record.get(attr, ()))
+                    record[attr] = tuple(target_obj for target_obj in found if target_obj is not None)
+                for attr in derived:
+                    record[attr] = ()
+                for attr, value in record.items():
+                    setattr(obj, attr, value)
+                loaded[key] = obj
+            if model is Place:
+                _link(loaded.values(), 'owner', 'places')
+            elif model is Review:
+                _link(loaded.values(), 'place', 'reviews')
+            elif model is User:
+                User._users.update((obj.email, obj) for obj in loaded.values())
+            model._instances.update(loaded)
+            getattr(self.facade, attribute).load(loaded)
+        self._attach()
+
+    # --- Write log ---
+    def _attach(self):
+        for name, attribute, model, references, collections, derived in SCHEMA:
+            repository = getattr(self.facade, attribute)
+            repository.journal = self._journal(name, references, collections, derived)
+
+    def _journal(self, name, references, collections, derived):
+        def journal(kind, payload):
+            if kind == 'add':
+                payload = encode(payload, references, collections, derived)
+            elif kind == 'update':
+                obj_id, data = payload
+                payload = (obj_id, encode_data(data, references, collections))
+            self.append((kind, name, payload))
+        return journal
+
+    def append(self, operation):
+        with self._lock:
+            self._log.append(operation)
+            self._writes += 1
+
+    def _open_log(self):
+        self._log = WriteLog(self._path('wal', self._seq), self.fsync)
+
+    # --- Snapshots ---
+    def snapshot(self):
+        """
+        Write a snapshot of every repository and drop the files it supersedes.
+        Only the log rotation and the get_all() captures hold the lock; the slow
+        part (encoding and writing) runs while requests keep writing to the new log.
+        Returns the snapshot's sequence number.
+        """
+        with self._snapshot_lock:
+            with self._lock:
+                self._log.close()
+                self._seq += 1
+                seq = self._seq
+                self._open_log()
+                self._writes = 0
+                captured = [(name, getattr(self.facade, attribute).get_all(), references, collections, derived)
+                            for name, attribute, model, references, collections, derived in SCHEMA]
+            path = self._path('snapshot', seq)
+            with open(path + '.tmp', 'wb') as f:
+                for name, objects, references, collections, derived in captured:
+                    for offset in range(0, len(objects), FRAME_SIZE):
+                        rows = [encode(obj, references, collections, derived)
+                                for obj in objects[offset:offset + FRAME_SIZE]]
+                        pickle.dump((name, rows), f, protocol=pickle.HIGHEST_PROTOCOL)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(path + '.tmp', path)
+            for old in self._sequences('snapshot'):
+                if old < seq:
+                    os.remove(self._path('snapshot', old))
+            for old in self._sequences('wal'):
+                if old < seq:
+                    os.remove(self._path('wal', old))
+            return seq
+
+    def start(self, interval):
+        """Snapshot every `interval` seconds from a daemon thread, when something was written."""
+        def run():
+            while not self._stop.wait(interval):
+                if self._writes:
+                    self.snapshot()
+        self._thread = threading.Thread(target=run, name='hbnb-snapshot', daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        with self._lock:
+            self._log.close()
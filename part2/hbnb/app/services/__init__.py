@@ -1,3 +1,17 @@
+import atexit
+from config import Config
+from app.persistence.repository import InMemoryRepository, ConcurrentInMemoryRepository
+from app.persistence.snapshot import Persistence
 from app.services.facade import HBnBFacade
 
-facade = HBnBFacade()
+REPOSITORY_CLASSES = {'memory': InMemoryRepository, 'concurrent': ConcurrentInMemoryRepository}
+
+facade = HBnBFacade(repository_class=REPOSITORY_CLASSES[Config.REPOSITORY])
+
+# Reload the last snapshot and write log, then keep both up to date.
+persistence = None
+if Config.DATA_DIR:
+    persistence = Persistence(facade, Config.DATA_DIR, fsync=Config.WAL_FSYNC)
+    persistence.recover()
+    persistence.start(Config.SNAPSHOT_INTERVAL)
+    atexit.register(persistence.close)
@@ -1,4 +1,5 @@
-from app.persistence.repository import InMemoryRepository
+from app.persistence.repository import ConcurrentInMemoryRepository, SecondaryIndex
+from app.models.base_model import BaseModel
 from app.models.amenity import Amenity
 from app.models.user import User
 from app.models.place import Place
@@ -7,11 +8,14 @@ from app.models.review import Review
 class HBnBFacade:
     """Facade to manage business logic between API and repository."""
 
-    def __init__(self):
-        self.user_repo = InMemoryRepository()
-        self.place_repo = InMemoryRepository()
-        self.review_repo = InMemoryRepository()
-        self.amenity_repo = InMemoryRepository()
+    def __init__(self, repository_class=ConcurrentInMemoryRepository):
+        """`repository_class` is InMemoryRepository for single-threaded use, the concurrent one otherwise."""
+        # Models are stored under their 16-byte UUID and indexed by the related object itself.
+        key = BaseModel.storage_key
+        self.user_repo = repository_class(indexes=[SecondaryIndex('email', unique=True)], key=key)
+        self.place_repo = repository_class(indexes=[SecondaryIndex('owner')], key=key)
+        self.review_repo = repository_class(indexes=[SecondaryIndex('place'), SecondaryIndex('user')], key=key)
+        self.amenity_repo = repository_class(indexes=[SecondaryIndex('name')], key=key)
 
     ###  User Methods ###
     def get_all_users(self):
@@ -128,7 +132,7 @@ class HBnBFacade:
         )
 
         for amenity in amenities:
-            place.amenities.add(amenity)
+            place.add_amenity(amenity)
 
         self.place_repo.add(place)
         return place.to_dict()  # Return the Place object as a dictionary
@@ -166,7 +170,7 @@ class HBnBFacade:
                 amenity = self.amenity_repo.get(amenity_id)
                 if amenity:
                     amenities.append(amenity)
-            place.amenities = amenities
+            place_data = dict(place_data, amenities=tuple(amenities))
 
         self.place_repo.update(place_id, place_data)
         return self.get_place(place_id)
@@ -201,7 +205,10 @@ class HBnBFacade:
 
     def get_reviews_by_place(self, place_id):
         """Retrieves all reviews for a specific place."""
-        return [review for review in self.review_repo.get_all() if review.place.id == place_id]
+        place = self.place_repo.get(place_id)
+        if place is None:
+            return []
+        return self.review_repo.find_by_attribute('place', place)
 
     def update_review(self, review_id, review_data):
         """Updates a review with validation."""
@@ -216,5 +223,8 @@ class HBnBFacade:
         return self.get_review(review_id)
 
     def delete_review(self, review_id):
-        """Deletes a review by its ID."""
+        """Deletes a review by its ID and unlinks it from its place."""
+        review = self.review_repo.get(review_id)
+        if review is not None:
+            review.place.remove_review(review)
         return self.review_repo.delete(review_id)
\ No newline at end of file
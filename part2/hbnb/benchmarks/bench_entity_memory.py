@@ -0,0 +1,49 @@
+"""
+Benchmark memory per entity of the in-memory backend with tracemalloc.
+
+Creates `count` entities of each model through the facade and reports the bytes
+traced per entity, including what the repositories and their indexes hold for
+it: that is what a million more objects cost in a running server.
+
+Usage:
+    python -m benchmarks.bench_entity_memory [count]
+"""
+import gc
+import sys
+import tracemalloc
+from app.models.amenity import Amenity
+from app.persistence.repository import InMemoryRepository
+from app.services.facade import HBnBFacade
+
+def measure(create, count):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [create(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # The list of results is only there to keep the objects alive; leave it out.
+    return (after - before - sys.getsizeof(kept)) / count, kept
+
+def run(count=100000):
+    facade = HBnBFacade(repository_class=InMemoryRepository)
+    per_user, users = measure(lambda i: facade.create_user({
+        'first_name': 'Bench', 'last_name': 'User', 'email': f'user{i}@bench.io', 'is_admin': True}), count)
+    per_place, places = measure(lambda i: facade.create_place({
+        'title': 'Place', 'description': 'Benchmark', 'price': 50.0, 'latitude': 10.0, 'longitude': 20.0,
+        'owner_id': users[i].id})['id'], count)
+    per_review, _ = measure(lambda i: facade.create_review({
+        'text': 'Fine', 'rating': 4, 'user_id': users[-1 - i].id, 'place_id': places[i]}), count)
+
+    def create_amenity(i):
+        amenity = Amenity(f'Amenity {i}', places[i])
+        facade.amenity_repo.add(amenity)
+        return None
+    per_amenity, _ = measure(create_amenity, count)
+
+    print(f"{count} entities per model, bytes per entity (model + repository + indexes)")
+    for name, size in (('user', per_user), ('place', per_place), ('review', per_review), ('amenity', per_amenity)):
+        print(f"{name:<10} {size:>8.0f}")
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,45 @@
+"""
+Benchmark get_by_attribute on InMemoryRepository with and without a secondary index.
+
+Lightweight records stand in for users so a million of them fit in memory;
+the repository code path is the same as for the real models.
+
+Usage:
+    python -m benchmarks.bench_indexed_repository [objects]
+"""
+import random
+import sys
+import time
+from types import SimpleNamespace
+from app.persistence.repository import InMemoryRepository, SecondaryIndex
+
+def fill(repo, count):
+    start = time.perf_counter()
+    for i in range(count):
+        repo.add(SimpleNamespace(id=f'id-{i}', email=f'user{i}@bench.io', owner_id=f'owner-{i % 1000}'))
+    return time.perf_counter() - start
+
+def per_lookup(repo, attr_name, values):
+    start = time.perf_counter()
+    for value in values:
+        repo.get_by_attribute(attr_name, value)
+    return (time.perf_counter() - start) / len(values)
+
+def run(count=1000000, lookups=20):
+    rng = random.Random(42)
+    emails = [f'user{rng.randrange(count)}@bench.io' for _ in range(lookups)]
+    plain = InMemoryRepository()
+    indexed = InMemoryRepository(indexes=[SecondaryIndex('email', unique=True), SecondaryIndex('owner_id')])
+    print(f"{count} objects")
+    print(f"{'case':<22} {'fill s':>8} {'lookup us':>12}")
+    for name, repo in (('scan', plain), ('indexed', indexed)):
+        fill_time = fill(repo, count)
+        lookup = per_lookup(repo, 'email', emails if name == 'scan' else emails * 1000)
+        print(f"{name:<22} {fill_time:>8.2f} {lookup * 1e6:>12.2f}")
+    start = time.perf_counter()
+    owned = indexed.find_by_attribute('owner_id', 'owner-7')
+    print(f"{'indexed owner (1k hits)':<22} {'':>8} {(time.perf_counter() - start) * 1e6:>12.2f}")
+    assert len(owned) == count // 1000
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,49 @@
+"""
+Benchmark process memory over a create/delete churn of reviews.
+
+Each cycle creates a review through the facade and deletes it again, so the live
+data set never grows. RSS is sampled along the way, once with the weak
+per-class registry and once with a plain dict swapped in (the old behaviour,
+where every instance ever created stayed reachable from BaseModel._instances).
+
+Usage:
+    python -m benchmarks.bench_model_registry [cycles]
+"""
+import gc
+import os
+import sys
+from app.models.review import Review
+from app.persistence.repository import InMemoryRepository
+from app.services.facade import HBnBFacade
+
+def rss_mb():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+
+def churn(cycles, samples=5):
+    facade = HBnBFacade(repository_class=InMemoryRepository)
+    owner = facade.create_user({'first_name': 'Bench', 'last_name': 'Owner',
+                                'email': f'owner{id(facade)}@bench.io', 'is_admin': True})
+    guest = facade.create_user({'first_name': 'Bench', 'last_name': 'Guest', 'email': f'guest{id(facade)}@bench.io'})
+    place = facade.create_place({'title': 'Churn', 'description': 'Benchmark', 'price': 50.0,
+                                 'latitude': 10.0, 'longitude': 20.0, 'owner_id': owner.id})
+    review_data = {'text': 'Fine', 'rating': 4, 'user_id': guest.id, 'place_id': place['id']}
+    readings = [rss_mb()]
+    step = cycles // samples
+    for i in range(1, cycles + 1):
+        facade.delete_review(facade.create_review(review_data).id)
+        if i % step == 0:
+            readings.append(rss_mb())
+    return readings
+
+def run(cycles=1000000):
+    print(f"{cycles} create/delete cycles, RSS in MB at each fifth")
+    for name, registry in (('weak registry', Review._instances), ('strong dict (old)', {})):
+        Review._instances = registry
+        gc.collect()
+        readings = churn(cycles)
+        print(f"{name:<20} " + ' '.join(f"{mb:>7.1f}" for mb in readings)
+              + f"   registered: {len(Review._instances)}")
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
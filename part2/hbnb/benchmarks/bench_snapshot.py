@@ -0,0 +1,97 @@
+"""
+Benchmark snapshot writes and warm start of the in-memory backend.
+
+Builds `entities` objects through the facade (a quarter users, the rest split
+between places and reviews), then measures:
+    - rebuilding the same state by replaying the facade calls (the old "warm start"),
+    - writing a snapshot while a thread keeps writing (how long writes stall),
+    - recovering from the memory-mapped snapshot plus the write log.
+
+Usage:
+    python -m benchmarks.bench_snapshot [entities]
+"""
+import gc
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from app.persistence.repository import InMemoryRepository
+from app.persistence.snapshot import Persistence
+from app.services.facade import HBnBFacade
+
+def populate(facade, entities, tag):
+    users = entities // 4
+    places = (entities - users) // 2
+    reviews = entities - users - places
+    owners = [facade.create_user({'first_name': 'Bench', 'last_name': 'User', 'email': f'{tag}{i}@bench.io',
+                                  'is_admin': True}) for i in range(users)]
+    place_ids = [facade.create_place({'title': f'Place {i}', 'description': 'Benchmark', 'price': 50.0,
+                                      'latitude': 10.0, 'longitude': 20.0,
+                                      'owner_id': owners[i % users].id})['id'] for i in range(places)]
+    for i in range(reviews):
+        facade.create_review({'text': 'Fine', 'rating': 4, 'user_id': owners[(i + 1) % users].id,
+                              'place_id': place_ids[i % places]})
+
+def reset_registries():
+    # The model registries are weak: collecting the dropped facade's cycles empties them.
+    gc.collect()
+
+def run(entities=1000000):
+    directory = tempfile.mkdtemp()
+    try:
+        start = time.perf_counter()
+        populate(HBnBFacade(repository_class=InMemoryRepository), entities, 'replay')
+        replay = time.perf_counter() - start
+        reset_registries()
+
+        facade = HBnBFacade(repository_class=InMemoryRepository)
+        persistence = Persistence(facade, directory)
+        persistence.recover()
+        populate(facade, entities, 'snap')
+
+        def writer(tag, stalls, stop):
+            i = 0
+            while not stop.is_set():
+                begin = time.perf_counter()
+                facade.create_user({'first_name': 'Live', 'last_name': 'User', 'email': f'{tag}{i}@bench.io'})
+                stalls.append(time.perf_counter() - begin)
+                i += 1
+
+        # Baseline: the same writer with no snapshot running (GC pauses included).
+        baseline, stop = [], threading.Event()
+        thread = threading.Thread(target=writer, args=('idle', baseline, stop))
+        thread.start()
+        time.sleep(1)
+        stop.set()
+        thread.join()
+
+        stalls, stop = [], threading.Event()
+        thread = threading.Thread(target=writer, args=('live', stalls, stop))
+        thread.start()
+        start = time.perf_counter()
+        persistence.snapshot()
+        snapshot_time = time.perf_counter() - start
+        stop.set()
+        thread.join()
+        persistence.close()
+        reset_registries()
+
+        start = time.perf_counter()
+        recovered = Persistence(HBnBFacade(repository_class=InMemoryRepository), directory)
+        count = recovered.recover()
+        recover_time = time.perf_counter() - start
+        recovered.close()
+
+        print(f"{entities} entities")
+        print(f"{'replay facade calls':<32} {replay:>8.2f} s")
+        print(f"{'writes without snapshot':<32} {'':>10} {len(baseline)} writes/s, "
+              f"slowest {max(baseline) * 1000:.1f} ms")
+        print(f"{'snapshot (background writes)':<32} {snapshot_time:>8.2f} s, "
+              f"{len(stalls)} concurrent writes, slowest {max(stalls) * 1000:.1f} ms")
+        print(f"{'recover snapshot + log':<32} {recover_time:>8.2f} s ({count} entities)")
+    finally:
+        shutil.rmtree(directory)
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
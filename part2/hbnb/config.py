@@ -3,6 +3,12 @@ import os
 class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'default_secret_key')
     DEBUG = False
+    # 'concurrent' for threaded servers (the default), 'memory' for the lock-free single-threaded repository
+    REPOSITORY = os.getenv('HBNB_REPOSITORY', 'concurrent')
+    # Snapshot + write-log persistence of the repositories; disabled when no directory is set
+    DATA_DIR = os.getenv('HBNB_DATA_DIR')
+    SNAPSHOT_INTERVAL = int(os.getenv('HBNB_SNAPSHOT_INTERVAL', 300))
+    WAL_FSYNC = os.getenv('HBNB_WAL_FSYNC', 'false').lower() == 'true'
 
 class DevelopmentConfig(Config):
     DEBUG = True
@@ -0,0 +1,54 @@
+import unittest
+import uuid
+from datetime import datetime, timedelta
+from app.models.amenity import Amenity
+from app.models.base_model import BaseModel
+from app.persistence.repository import InMemoryRepository
+from app.services.facade import HBnBFacade
+
+class TestCompactModels(unittest.TestCase):
+    def setUp(self):
+        self.facade = HBnBFacade(repository_class=InMemoryRepository)
+        self.owner = self.facade.create_user({'first_name': 'Test', 'last_name': 'User',
+                                              'email': f'{uuid.uuid4().hex}@example.com', 'is_admin': True})
+
+    def test_models_have_no_instance_dict(self):
+        self.assertFalse(hasattr(self.owner, '__dict__'))
+        self.assertEqual(self.owner.places, ())
+
+    def test_id_is_stored_as_uuid_bytes(self):
+        """Test that the public id is a canonical UUID string derived from 16 stored bytes."""
+        self.assertEqual(len(self.owner._uuid), 16)
+        self.assertEqual(str(uuid.UUID(self.owner.id)), self.owner.id)
+        self.assertEqual(BaseModel.storage_key(self.owner.id), self.owner._uuid)
+        self.assertIs(self.facade.get_user(self.owner.id), self.owner)
+        self.assertIsNone(self.facade.get_user('not-a-uuid'))
+        with self.assertRaises(ValueError):
+            self.owner.update({'id': str(uuid.uuid4())})
+
+    def test_timestamps_round_trip(self):
+        """Test that created_at/updated_at read and write datetimes over integer microseconds."""
+        self.assertIsInstance(self.owner._created, int)
+        self.assertLess(abs(self.owner.created_at - datetime.now()), timedelta(seconds=5))
+        moment = datetime(2024, 5, 17, 12, 30, 45, 123456)
+        self.owner.updated_at = moment
+        self.assertEqual(self.owner.updated_at, moment)
+        self.owner.save()
+        self.assertGreater(self.owner.updated_at, moment)
+
+    def test_place_relations_are_compact(self):
+        """Test that amenities are kept as a tuple, including after update_place."""
+        wifi, pool = Amenity('WiFi', 'p1'), Amenity('Pool', 'p1')
+        for amenity in (wifi, pool):
+            self.facade.amenity_repo.add(amenity)
+        place = self.facade.create_place({'title': 'Loft', 'description': 'Bright', 'price': 80.0,
+                                          'latitude': 10.0, 'longitude': 20.0, 'owner_id': self.owner.id,
+                                          'amenities': [wifi.id, wifi.id]})
+        self.assertEqual(place['amenities'], [{'id': wifi.id, 'name': 'WiFi'}])
+        place = self.facade.update_place(place['id'], {'amenities': [pool.id]})
+        self.assertEqual(place['amenities'], [{'id': pool.id, 'name': 'Pool'}])
+        self.assertEqual(self.facade.place_repo.get(place['id']).amenities, (pool,))
+        self.assertEqual(self.facade.get_reviews_by_place(place['id']), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import sys
+import threading
+import unittest
+from types import SimpleNamespace
+from app.persistence.repository import ConcurrentInMemoryRepository, SecondaryIndex
+
+class Record(SimpleNamespace):
+    def update(self, data):
+        for key, value in data.items():
+            setattr(self, key, value)
+
+class TestConcurrentRepository(unittest.TestCase):
+    THREADS = 32
+    ROUNDS = 100
+
+    def setUp(self):
+        self.repo = ConcurrentInMemoryRepository(indexes=[SecondaryIndex('email', unique=True),
+                                                          SecondaryIndex('group')])
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-5)  # Force frequent thread switches
+
+    def tearDown(self):
+        sys.setswitchinterval(self.switch_interval)
+
+    def run_threads(self, target):
+        errors = []
+        barrier = threading.Barrier(self.THREADS)
+
+        def guarded(n):
+            try:
+                barrier.wait()
+                target(n)
+            except Exception as e:  # Reported by the main thread
+                errors.append(e)
+
+        threads = [threading.Thread(target=guarded, args=(n,)) for n in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+    def test_mixed_reads_and_writes(self):
+        """Test 32 threads adding, updating, deleting and reading without corruption."""
+        def work(n):
+            for i in range(self.ROUNDS):
+                obj_id = f'{n}-{i}'
+                self.repo.add(Record(id=obj_id, email=f'{obj_id}@example.com', group=n % 4))
+                self.repo.update(obj_id, {'email': f'{obj_id}@renamed.com'})
+                if i % 3 == 0:
+                    self.repo.delete(obj_id)
+                else:
+                    self.assertIs(self.repo.get_by_attribute('email', f'{obj_id}@renamed.com'), self.repo.get(obj_id))
+                snapshot = self.repo.get_all()
+                self.assertEqual(len({obj.id for obj in snapshot}), len(snapshot))
+                for obj in self.repo.find_by_attribute('group', n % 4):
+                    self.assertEqual(obj.group, n % 4)
+
+        self.run_threads(work)
+        survivors = self.THREADS * (self.ROUNDS - len(range(0, self.ROUNDS, 3)))
+        self.assertEqual(len(self.repo.get_all()), survivors)
+        self.assertEqual(sum(len(self.repo.find_by_attribute('group', g)) for g in range(4)), survivors)
+        self.assertIsNone(self.repo.get_by_attribute('email', '0-1@example.com'))
+        self.assertEqual(self.repo.get_by_attribute('email', '0-1@renamed.com').id, '0-1')
+
+    def test_unique_index_under_contention(self):
+        """Test that racing adds of the same email let exactly one thread win each value."""
+        winners = []
+
+        def work(n):
+            for i in range(50):
+                try:
+                    self.repo.add(Record(id=f'{n}-{i}', email=f'shared{i}@example.com', group=0))
+                    winners.append(i)
+                except ValueError:
+                    pass
+
+        self.run_threads(work)
+        self.assertEqual(sorted(winners), list(range(50)))
+        self.assertEqual(len(self.repo.get_all()), 50)
+
+    def test_snapshot_is_shared_until_a_write(self):
+        """Test that get_all() does not copy the storage again until something changes."""
+        self.repo.add(Record(id='a', email='a@example.com', group=0))
+        first = self.repo.get_all()
+        self.assertIs(self.repo.get_all(), first)
+        self.repo.add(Record(id='b', email='b@example.com', group=0))
+        second = self.repo.get_all()
+        self.assertIsNot(second, first)
+        self.assertEqual([obj.id for obj in first], ['a'])
+        self.assertEqual([obj.id for obj in second], ['a', 'b'])
+
+    def test_journal_sees_the_write(self):
+        """Test that a snapshot taken while a write is being journaled includes that write."""
+        self.repo.add(Record(id='a', email='a@example.com', group=0, updated_at=None))
+        self.repo.get_all()
+        seen = []
+        self.repo.journal = lambda kind, payload: seen.append(
+            (kind, {obj.id: obj.group for obj in self.repo.get_all()}))
+        self.repo.add(Record(id='b', email='b@example.com', group=0, updated_at=None))
+        self.repo.update('a', {'group': 1})
+        self.repo.delete('b')
+        self.assertEqual(seen, [('add', {'a': 0, 'b': 0}), ('update', {'a': 1, 'b': 0}), ('delete', {'a': 1})])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import gc
+import unittest
+import uuid
+from app.models.base_model import BaseModel
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.persistence.repository import InMemoryRepository
+from app.services.facade import HBnBFacade
+
+class TestModelRegistry(unittest.TestCase):
+    def setUp(self):
+        self.facade = HBnBFacade(repository_class=InMemoryRepository)
+        self.owner = self.create_user(is_admin=True)
+        self.place = self.facade.create_place({
+            'title': 'Loft', 'description': 'Bright', 'price': 80.0,
+            'latitude': 10.0, 'longitude': 20.0, 'owner_id': self.owner.id
+        })
+
+    def create_user(self, is_admin=False):
+        return self.facade.create_user({'first_name': 'Test', 'last_name': 'User',
+                                        'email': f'{uuid.uuid4().hex}@example.com', 'is_admin': is_admin})
+
+    def test_registries_are_per_class(self):
+        """Test that all_instances() only returns instances of the class it is called on."""
+        self.assertIn(self.owner, User.all_instances())
+        self.assertTrue(all(isinstance(obj, Place) for obj in Place.all_instances()))
+        self.assertIs(Place.get_by_id(self.place['id']).owner, self.owner)
+        self.assertIsNone(User.get_by_id(self.place['id']))
+        self.assertIs(BaseModel.get_by_id(self.owner.id), self.owner)
+
+    def test_deleted_objects_are_released(self):
+        """Test that deleting a review from the facade frees it and its registry entry."""
+        review = self.facade.create_review({'text': 'Lovely', 'rating': 5, 'user_id': self.create_user().id,
+                                            'place_id': self.place['id']})
+        review_id = review.id
+        self.facade.delete_review(review_id)
+        self.assertEqual(Place.get_by_id(self.place['id']).reviews, [])
+        del review
+        self.assertIsNone(Review.get_by_id(review_id))
+
+    def test_dropped_users_free_their_email(self):
+        email = self.owner.email
+        self.facade = self.owner = self.place = None
+        gc.collect()
+        self.assertNotIn(email, User._users)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+from types import SimpleNamespace
+from app.persistence.repository import InMemoryRepository, SecondaryIndex
+
+class Record(SimpleNamespace):
+    def update(self, data):
+        for key, value in data.items():
+            setattr(self, key, value)
+
+class TestIndexedRepository(unittest.TestCase):
+    def setUp(self):
+        self.repo = InMemoryRepository(indexes=[SecondaryIndex('email', unique=True),
+                                                SecondaryIndex('owner.id')])
+        self.alice = SimpleNamespace(id='alice')
+        self.bob = SimpleNamespace(id='bob')
+        for i, owner in enumerate((self.alice, self.alice, self.bob)):
+            self.repo.add(Record(id=f'r{i}', email=f'r{i}@example.com', owner=owner))
+
+    def test_lookup_uses_indexes(self):
+        """Test unique and non-unique lookups, including dotted attribute paths."""
+        self.assertEqual(self.repo.get_by_attribute('email', 'r1@example.com').id, 'r1')
+        self.assertIsNone(self.repo.get_by_attribute('email', 'missing@example.com'))
+        self.assertEqual([obj.id for obj in self.repo.find_by_attribute('owner.id', 'alice')], ['r0', 'r1'])
+        self.assertEqual(self.repo.get_by_attribute('owner.id', 'bob').id, 'r2')
+
+    def test_unindexed_attribute_falls_back_to_scan(self):
+        self.assertEqual(self.repo.get_by_attribute('id', 'r2').id, 'r2')
+
+    def test_indexes_follow_update_and_delete(self):
+        """Test that update() and delete() keep every index in sync."""
+        self.repo.update('r0', {'email': 'new@example.com', 'owner': self.bob})
+        self.assertIsNone(self.repo.get_by_attribute('email', 'r0@example.com'))
+        self.assertEqual(self.repo.get_by_attribute('email', 'new@example.com').id, 'r0')
+        self.assertEqual([obj.id for obj in self.repo.find_by_attribute('owner.id', 'bob')], ['r2', 'r0'])
+        self.repo.delete('r2')
+        self.assertEqual([obj.id for obj in self.repo.find_by_attribute('owner.id', 'bob')], ['r0'])
+        self.assertIsNone(self.repo.get_by_attribute('email', 'r2@example.com'))
+
+    def test_unique_index_rejects_duplicates(self):
+        """Test that duplicates are refused on add and update without touching the object."""
+        with self.assertRaises(ValueError):
+            self.repo.add(Record(id='r9', email='r0@example.com', owner=self.bob))
+        with self.assertRaises(ValueError):
+            self.repo.update('r1', {'email': 'r0@example.com'})
+        self.assertEqual(self.repo.get('r1').email, 'r1@example.com')
+        self.assertIsNone(self.repo.get('r9'))
+        # Re-saving an object with its own value is not a duplicate.
+        self.repo.update('r1', {'email': 'r1@example.com'})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+import uuid
+from app.models.amenity import Amenity
+from app.persistence.repository import InMemoryRepository
+from app.persistence.snapshot import Persistence
+from app.services.facade import HBnBFacade
+
+class TestSnapshotPersistence(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.facade, self.persistence = self.open()
+        self.owner = self.create_user(is_admin=True)
+        self.guest = self.create_user()
+        self.place = self.facade.create_place({
+            'title': 'Loft', 'description': 'Bright', 'price': 80.0,
+            'latitude': 10.0, 'longitude': 20.0, 'owner_id': self.owner.id
+        })
+        self.review = self.facade.create_review({
+            'text': 'Lovely', 'rating': 5, 'user_id': self.guest.id, 'place_id': self.place['id']
+        })
+
+    def tearDown(self):
+        self.persistence.close()
+        shutil.rmtree(self.directory)
+
+    def open(self):
+        facade = HBnBFacade(repository_class=InMemoryRepository)
+        persistence = Persistence(facade, self.directory)
+        persistence.recover()
+        return facade, persistence
+
+    def create_user(self, is_admin=False):
+        return self.facade.create_user({'first_name': 'Test', 'last_name': 'User',
+                                        'email': f'{uuid.uuid4().hex}@example.com', 'is_admin': is_admin})
+
+    def reopen(self):
+        """Simulate a crash: drop the facade without a final snapshot and recover into a new one."""
+        self.persistence.close()
+        self.facade, self.persistence = self.open()
+        return self.facade
+
+    def assert_recovered(self, facade):
+        place = facade.place_repo.get(self.place['id'])
+        self.assertEqual(place.title, 'Loft')
+        self.assertIs(place.owner, facade.user_repo.get(self.owner.id))
+        self.assertEqual(place.owner.places, [place])
+        review = facade.get_reviews_by_place(place.id)[0]
+        self.assertIs(review.user, facade.user_repo.get(self.guest.id))
+        self.assertEqual(place.reviews, [review])
+        self.assertEqual(facade.get_user_by_email(self.guest.email).id, self.guest.id)
+
+    def test_recover_from_log_only(self):
+        self.assert_recovered(self.reopen())
+
+    def test_recover_from_snapshot_and_log(self):
+        """Test that writes made after a snapshot are replayed on top of it."""
+        self.persistence.snapshot()
+        self.facade.update_place(self.place['id'], {'price': 95.0})
+        self.facade.delete_review(self.review.id)
+        facade = self.reopen()
+        self.assertEqual(facade.place_repo.get(self.place['id']).price, 95.0)
+        self.assertEqual(facade.get_reviews_by_place(self.place['id']), [])
+        self.assertEqual(len([name for name in os.listdir(self.directory) if name.startswith('snapshot')]), 1)
+
+    def test_torn_log_tail_is_ignored(self):
+        """Test that a record cut short by a crash does not prevent recovery."""
+        self.persistence.close()
+        log = sorted(name for name in os.listdir(self.directory) if name.startswith('wal'))[-1]
+        with open(os.path.join(self.directory, log), 'ab') as f:
+            f.write(b'\x00\x00\x01\x00garbage')
+        self.facade, self.persistence = self.open()
+        self.assert_recovered(self.facade)
+
+    def test_interrupted_snapshot_is_ignored(self):
+        """Test that a temporary file left by a crash during a snapshot is skipped and removed."""
+        seq = self.persistence.snapshot()
+        self.facade.update_place(self.place['id'], {'price': 95.0})
+        stale = os.path.join(self.directory, f'snapshot-{seq + 1:012d}.bin.tmp')
+        with open(stale, 'wb') as f:
+            f.write(b'partial')
+        facade = self.reopen()
+        self.assertEqual(facade.place_repo.get(self.place['id']).price, 95.0)
+        self.assert_recovered(facade)
+        self.assertFalse(os.path.exists(stale))
+
+    def test_missing_amenity_is_dropped(self):
+        """Test that a place's link to an amenity missing at recovery is dropped."""
+        amenity = Amenity('Wifi', self.place['id'])
+        self.facade.amenity_repo.add(amenity)
+        self.facade.place_repo.update(self.place['id'], {'amenities': (amenity,)})
+        self.persistence.snapshot()
+        self.facade.amenity_repo.delete(amenity.id)
+        facade = self.reopen()
+        self.assertEqual(tuple(facade.place_repo.get(self.place['id']).amenities), ())
+
+    def test_snapshot_during_writes(self):
+        """Test that a snapshot taken while another thread writes loses nothing."""
+        done = threading.Event()
+        created = []
+
+        def writer():
+            while not done.is_set() or len(created) < 200:
+                created.append(self.create_user().id)
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        self.persistence.snapshot()
+        done.set()
+        thread.join()
+        facade = self.reopen()
+        self.assertTrue(all(facade.user_repo.get(user_id) for user_id in created))
+        self.assert_recovered(facade)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,11 +9,12 @@ from flask_migrate import Migrate
 from flask_bcrypt import Bcrypt
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS  # Add CORS import
+from app.persistence.replicas import RoutingSession
 
 # Add the project root to the Python path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 bcrypt = Bcrypt()
 jwt = JWTManager()  # Instantiate JWTManager
 
@@ -21,11 +22,46 @@ def create_app(config_class="config.DevelopmentConfig"):
     app = Flask(__name__)
     app.config.from_object(config_class)
     
+    # Pool sizing, pre-ping, recycling and statement timeouts (see app/persistence/pool.py),
+    # and read replicas for GET requests (see app/persistence/replicas.py)
+    from app.persistence.pool import configure_db_pool, init_pool_monitor
+    from app.persistence.replicas import init_db_replicas
+    init_db_replicas(app)
+    configure_db_pool(app)
+    
     # Initialize extensions
     db.init_app(app)
+    init_pool_monitor(app)
     bcrypt.init_app(app)
     jwt.init_app(app)  # Register JWT middleware with the app
     
+    # bcrypt runs on a bounded process pool (see app/utils/password_hasher.py)
+    from app.utils.password_hasher import init_password_hasher
+    init_password_hasher(app)
+    
+    # Columnar place index for listings (see app/persistence/place_columns.py).
+    # Registered before the wrapping hooks so it sees the bare place repository.
+    from app.persistence.place_columns import init_place_column_index
+    init_place_column_index(app)
+    from app.persistence.search_index import init_search_index
+    init_search_index(app)
+    
+    # Repository read-through cache (see app/persistence/cache.py)
+    from app.persistence.cache import init_repository_cache
+    init_repository_cache(app)
+    
+    # Per-repository call metrics (see app/persistence/metrics.py)
+    from app.persistence.metrics import init_repository_metrics
+    init_repository_metrics(app)
+    
+    # gzip/brotli response compression (see app/utils/compression.py)
+    from app.utils.compression import init_compression
+    init_compression(app)
+    
+    # One facade per app, wired with the repository hooks registered above
+    from app.services.facade import init_facade
+    init_facade(app)
+    
     # Configure CORS to allow requests from the front-end
     CORS(app, resources={
         r"/api/v1/*": {
@@ -55,12 +91,18 @@ def create_app(config_class="config.DevelopmentConfig"):
     from app.api.v1.amenities import ns as amenity_namespace
     from app.api.v1.reviews import ns as review_namespace
     from app.api.v1.auth import ns as auth_namespace  # New auth namespace
+    from app.api.v1.metrics import ns as metrics_namespace
     
     api.add_namespace(user_namespace, path='/api/v1/users')
     api.add_namespace(place_namespace, path='/api/v1/places')
     api.add_namespace(amenity_namespace, path='/api/v1/amenities')
     api.add_namespace(review_namespace, path='/api/v1/reviews')
     api.add_namespace(auth_namespace, path='/api/v1/auth')
+    api.add_namespace(metrics_namespace, path='/api/v1/metrics')
+    
+    # Register maintenance CLI commands
+    from app.cli import register_commands
+    register_commands(app)
     
 
     
@@ -1,8 +1,9 @@
 # app/api/v1/amenities.py
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required
-from app.services.facade import HBnBFacade
+from app.services.facade import get_facade
 from app.utils.decorators import admin_required
+from app.api.v1.batch import batch_items, batch_response, MAX_BATCH_SIZE
 
 ns = Namespace('amenities', description='Amenity operations (Admin only)')
 
@@ -16,6 +17,30 @@ amenity_model1 = ns.model('Amenity', {
     'place_id': fields.String(required=False, description='ID of the place', nullable=False)
 })
 
+# Models for the batch endpoints. Items are validated one by one by the facade.
+amenity_batch_item_model = ns.model('AmenityBatchItem', {
+    'name': fields.String(required=True, description='Name of the amenity')
+})
+
+amenity_batch_model = ns.model('AmenityBatch', {
+    'amenities': fields.List(fields.Nested(amenity_batch_item_model), required=True,
+                             description=f'Amenities to create (max {MAX_BATCH_SIZE})')
+})
+
+update_amenity_batch_item_model = ns.model('UpdateAmenityBatchItem', {
+    'id': fields.String(required=True, description='ID of the amenity to update'),
+    'name': fields.String(required=True, description='New name of the amenity')
+})
+
+update_amenity_batch_model = ns.model('UpdateAmenityBatch', {
+    'amenities': fields.List(fields.Nested(update_amenity_batch_item_model), required=True,
+                             description=f'Amenity updates (max {MAX_BATCH_SIZE})')
+})
+
+id_batch_model = ns.model('AmenityIdBatch', {
+    'ids': fields.List(fields.String, required=True, description=f'IDs of the amenities to delete (max {MAX_BATCH_SIZE})')
+})
+
 @ns.route('/')
 class AmenityList(Resource):
 
@@ -24,7 +49,7 @@ class AmenityList(Resource):
     @ns.response(400, 'Invalid input data')
     def post(self):
         """(Admin only) Add a new amenity."""
-        facade = HBnBFacade()
+        facade = get_facade()
         amenity_data = ns.payload
         try:
             new_amenity = facade.create_amenity(amenity_data)
@@ -33,6 +58,50 @@ class AmenityList(Resource):
         except ValueError as e:
             return {'error': str(e)}, 400
 
+@ns.route('/batch')
+class AmenityBatch(Resource):
+    @jwt_required()
+    @admin_required
+    @ns.expect(amenity_batch_model)
+    @ns.response(201, 'All amenities created')
+    @ns.response(207, 'Some amenities created; see errors')
+    @ns.response(400, 'Invalid batch or no amenity created')
+    def post(self):
+        """(Admin only) Create many amenities in one transaction, reporting errors per item."""
+        try:
+            items = batch_items('amenities')
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return batch_response(get_facade().bulk_create_amenities(items), 201)
+
+    @jwt_required()
+    @admin_required
+    @ns.expect(update_amenity_batch_model)
+    @ns.response(200, 'All amenities updated')
+    @ns.response(207, 'Some amenities updated; see errors')
+    @ns.response(400, 'Invalid batch or no amenity updated')
+    def put(self):
+        """(Admin only) Rename many amenities in one transaction, reporting errors per item."""
+        try:
+            items = batch_items('amenities')
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return batch_response(get_facade().bulk_update_amenities(items))
+
+    @jwt_required()
+    @admin_required
+    @ns.expect(id_batch_model)
+    @ns.response(200, 'All amenities deleted')
+    @ns.response(207, 'Some amenities deleted; see errors')
+    @ns.response(400, 'Invalid batch or no amenity deleted')
+    def delete(self):
+        """(Admin only) Delete many amenities in one transaction, reporting errors per item."""
+        try:
+            ids = batch_items('ids')
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return batch_response(get_facade().bulk_delete_amenities(ids))
+
 @ns.route('/<string:amenity_id>')
 class AmenityResource(Resource):
     @jwt_required()
@@ -42,7 +111,7 @@ class AmenityResource(Resource):
     @ns.response(404, 'Amenity not found')
     def put(self, amenity_id):
         """(Admin only) Modify the details of an amenity."""
-        facade = HBnBFacade()
+        facade = get_facade()
         amenity_data = ns.payload
         try:
             updated_amenity = facade.update_amenity(amenity_id, amenity_data)
@@ -58,7 +127,7 @@ class AmenityResource(Resource):
     @ns.response(404, 'Amenity not found')
     def delete(self, amenity_id):
         """(Admin only) Delete an amenity."""
-        facade = HBnBFacade()
+        facade = get_facade()
         try:
             deleted = facade.delete_amenity(amenity_id)
             if not deleted:
@@ -3,7 +3,8 @@ from flask_jwt_extended import (
     create_access_token, jwt_required, get_jwt_identity, get_jwt
 )
 from flask import request, jsonify
-from app.services.facade import HBnBFacade
+from app.services.facade import get_facade
+from app.utils.decorators import sheds_load
 
 
 ns = Namespace('auth', description='Authentication operations')
@@ -16,13 +17,15 @@ login_model = ns.model('Login', {
 
 @ns.route('/login')
 class Login(Resource):
+    @sheds_load
     @ns.expect(login_model, validate=True)
     @ns.response(200, 'Login successful')
     @ns.response(401, 'Invalid credentials')
+    @ns.response(503, 'Password hashing pool saturated')
     def post(self):
         """Authenticate user and return a JWT token."""
         credentials = ns.payload
-        facade = HBnBFacade()
+        facade = get_facade()
         user = facade.get_user_by_email(credentials['email'])
         if not user or not user.verify_password(credentials['password']):
             ns.abort(401, "Invalid credentials")
@@ -42,9 +45,11 @@ reset_password_model = ns.model('ResetPassword', {
 @ns.route('/reset_password')
 class ResetPassword(Resource):
     @jwt_required()
+    @sheds_load
     @ns.expect(reset_password_model, validate=True)
     @ns.response(200, 'Password reset successful')
     @ns.response(400, 'Invalid input or error in resetting password')
+    @ns.response(503, 'Password hashing pool saturated')
     def post(self):
         """
         Reset a user's password.
@@ -57,7 +62,7 @@ class ResetPassword(Resource):
         new_password = data.get('new_password')
         if not email or not new_password:
             return {'error': 'Email and new_password are required.'}, 400
-        facade = HBnBFacade()
+        facade = get_facade()
         try:
             user = facade.reset_user_password(email, new_password)
             return {'message': 'Password reset successful', 'user_id': user.id}, 200
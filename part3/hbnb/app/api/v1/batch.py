@@ -0,0 +1,27 @@
+from flask import request
+
+MAX_BATCH_SIZE = 10000
+
+def batch_items(key):
+    """
+    Return the array under `key` in the JSON body. Items are deliberately not
+    validated against the namespace model here: the facade checks each one and
+    reports failures per item instead of rejecting the whole batch.
+    """
+    payload = request.get_json(silent=True)
+    items = payload.get(key) if isinstance(payload, dict) else None
+    if not isinstance(items, list) or not items:
+        raise ValueError(f"Request body must be an object with a non-empty '{key}' array.")
+    if len(items) > MAX_BATCH_SIZE:
+        raise ValueError(f"A batch may contain at most {MAX_BATCH_SIZE} items.")
+    return items
+
+def batch_response(result, status=200):
+    """
+    Serialize a BulkResult: `status` when every item succeeded, 207 Multi-Status
+    when only some did, and 400 when none did.
+    """
+    body = result.to_dict()
+    if body['errors']:
+        status = 207 if body['items'] else 400
+    return body, status
@@ -0,0 +1,62 @@
+from datetime import timedelta, timezone
+from flask import Response, request
+from werkzeug.http import http_date
+from app.utils.compression import encoded_etags
+
+def validator_headers(version):
+    """ETag and Last-Modified headers for a Version (see app/persistence/versions.py)."""
+    headers = {'ETag': f'"{version.tag}"', 'Cache-Control': 'no-cache'}
+    if version.last_modified is not None:
+        headers['Last-Modified'] = http_date(version.last_modified.replace(tzinfo=timezone.utc))
+    return headers
+
+def not_modified_etag(version):
+    """
+    The ETag to answer 304 with when the request's If-None-Match (or, without it,
+    If-Modified-Since, for a single resource) matches `version`, else None. A compressed copy carries the
+    suffixed tag it was sent with (see app/utils/compression.py).
+    """
+    if request.if_none_match:
+        return next((tag for tag in encoded_etags(version.tag) if request.if_none_match.contains_weak(tag)), None)
+    if request.if_modified_since and version.single and version.last_modified is not None:
+        # HTTP dates have a one-second resolution.
+        last_modified = version.last_modified.replace(microsecond=0, tzinfo=timezone.utc)
+        if last_modified <= request.if_modified_since:
+            return version.tag
+    return None
+
+def conditional_get(version, render):
+    """
+    Answer a GET from the resource's `version`: 304 Not Modified when the client's
+    copy is current, without calling `render`; otherwise render()'s (body, status),
+    carrying the validators when the status is 200.
+    """
+    headers = validator_headers(version)
+    etag = not_modified_etag(version)
+    if etag is not None:
+        headers.update({'ETag': f'"{etag}"', 'Vary': 'Accept-Encoding'})
+        return Response(status=304, headers=headers)
+    body, status = render()
+    return (body, status, headers) if status == 200 else (body, status)
+
+def unmodified_since():
+    """
+    The request's If-Unmodified-Since as a naive UTC datetime for update(..., unmodified_since=),
+    or None. HTTP dates drop the fraction of a second that Last-Modified was truncated from,
+    so the whole second is accepted.
+    """
+    if request.if_unmodified_since is None:
+        return None
+    return request.if_unmodified_since.replace(tzinfo=None) + timedelta(seconds=1, microseconds=-1)
+
+def conflict_response(error, owner_column):
+    """
+    Map an UpdateConflict to a response: 403 when `owner_column` (the author or owner
+    the caller had to be) did not match, 412 when the row changed after the request's
+    If-Unmodified-Since, 409 when a concurrent write got there first.
+    """
+    if owner_column in error.conditions:
+        return {'error': 'Unauthorized action'}, 403
+    if 'updated_at' in error.conditions:
+        return {'error': 'Modified since If-Unmodified-Since; fetch it again'}, 412
+    return {'error': 'Changed by a concurrent update; retry'}, 409
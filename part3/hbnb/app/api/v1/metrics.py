@@ -0,0 +1,35 @@
+# app/api/v1/metrics.py
+from flask_restx import Namespace, Resource
+from flask_jwt_extended import jwt_required
+from app.utils.decorators import admin_required
+from app.persistence.cache import get_repository_cache
+from app.persistence.metrics import get_repository_metrics
+from app.persistence.pool import get_pool_monitor
+from app.persistence.replicas import get_replica_router
+from app.persistence.place_columns import get_place_column_index
+from app.persistence.search_index import get_search_index
+
+ns = Namespace('metrics', description='Runtime metrics (Admin only)')
+
+@ns.route('/')
+class Metrics(Resource):
+    @jwt_required()
+    @admin_required
+    @ns.response(200, 'Metrics retrieved successfully')
+    @ns.response(403, 'Admin privileges required')
+    def get(self):
+        """(Admin only) Report repository cache, call, place column index, search index, connection pool and read replica statistics."""
+        cache = get_repository_cache()
+        metrics = get_repository_metrics()
+        column_index = get_place_column_index()
+        search_index = get_search_index()
+        pool = get_pool_monitor()
+        replicas = get_replica_router()
+        return {
+            'cache': cache.stats() if cache is not None else None,
+            'repositories': metrics.stats() if metrics is not None else None,
+            'place_column_index': column_index.info() if column_index is not None else None,
+            'search_index': search_index.info() if search_index is not None else None,
+            'db_pool': pool.stats() if pool is not None else None,
+            'db_replicas': replicas.stats() if replicas is not None else None
+        }, 200
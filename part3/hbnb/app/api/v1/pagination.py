@@ -0,0 +1,27 @@
+from flask_restx import reqparse, inputs
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Query parameters shared by every list endpoint.
+pagination_parser = reqparse.RequestParser()
+pagination_parser.add_argument('limit', type=inputs.int_range(1, MAX_PAGE_SIZE), default=DEFAULT_PAGE_SIZE,
+                               location='args', help=f'Page size (1-{MAX_PAGE_SIZE})')
+pagination_parser.add_argument('cursor', type=str, location='args',
+                               help='Opaque cursor returned as next_cursor by the previous page')
+
+def comma_separated(allowed=None):
+    """Build a reqparse type turning 'a,b' into ('a', 'b'), rejecting names outside `allowed`."""
+    def parse(value):
+        names = tuple(name.strip() for name in value.split(',') if name.strip())
+        if allowed is None:
+            return names
+        unknown = [name for name in names if name not in allowed]
+        if unknown:
+            raise ValueError(f"Unknown value(s) {', '.join(unknown)}; allowed: {', '.join(allowed)}")
+        return names
+    return parse
+
+def page_response(items, next_cursor):
+    """Wrap a page of serialized items in the common list envelope."""
+    return {'items': items, 'next_cursor': next_cursor}
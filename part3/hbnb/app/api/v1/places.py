@@ -1,9 +1,86 @@
-from flask_restx import Namespace, Resource, fields
+from flask_restx import Namespace, Resource, fields, reqparse, inputs
 from flask_jwt_extended import jwt_required, get_jwt
-from app.services.facade import HBnBFacade
+from app.services.facade import get_facade
+from app.api.v1.pagination import pagination_parser, page_response, comma_separated, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.api.v1.batch import batch_items, batch_response, MAX_BATCH_SIZE
+from app.api.v1.conditional import conditional_get, conflict_response, unmodified_since
+from app.api.v1.streaming import stream_response
+from app.models.place import Place
+from app.models.review import Review
+from app.persistence.repository import UpdateConflict
 
 ns = Namespace('places', description='Place operations')
 
+# Sparse fieldsets: ?fields= picks the columns SELECTed, ?embed= the relationships loaded.
+place_view_parser = reqparse.RequestParser()
+place_view_parser.add_argument('fields', type=comma_separated(Place.SELECTABLE_FIELDS), location='args',
+                               help='Comma-separated place columns to return (default: all)')
+place_view_parser.add_argument('embed', type=comma_separated(Place.EMBEDDABLE_RELATIONS), location='args',
+                               help='Comma-separated relationships to embed: owner,amenities,reviews (default: all)')
+
+place_list_parser = pagination_parser.copy()
+for argument in place_view_parser.args:
+    place_list_parser.add_argument(argument)
+
+# Listing filters, evaluated in SQL by PlaceRepository.apply_filters().
+PLACE_FILTERS = ('min_price', 'max_price', 'owner_id', 'amenities', 'min_rating', 'max_rating')
+place_list_parser.add_argument('min_price', type=float, location='args', help='Minimum price per night')
+place_list_parser.add_argument('max_price', type=float, location='args', help='Maximum price per night')
+place_list_parser.add_argument('owner_id', type=str, location='args', help='Only places owned by this user')
+place_list_parser.add_argument('amenity', dest='amenities', type=comma_separated(), location='args',
+                               help='Comma-separated amenity IDs the place must all have')
+place_list_parser.add_argument('min_rating', type=float, location='args', help='Minimum average review rating')
+place_list_parser.add_argument('max_rating', type=float, location='args', help='Maximum average review rating')
+place_list_parser.add_argument('sort', choices=tuple(Place.SORT_ORDERS), default='created_at', location='args',
+                               help='Sort order: created_at (oldest first) or rating (best first)')
+
+# Full export: the listing filters, fieldsets and sort, without pagination.
+export_parser = place_list_parser.copy()
+export_parser.remove_argument('limit')
+export_parser.remove_argument('cursor')
+
+MAX_NEARBY_RADIUS_KM = 1000
+
+def bounded_float(minimum, maximum):
+    """Build a reqparse type accepting floats within [minimum, maximum]."""
+    def parse(value):
+        number = float(value)
+        if not minimum <= number <= maximum:
+            raise ValueError(f"must be between {minimum} and {maximum}")
+        return number
+    return parse
+
+latitude_type = bounded_float(-90.0, 90.0)
+longitude_type = bounded_float(-180.0, 180.0)
+
+# Radius search: nearest places first, with their distance in km.
+nearby_parser = place_view_parser.copy()
+nearby_parser.add_argument('lat', type=latitude_type, required=True, location='args', help='Latitude of the center')
+nearby_parser.add_argument('lon', type=longitude_type, required=True, location='args', help='Longitude of the center')
+nearby_parser.add_argument('radius_km', type=bounded_float(0.0, MAX_NEARBY_RADIUS_KM), required=True,
+                           location='args', help=f'Search radius in km (max {MAX_NEARBY_RADIUS_KM})')
+nearby_parser.add_argument('limit', type=inputs.int_range(1, MAX_PAGE_SIZE), default=DEFAULT_PAGE_SIZE,
+                           location='args', help=f'Maximum number of places (1-{MAX_PAGE_SIZE})')
+
+# Bounding-box search, paginated like the main listing. min_lon > max_lon crosses the antimeridian.
+bbox_parser = place_list_parser.copy()
+bbox_parser.add_argument('min_lat', type=latitude_type, required=True, location='args', help='Southern edge')
+bbox_parser.add_argument('min_lon', type=longitude_type, required=True, location='args', help='Western edge')
+bbox_parser.add_argument('max_lat', type=latitude_type, required=True, location='args', help='Northern edge')
+bbox_parser.add_argument('max_lon', type=longitude_type, required=True, location='args', help='Eastern edge')
+
+# A place's reviews, paged in one of the orders idx_review_place_created / idx_review_place_rating serve.
+place_reviews_parser = pagination_parser.copy()
+place_reviews_parser.add_argument('sort', choices=tuple(Review.SORT_ORDERS), default='created_at', location='args',
+                                  help='Sort order: created_at (oldest first) or rating (best first)')
+
+# Full-text search, best BM25 score first.
+search_parser = pagination_parser.copy()
+for argument in place_view_parser.args:
+    search_parser.add_argument(argument)
+search_parser.add_argument('q', type=str, required=True, location='args',
+                           help='Words to look for in titles, descriptions and reviews')
+
 # Model for creating a place.
 place_model = ns.model('Place', {
     'title': fields.String(required=True, description='Title of the place'),
@@ -25,13 +102,47 @@ update_place_model = ns.model('UpdatePlace', {
     'amenities': fields.List(fields.String, description='List of amenity IDs')
 })
 
+# Models for the batch endpoints. Items are validated one by one by the facade.
+place_batch_model = ns.model('PlaceBatch', {
+    'places': fields.List(fields.Nested(place_model), required=True,
+                          description=f'Places to create (max {MAX_BATCH_SIZE}); owner_id is only honored for admins')
+})
+
+update_place_batch_item_model = ns.inherit('UpdatePlaceBatchItem', update_place_model, {
+    'id': fields.String(required=True, description='ID of the place to update')
+})
+
+update_place_batch_model = ns.model('UpdatePlaceBatch', {
+    'places': fields.List(fields.Nested(update_place_batch_item_model), required=True,
+                          description=f'Place updates (max {MAX_BATCH_SIZE})')
+})
+
+id_batch_model = ns.model('PlaceIdBatch', {
+    'ids': fields.List(fields.String, required=True, description=f'IDs of the places to delete (max {MAX_BATCH_SIZE})')
+})
+
 @ns.route('/')
 class PlaceList(Resource):
+    @ns.expect(place_list_parser)
     @ns.response(200, 'List of places retrieved successfully')
+    @ns.response(304, 'Page unchanged since the ETag or date given')
+    @ns.response(400, 'Invalid pagination, fieldset or filter parameters')
     def get(self):
-        facade = HBnBFacade()
-        places = facade.get_all_places()
-        return places, 200
+        args = place_list_parser.parse_args()
+        filters = {name: args[name] for name in PLACE_FILTERS if args[name] is not None}
+        facade = get_facade()
+        try:
+            version = facade.get_places_page_version(
+                args['limit'], args['cursor'], embed=args['embed'], filters=filters, sort=args['sort'])
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        def render():
+            places, next_cursor = facade.get_places_page(
+                args['limit'], args['cursor'], fields=args['fields'], embed=args['embed'], filters=filters,
+                sort=args['sort'])
+            return page_response(places, next_cursor), 200
+        return conditional_get(version, render)
 
     @jwt_required()
     @ns.expect(place_model, validate=True)
@@ -39,7 +150,7 @@ class PlaceList(Resource):
     @ns.response(400, 'Invalid input data')
     def post(self):
         claims = get_jwt()
-        facade = HBnBFacade()
+        facade = get_facade()
         place_data = ns.payload
 
         if 'sub' in claims:
@@ -53,39 +164,161 @@ class PlaceList(Resource):
         except ValueError as e:
             return {'error': str(e)}, 400
 
+@ns.route('/batch')
+class PlaceBatch(Resource):
+    @jwt_required()
+    @ns.expect(place_batch_model)
+    @ns.response(201, 'All places created')
+    @ns.response(207, 'Some places created; see errors')
+    @ns.response(400, 'Invalid batch or no place created')
+    def post(self):
+        """Create many places in one transaction, reporting errors per item."""
+        claims = get_jwt()
+        try:
+            items = batch_items('places')
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        # Admins may import places on behalf of other users; everyone else owns what they create.
+        owner_id = None if claims.get('is_admin') else claims['sub']
+        if claims.get('is_admin'):
+            items = [dict(item, owner_id=item.get('owner_id') or claims['sub']) if isinstance(item, dict) else item
+                     for item in items]
+        result = get_facade().bulk_create_places(items, owner_id=owner_id)
+        return batch_response(result, 201)
+
+    @jwt_required()
+    @ns.expect(update_place_batch_model)
+    @ns.response(200, 'All places updated')
+    @ns.response(207, 'Some places updated; see errors')
+    @ns.response(400, 'Invalid batch or no place updated')
+    def put(self):
+        """Update many places in one transaction, reporting errors per item."""
+        claims = get_jwt()
+        try:
+            items = batch_items('places')
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        owner_id = None if claims.get('is_admin') else claims['sub']
+        return batch_response(get_facade().bulk_update_places(items, owner_id=owner_id))
+
+    @jwt_required()
+    @ns.expect(id_batch_model)
+    @ns.response(200, 'All places deleted')
+    @ns.response(207, 'Some places deleted; see errors')
+    @ns.response(400, 'Invalid batch or no place deleted')
+    def delete(self):
+        """Delete many places in one transaction, reporting errors per item."""
+        claims = get_jwt()
+        try:
+            ids = batch_items('ids')
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        owner_id = None if claims.get('is_admin') else claims['sub']
+        return batch_response(get_facade().bulk_delete_places(ids, owner_id=owner_id))
+
+@ns.route('/export')
+class PlaceExport(Resource):
+    @ns.expect(export_parser)
+    @ns.response(200, 'Every matching place, streamed in the list envelope (next_cursor is null)')
+    @ns.response(400, 'Invalid fieldset or filter parameters')
+    def get(self):
+        """Stream every matching place as it is read, gzip/brotli-compressed when accepted."""
+        args = export_parser.parse_args()
+        filters = {name: args[name] for name in PLACE_FILTERS if args[name] is not None}
+        places = get_facade().stream_places(fields=args['fields'], embed=args['embed'], filters=filters,
+                                            sort=args['sort'])
+        return stream_response(places)
+
+@ns.route('/nearby')
+class PlaceNearby(Resource):
+    @ns.expect(nearby_parser)
+    @ns.response(200, 'Places within the radius, nearest first')
+    @ns.response(400, 'Invalid search parameters')
+    def get(self):
+        args = nearby_parser.parse_args()
+        facade = get_facade()
+        places = facade.get_places_nearby(
+            args['lat'], args['lon'], args['radius_km'], args['limit'], fields=args['fields'], embed=args['embed'])
+        return page_response(places, None), 200
+
+@ns.route('/within')
+class PlaceWithin(Resource):
+    @ns.expect(bbox_parser)
+    @ns.response(200, 'Places inside the bounding box')
+    @ns.response(400, 'Invalid search parameters')
+    def get(self):
+        args = bbox_parser.parse_args()
+        if args['min_lat'] > args['max_lat']:
+            return {'error': 'min_lat must not exceed max_lat'}, 400
+        filters = {name: args[name] for name in PLACE_FILTERS if args[name] is not None}
+        filters['bbox'] = (args['min_lat'], args['min_lon'], args['max_lat'], args['max_lon'])
+        facade = get_facade()
+        try:
+            places, next_cursor = facade.get_places_page(
+                args['limit'], args['cursor'], fields=args['fields'], embed=args['embed'], filters=filters,
+                sort=args['sort'])
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return page_response(places, next_cursor), 200
+
+@ns.route('/search')
+class PlaceSearch(Resource):
+    @ns.expect(search_parser)
+    @ns.response(200, 'Matching places, best match first, with their score')
+    @ns.response(400, 'Invalid search or pagination parameters')
+    def get(self):
+        args = search_parser.parse_args()
+        if not args['q'].strip():
+            return {'error': 'q must not be empty'}, 400
+        facade = get_facade()
+        try:
+            places, next_cursor = facade.search_places(
+                args['q'], args['limit'], args['cursor'], fields=args['fields'], embed=args['embed'])
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return page_response(places, next_cursor), 200
+
 @ns.route('/<string:place_id>')
 class PlaceResource(Resource):
+    @ns.expect(place_view_parser)
     @ns.response(200, 'Place details retrieved successfully')
+    @ns.response(304, 'Place unchanged since the ETag or date given')
+    @ns.response(400, 'Invalid fieldset parameters')
     @ns.response(404, 'Place not found')
     def get(self, place_id):
-        facade = HBnBFacade()
-        place = facade.get_place(place_id)
-        if not place:
+        args = place_view_parser.parse_args()
+        facade = get_facade()
+        version = facade.get_place_version(place_id, embed=args['embed'])
+        if version is None:
             return {'error': 'Place not found'}, 404
-        return place, 200
+
+        def render():
+            place = facade.get_place(place_id, fields=args['fields'], embed=args['embed'])
+            if not place:
+                return {'error': 'Place not found'}, 404
+            return place, 200
+        return conditional_get(version, render)
 
     @jwt_required()
     @ns.expect(update_place_model, validate=True)
     @ns.response(200, 'Place updated successfully')
     @ns.response(403, 'Unauthorized action')
     @ns.response(404, 'Place not found')
+    @ns.response(412, 'Place modified since If-Unmodified-Since')
     def put(self, place_id):
+        # Ownership is checked by the UPDATE itself, so a successful update is one statement.
         claims = get_jwt()
-        facade = HBnBFacade()
-        existing_place = facade.get_place(place_id)
-        if not existing_place:
-            return {'error': 'Place not found'}, 404
-
-        if not claims.get('is_admin'):
-            if existing_place.get('owner', {}).get('id') != claims.get('sub'):
-                return {'error': 'Unauthorized action'}, 403
-
-        update_data = ns.payload
+        owner_id = None if claims.get('is_admin') else claims.get('sub')
         try:
-            updated_place = facade.update_place(place_id, update_data)
-            return {'message': 'Place updated successfully', 'place': updated_place}, 200
+            updated_place = get_facade().update_place(place_id, ns.payload, owner_id=owner_id,
+                                                      unmodified_since=unmodified_since())
+        except UpdateConflict as e:
+            return conflict_response(e, 'owner_id')
         except ValueError as e:
             return {'error': str(e)}, 400
+        if updated_place is None:
+            return {'error': 'Place not found'}, 404
+        return {'message': 'Place updated successfully', 'place': updated_place}, 200
 
     @jwt_required()
     @ns.response(200, 'Place deleted successfully')
@@ -93,7 +326,7 @@ class PlaceResource(Resource):
     @ns.response(404, 'Place not found')
     def delete(self, place_id):
         claims = get_jwt()
-        facade = HBnBFacade()
+        facade = get_facade()
         existing_place = facade.get_place(place_id)
         if not existing_place:
             return {'error': 'Place not found'}, 404
@@ -107,3 +340,26 @@ class PlaceResource(Resource):
             return {'message': 'Place deleted successfully'}, 200
         else:
             return {'error': 'Failed to delete place'}, 400
+
+@ns.route('/<string:place_id>/reviews')
+class PlaceReviewList(Resource):
+    @ns.expect(place_reviews_parser)
+    @ns.response(200, 'A page of the reviews of the place, with their author names')
+    @ns.response(304, 'Page unchanged since the ETag or date given')
+    @ns.response(400, 'Invalid pagination parameters')
+    @ns.response(404, 'Place not found')
+    def get(self, place_id):
+        args = place_reviews_parser.parse_args()
+        facade = get_facade()
+        try:
+            version = facade.get_place_reviews_page_version(place_id, args['limit'], args['cursor'], sort=args['sort'])
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        if version is None:
+            return {'error': 'Place not found'}, 404
+
+        def render():
+            reviews, next_cursor = facade.get_place_reviews_page(
+                place_id, args['limit'], args['cursor'], sort=args['sort'])
+            return page_response(reviews, next_cursor), 200
+        return conditional_get(version, render)
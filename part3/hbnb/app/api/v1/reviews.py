@@ -1,6 +1,10 @@
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt
-from app.services.facade import HBnBFacade
+from app.services.facade import get_facade
+from app.api.v1.pagination import pagination_parser, page_response
+from app.api.v1.batch import batch_items, batch_response, MAX_BATCH_SIZE
+from app.api.v1.conditional import conditional_get, conflict_response, unmodified_since
+from app.persistence.repository import UpdateConflict
 
 ns = Namespace('reviews', description='Review operations')
 
@@ -15,6 +19,25 @@ update_review_model = ns.model('UpdateReview', {
     'rating': fields.Integer(required=False, description='Updated rating (1-5)', nullable=False)
 })
 
+# Models for the batch endpoints. Items are validated one by one by the facade.
+review_batch_model = ns.model('ReviewBatch', {
+    'reviews': fields.List(fields.Nested(review_model), required=True,
+                           description=f'Reviews to create (max {MAX_BATCH_SIZE}); user_id is only honored for admins')
+})
+
+update_review_batch_item_model = ns.inherit('UpdateReviewBatchItem', update_review_model, {
+    'id': fields.String(required=True, description='ID of the review to update')
+})
+
+update_review_batch_model = ns.model('UpdateReviewBatch', {
+    'reviews': fields.List(fields.Nested(update_review_batch_item_model), required=True,
+                           description=f'Review updates (max {MAX_BATCH_SIZE})')
+})
+
+id_batch_model = ns.model('ReviewIdBatch', {
+    'ids': fields.List(fields.String, required=True, description=f'IDs of the reviews to delete (max {MAX_BATCH_SIZE})')
+})
+
 @ns.route('/')
 class ReviewList(Resource):
     @jwt_required()
@@ -30,17 +53,15 @@ class ReviewList(Resource):
         else:
             return {'error': 'User ID not found in token claims'}, 400
 
-        facade = HBnBFacade()
-        place = facade.get_place(review_data['place_id'])
+        facade = get_facade()
+        # Only the owner is needed: neither the place's reviews nor its amenities are loaded.
+        place = facade.get_place(review_data['place_id'], fields=('owner_id',), embed=())
         if not place:
             return {'error': 'Place not found'}, 404
-        if place.get('owner', {}).get('id') == claims['sub']:
+        if place['owner_id'] == claims['sub']:
             return {'error': 'You cannot review your own place.'}, 400
-
-        existing_reviews = facade.get_reviews_by_place(review_data['place_id'])
-        for review in existing_reviews:
-            if review.user.id == claims['sub']:
-                return {'error': 'You have already reviewed this place.'}, 400
+        if facade.has_reviewed(claims['sub'], review_data['place_id']):
+            return {'error': 'You have already reviewed this place.'}, 400
 
         try:
             new_review = facade.create_review(review_data)
@@ -54,58 +75,123 @@ class ReviewList(Resource):
         except ValueError as e:
             return {"error": str(e)}, 400
 
+    @ns.expect(pagination_parser)
     @ns.response(200, 'List of reviews retrieved successfully')
+    @ns.response(304, 'Page unchanged since the ETag or date given')
+    @ns.response(400, 'Invalid pagination parameters')
     def get(self):
-        facade = HBnBFacade()
-        reviews = facade.get_all_reviews()
-        return [{
-            "id": review.id,
-            "text": review.text,
-            "rating": review.rating
-        } for review in reviews], 200
+        args = pagination_parser.parse_args()
+        facade = get_facade()
+        try:
+            version = facade.get_reviews_page_version(args['limit'], args['cursor'])
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        def render():
+            reviews, next_cursor = facade.get_reviews_page(args['limit'], args['cursor'])
+            return page_response([{
+                "id": review.id,
+                "text": review.text,
+                "rating": review.rating
+            } for review in reviews], next_cursor), 200
+        return conditional_get(version, render)
+
+@ns.route('/batch')
+class ReviewBatch(Resource):
+    @jwt_required()
+    @ns.expect(review_batch_model)
+    @ns.response(201, 'All reviews created')
+    @ns.response(207, 'Some reviews created; see errors')
+    @ns.response(400, 'Invalid batch or no review created')
+    def post(self):
+        """Create many reviews in one transaction, reporting errors per item."""
+        claims = get_jwt()
+        try:
+            items = batch_items('reviews')
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        # Admins may import reviews on behalf of other users; everyone else authors what they create.
+        user_id = None if claims.get('is_admin') else claims['sub']
+        if claims.get('is_admin'):
+            items = [dict(item, user_id=item.get('user_id') or claims['sub']) if isinstance(item, dict) else item
+                     for item in items]
+        return batch_response(get_facade().bulk_create_reviews(items, user_id=user_id), 201)
+
+    @jwt_required()
+    @ns.expect(update_review_batch_model)
+    @ns.response(200, 'All reviews updated')
+    @ns.response(207, 'Some reviews updated; see errors')
+    @ns.response(400, 'Invalid batch or no review updated')
+    def put(self):
+        """Update many reviews in one transaction, reporting errors per item."""
+        claims = get_jwt()
+        try:
+            items = batch_items('reviews')
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        user_id = None if claims.get('is_admin') else claims['sub']
+        return batch_response(get_facade().bulk_update_reviews(items, user_id=user_id))
+
+    @jwt_required()
+    @ns.expect(id_batch_model)
+    @ns.response(200, 'All reviews deleted')
+    @ns.response(207, 'Some reviews deleted; see errors')
+    @ns.response(400, 'Invalid batch or no review deleted')
+    def delete(self):
+        """Delete many reviews in one transaction, reporting errors per item."""
+        claims = get_jwt()
+        try:
+            ids = batch_items('ids')
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        user_id = None if claims.get('is_admin') else claims['sub']
+        return batch_response(get_facade().bulk_delete_reviews(ids, user_id=user_id))
 
 @ns.route('/<string:review_id>')
 class ReviewResource(Resource):
     @ns.response(200, 'Review details retrieved successfully')
+    @ns.response(304, 'Review unchanged since the ETag or date given')
     @ns.response(404, 'Review not found')
     def get(self, review_id):
-        facade = HBnBFacade()
-        review = facade.get_review(review_id)
-        if not review:
+        facade = get_facade()
+        version = facade.get_review_version(review_id)
+        if version is None:
             return {'error': 'Review not found'}, 404
-        return {
-            "id": review.id,
-            "text": review.text,
-            "rating": review.rating,
-            "user_id": review.user.id,
-            "place_id": review.place.id
-        }, 200
+
+        def render():
+            review = facade.get_review(review_id)
+            if not review:
+                return {'error': 'Review not found'}, 404
+            return {
+                "id": review.id,
+                "text": review.text,
+                "rating": review.rating,
+                "user_id": review.user.id,
+                "place_id": review.place.id
+            }, 200
+        return conditional_get(version, render)
 
     @jwt_required()
     @ns.expect(update_review_model, validate=True)
     @ns.response(200, 'Review updated successfully')
     @ns.response(403, 'Unauthorized action')
     @ns.response(404, 'Review not found')
+    @ns.response(409, 'Rating changed by a concurrent update')
+    @ns.response(412, 'Review modified since If-Unmodified-Since')
     def put(self, review_id):
+        # Authorship is checked by the UPDATE itself, so a text edit is one statement.
         claims = get_jwt()
-        facade = HBnBFacade()
-        review = facade.get_review(review_id)
-        if not review:
-            return {'error': 'Review not found'}, 404
-        if not claims.get('is_admin') and review.user.id != claims.get('sub'):
-            return {'error': 'Unauthorized action'}, 403
-        update_data = ns.payload
+        user_id = None if claims.get('is_admin') else claims.get('sub')
         try:
-            updated_review = facade.update_review(review_id, update_data)
-            return {"message": "Review updated successfully", "review": {
-                "id": updated_review.id,
-                "text": updated_review.text,
-                "rating": updated_review.rating,
-                "user_id": updated_review.user.id,
-                "place_id": updated_review.place.id
-            }}, 200
+            updated_review = get_facade().update_review(review_id, ns.payload, user_id=user_id,
+                                                        unmodified_since=unmodified_since())
+        except UpdateConflict as e:
+            return conflict_response(e, 'user_id')
         except ValueError as e:
             return {"error": str(e)}, 400
+        if updated_review is None:
+            return {'error': 'Review not found'}, 404
+        return {"message": "Review updated successfully", "review": updated_review.to_dict()}, 200
 
     @jwt_required()
     @ns.response(200, 'Review deleted successfully')
@@ -113,7 +199,7 @@ class ReviewResource(Resource):
     @ns.response(404, 'Review not found')
     def delete(self, review_id):
         claims = get_jwt()
-        facade = HBnBFacade()
+        facade = get_facade()
         review = facade.get_review(review_id)
         if not review:
             return {'error': 'Review not found'}, 404
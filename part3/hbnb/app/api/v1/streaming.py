@@ -0,0 +1,37 @@
+import json
+from flask import Response, stream_with_context
+from app.utils.compression import compress_stream, negotiate_coding
+
+# Serialized rows are sent in chunks of about this many bytes.
+STREAM_CHUNK_SIZE = 64 * 1024
+
+def encode_page_stream(items, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Encode an iterable of serializable items as the list envelope of page_response(),
+    yielding UTF-8 chunks as the items are consumed; only one chunk is held at a time.
+    """
+    encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    buffer, size = ['{"items":['], 0
+    for i, item in enumerate(items):
+        text = encoder.encode(item)
+        buffer.append(text if i == 0 else ',' + text)
+        size += len(text)
+        if size >= chunk_size:
+            yield ''.join(buffer).encode('utf-8')
+            buffer, size = [], 0
+    buffer.append('],"next_cursor":null}')
+    yield ''.join(buffer).encode('utf-8')
+
+def stream_response(items):
+    """
+    Stream `items` as a JSON list envelope, compressed when the client accepts it.
+    The generator runs inside the request context, so the database session stays
+    open until the last row is sent.
+    """
+    chunks = encode_page_stream(items)
+    headers = {'Vary': 'Accept-Encoding'}
+    coding = negotiate_coding()
+    if coding is not None:
+        chunks = compress_stream(chunks, coding)
+        headers['Content-Encoding'] = coding
+    return Response(stream_with_context(chunks), mimetype='application/json', headers=headers)
@@ -1,8 +1,11 @@
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt  # We use get_jwt() if needed directly
 from flask import request, jsonify
-from app.services.facade import HBnBFacade
-from app.utils.decorators import admin_required
+from app.services.facade import get_facade
+from app.utils.decorators import admin_required, sheds_load
+from app.api.v1.pagination import pagination_parser, page_response, comma_separated, MAX_PAGE_SIZE
+from app.api.v1.conditional import conditional_get, conflict_response, unmodified_since
+from app.persistence.repository import UpdateConflict
 
 ns = Namespace('users', description='User operations (Admin only)')
 
@@ -24,14 +27,21 @@ admin_user_update_model = ns.model('AdminUserUpdate', {
     'is_admin': fields.Boolean(required=False, description='Updated admin status', nullable=False)
 })
 
+# Batch lookup: ?ids= returns those users in one response instead of one request each.
+user_list_parser = pagination_parser.copy()
+user_list_parser.add_argument('ids', type=comma_separated(), location='args',
+                              help=f'Comma-separated user IDs to look up (max {MAX_PAGE_SIZE}); disables paging')
+
 @ns.route('/')
 class UserList(Resource):
+    @sheds_load
     @ns.expect(admin_user_registration_model, validate=True)
     @ns.response(200, 'User successfully registered')
     @ns.response(400, 'Invalid input data or email already registered')
+    @ns.response(503, 'Password hashing pool saturated')
     def post(self):
         """(Admin only) Create a new user."""
-        facade = HBnBFacade()
+        facade = get_facade()
         user_data = ns.payload
         
         # Check if a user with this email already exists
@@ -45,32 +55,47 @@ class UserList(Resource):
             return {'error': str(e)}, 400
 
     @jwt_required()
+    @ns.expect(user_list_parser)
+    @ns.response(304, 'Page unchanged since the ETag or date given')
+    @ns.response(400, 'Invalid pagination parameters or too many ids')
     def get(self):
-        """Retrieve a list of all users (protected for authenticated users)."""
-        facade = HBnBFacade()
-        users = facade.get_all_users()
-        return [user.to_dict() for user in users], 200
+        """Retrieve a page of users, or the users listed in ?ids= (protected for authenticated users)."""
+        args = user_list_parser.parse_args()
+        facade = get_facade()
+        if args['ids'] is not None:
+            if len(args['ids']) > MAX_PAGE_SIZE:
+                return {'error': f'At most {MAX_PAGE_SIZE} ids per request'}, 400
+            return conditional_get(facade.get_users_by_ids_version(args['ids']), lambda: (page_response(
+                [user.to_dict() for user in facade.get_users_by_ids(args['ids'])], None), 200))
+        try:
+            version = facade.get_users_page_version(args['limit'], args['cursor'])
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        def render():
+            users, next_cursor = facade.get_users_page(args['limit'], args['cursor'])
+            return page_response([user.to_dict() for user in users], next_cursor), 200
+        return conditional_get(version, render)
 
 @ns.route('/<string:user_id>')
 class UserResource(Resource):
     @jwt_required()
     @admin_required
+    @sheds_load
     @ns.expect(admin_user_update_model, validate=True)
     @ns.response(200, 'User updated successfully')
     @ns.response(400, 'Email already in use or invalid input')
     @ns.response(403, 'Unauthorized action')
     @ns.response(404, 'User not found')
+    @ns.response(412, 'User modified since If-Unmodified-Since')
+    @ns.response(503, 'Password hashing pool saturated; retry later')
     def put(self, user_id):
         """
         (Admin Only) Update user details.
         Administrators can modify any user, including changing the email and password.
         If an email is provided, ensure it's not already in use by another user.
         """
-        facade = HBnBFacade()
-        user = facade.get_user_by_id(user_id)
-        if not user:
-            return {'error': 'User not found'}, 404
-
+        facade = get_facade()
         update_data = ns.payload
 
         # If email is provided, check if it's already used by another user.
@@ -80,10 +105,14 @@ class UserResource(Resource):
                 return {'error': 'Email is already in use'}, 400
 
         try:
-            updated_user = facade.update_user(user_id, update_data)
-            return {'message': 'User updated successfully', 'user': updated_user.to_dict()}, 200
-        except Exception as e:
+            updated_user = facade.update_user(user_id, update_data, unmodified_since=unmodified_since())
+        except UpdateConflict as e:
+            return conflict_response(e, None)
+        except ValueError as e:
             return {'error': str(e)}, 400
+        if updated_user is None:
+            return {'error': 'User not found'}, 404
+        return {'message': 'User updated successfully', 'user': updated_user.to_dict()}, 200
 
     @jwt_required()
     @admin_required
@@ -91,7 +120,7 @@ class UserResource(Resource):
     @ns.response(404, 'User not found')
     def delete(self, user_id):
         """(Admin Only) Delete a user."""
-        facade = HBnBFacade()
+        facade = get_facade()
         if not facade.get_user_by_id(user_id):
             return {'error': 'User not found'}, 404
 
@@ -103,8 +132,14 @@ class UserResource(Resource):
 
     def get(self, user_id):
         """Retrieve a specific user (protected)."""
-        facade = HBnBFacade()
-        user = facade.get_user_by_id(user_id)
-        if not user:
+        facade = get_facade()
+        version = facade.get_user_version(user_id)
+        if version is None:
             return {'error': 'User not found'}, 404
-        return user.to_dict(), 200
+
+        def render():
+            user = facade.get_user_by_id(user_id)
+            if not user:
+                return {'error': 'User not found'}, 404
+            return user.to_dict(), 200
+        return conditional_get(version, render)
@@ -0,0 +1,20 @@
+# app/cli.py
+import click
+
+def register_commands(app):
+    """Attach the maintenance commands to `flask <command>`."""
+
+    @app.cli.command('backfill-geohash')
+    def backfill_geohash():
+        """Fill Place.geohash for rows inserted without it."""
+        from app.persistence.place_repository import PlaceRepository
+        updated = PlaceRepository().backfill_geohashes()
+        click.echo(f"Backfilled geohash for {updated} place(s).")
+
+    @app.cli.command('rebuild-ratings')
+    def rebuild_ratings():
+        """Recompute every place's review count, rating sum, average and histogram."""
+        from app.services.facade import get_facade
+        # Through the facade, so the cache and the place indexes hear about the repaired rows.
+        repaired = get_facade().rebuild_rating_aggregates()
+        click.echo(f"Rebuilt rating aggregates; repaired {repaired} place(s).")
@@ -3,3 +3,8 @@ from app.models.user import User
 from app.models.place import Place
 from app.models.review import Review
 from app.models.amenity import Amenity
+
+from sqlalchemy.orm import configure_mappers
+
+# Resolve backrefs (e.g. Place.owner, Review.user) now so they can be used in loader options.
+configure_mappers()
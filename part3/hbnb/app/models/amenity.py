@@ -8,11 +8,16 @@ class Amenity(BaseModel):
     name = db.Column(db.String(50), nullable=False)
     
     def __init__(self, name):
+        self.validate(name)
+        self.name = name.strip()
+    
+    @staticmethod
+    def validate(name):
+        """Check the amenity name; shared by __init__ and the bulk import path."""
         if not name or not isinstance(name, str):
             raise ValueError("Amenity name is required and must be a string.")
         if len(name) > 50:
             raise ValueError("Amenity name must not exceed 50 characters.")
-        self.name = name.strip()
     
     def to_dict(self):
         return {
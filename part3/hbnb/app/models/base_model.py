@@ -1,16 +1,17 @@
 import uuid
 from datetime import datetime
 from app import db  # db is the SQLAlchemy instance from app/__init__.py
+from app.persistence.unit_of_work import commit
 
 class BaseModel(db.Model):
     __abstract__ = True  # This model is abstract; no table is created for it
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     def save(self):
         db.session.add(self)
-        db.session.commit()
+        commit()
 
     def update(self, data):
         for key, value in data.items():
@@ -33,7 +34,7 @@ class BaseModel(db.Model):
         obj = cls.get_by_id(obj_id)
         if obj:
             db.session.delete(obj)
-            db.session.commit()
+            commit()
             return True
         return False
 
@@ -1,15 +1,29 @@
 # app/models/place.py
+from datetime import datetime
+from sqlalchemy import event
 from app.models.base_model import BaseModel
+from app.utils.geo import geohash_encode
 from app import db
 
 # Association table for the many-to-many relationship between Place and Amenity
 place_amenity = db.Table('Place_Amenity',
     db.Column('place_id', db.String(36), db.ForeignKey('Place.id'), primary_key=True),
-    db.Column('amenity_id', db.String(36), db.ForeignKey('Amenity.id'), primary_key=True)
+    db.Column('amenity_id', db.String(36), db.ForeignKey('Amenity.id'), primary_key=True),
+    # The primary key covers lookups by place; this one serves the amenity filter.
+    db.Index('idx_place_amenity_amenity_id', 'amenity_id')
 )
 
 class Place(BaseModel):
     __tablename__ = 'Place'
+    __table_args__ = (
+        # Indexes backing the server-side listing filters.
+        db.Index('idx_place_price', 'price'),
+        db.Index('idx_place_owner_id', 'owner_id', 'created_at'),
+        # Prefix range scans on the geohash back the nearby/bounding-box searches.
+        db.Index('idx_place_geohash', 'geohash'),
+        # Serves ?sort=rating and the rating filters.
+        db.Index('idx_place_rating', 'rating_average', 'id'),
+    )
     
     title = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text, nullable=False)
@@ -17,6 +31,17 @@ class Place(BaseModel):
     latitude = db.Column(db.Float, nullable=False)
     longitude = db.Column(db.Float, nullable=False)
     owner_id = db.Column(db.String(36), db.ForeignKey('User.id'), nullable=False)
+    # Derived from latitude/longitude on every insert/update, see _set_geohash below.
+    geohash = db.Column(db.String(12))
+    # Review aggregates, maintained incrementally by PlaceRepository.apply_rating_change().
+    review_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_sum = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_average = db.Column(db.Float, nullable=False, default=0.0, server_default='0')
+    rating_count_1 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_count_2 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_count_3 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_count_4 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_count_5 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     
     # Relationships:
     # One-to-many: A Place can have many reviews.
@@ -24,17 +49,23 @@ class Place(BaseModel):
     # Many-to-many: A Place can have many amenities via the association table.
     amenities = db.relationship('Amenity', secondary=place_amenity, backref=db.backref('places', lazy=True))
     
+    # Columns serialized by default, columns a client may select with ?fields=,
+    # and relationships a client may request with ?embed=.
+    RATING_HISTOGRAM_COLUMNS = tuple(f'rating_count_{rating}' for rating in range(1, 6))
+    DEFAULT_FIELDS = ('title', 'description', 'price', 'latitude', 'longitude',
+                      'review_count', 'rating_sum', 'rating_average', 'rating_histogram')
+    SELECTABLE_FIELDS = DEFAULT_FIELDS + ('owner_id',)
+    # Serialized fields that are computed from other columns rather than read from one.
+    DERIVED_FIELDS = {'rating_histogram': RATING_HISTOGRAM_COLUMNS}
+    EMBEDDABLE_RELATIONS = ('owner', 'amenities', 'reviews')
+    # Keyset orders accepted by ?sort=, as (attribute, descending) pairs ending in a unique key.
+    SORT_ORDERS = {
+        'created_at': (('created_at', False), ('id', False)),
+        'rating': (('rating_average', True), ('id', True)),
+    }
+    
     def __init__(self, title, description, price, latitude, longitude, owner):
-        if not title or len(title) > 100:
-            raise ValueError("Title is required (max 100 characters).")
-        if not description:
-            raise ValueError("Description is required.")
-        if not isinstance(price, (int, float)) or price <= 0:
-            raise ValueError("Price must be a positive number.")
-        if not (-90.0 <= latitude <= 90.0):
-            raise ValueError("Latitude must be between -90.0 and 90.0.")
-        if not (-180.0 <= longitude <= 180.0):
-            raise ValueError("Longitude must be between -180.0 and 180.0.")
+        self.validate(title, description, price, latitude, longitude)
         if not owner:
             raise ValueError("Owner must be provided.")
         self.title = title.strip()
@@ -44,18 +75,55 @@ class Place(BaseModel):
         self.longitude = longitude
         self.owner = owner  # 'owner' is a User instance.
     
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'title': self.title,
-            'description': self.description,
-            'price': self.price,
-            'latitude': self.latitude,
-            'longitude': self.longitude,
-            'owner': self.owner.to_dict() if self.owner else None,
-            'amenities': [amenity.to_dict() for amenity in self.amenities if hasattr(amenity, 'to_dict')],
-            'reviews': [review.to_dict() for review in self.reviews if hasattr(review, 'to_dict')]
-        }
+    @staticmethod
+    def validate(title, description, price, latitude, longitude):
+        """Check the scalar fields of a place; shared by __init__ and the bulk import path."""
+        if not title or not isinstance(title, str) or len(title) > 100:
+            raise ValueError("Title is required (max 100 characters).")
+        if not description or not isinstance(description, str):
+            raise ValueError("Description is required.")
+        if not isinstance(price, (int, float)) or isinstance(price, bool) or price <= 0:
+            raise ValueError("Price must be a positive number.")
+        if not isinstance(latitude, (int, float)) or not (-90.0 <= latitude <= 90.0):
+            raise ValueError("Latitude must be between -90.0 and 90.0.")
+        if not isinstance(longitude, (int, float)) or not (-180.0 <= longitude <= 180.0):
+            raise ValueError("Longitude must be between -180.0 and 180.0.")
+    
+    @property
+    def rating_histogram(self):
+        return {str(rating): getattr(self, column) or 0
+                for rating, column in enumerate(self.RATING_HISTOGRAM_COLUMNS, start=1)}
+    
+    def to_dict(self, fields=None, embed=None):
+        """
+        Serialize the place. `fields` restricts the scalar columns and `embed` the
+        relationships included; None means all of them. Only the requested
+        attributes are touched, so nothing outside them is lazily loaded.
+        """
+        fields = self.DEFAULT_FIELDS if fields is None else fields
+        embed = self.EMBEDDABLE_RELATIONS if embed is None else embed
+        data = {'id': self.id}
+        for field in fields:
+            data[field] = getattr(self, field)
+        if 'owner' in embed:
+            data['owner'] = self.owner.to_dict() if self.owner else None
+        if 'amenities' in embed:
+            data['amenities'] = [amenity.to_dict() for amenity in self.amenities if hasattr(amenity, 'to_dict')]
+        if 'reviews' in embed:
+            data['reviews'] = [review.to_dict(user_name=True) for review in self.reviews if hasattr(review, 'to_dict')]
+        return data
     
     def __repr__(self):
         return f"Place({self.title}, Price: {self.price})"
+
+@event.listens_for(Place.amenities, 'append')
+@event.listens_for(Place.amenities, 'remove')
+def _touch_on_amenity_change(place, amenity, initiator):
+    """Amenity links live in their own table; touch the place so its version follows them."""
+    place.updated_at = datetime.utcnow()
+
+@event.listens_for(Place, 'before_insert')
+@event.listens_for(Place, 'before_update')
+def _set_geohash(mapper, connection, place):
+    """Keep the spatial index column in sync with the coordinates."""
+    place.geohash = geohash_encode(place.latitude, place.longitude)
@@ -4,6 +4,20 @@ from app import db
 
 class Review(BaseModel):
     __tablename__ = 'Review'
+    __table_args__ = (
+        # Covers the per-place rating aggregate used by the rating filter, and the
+        # per-place listing sorted by rating.
+        db.Index('idx_review_place_rating', 'place_id', 'rating', 'id'),
+        # Per-place listing sorted by date.
+        db.Index('idx_review_place_created', 'place_id', 'created_at', 'id'),
+        # Duplicate-review probe: has this user already reviewed this place?
+        db.Index('idx_review_user_place', 'user_id', 'place_id'),
+    )
+    # Keyset orders accepted by ?sort= on a place's reviews, as (attribute, descending) pairs.
+    SORT_ORDERS = {
+        'created_at': (('created_at', False), ('id', False)),
+        'rating': (('rating', True), ('id', True)),
+    }
     
     text = db.Column(db.Text, nullable=False)
     rating = db.Column(db.Integer, nullable=False)
@@ -11,10 +25,7 @@ class Review(BaseModel):
     place_id = db.Column(db.String(36), db.ForeignKey('Place.id'), nullable=False)
     
     def __init__(self, text, rating, user, place):
-        if not text or not isinstance(text, str):
-            raise ValueError("Review text is required and must be a string.")
-        if not isinstance(rating, int) or rating < 1 or rating > 5:
-            raise ValueError("Rating must be an integer between 1 and 5.")
+        self.validate(text, rating)
         if not user:
             raise ValueError("User must be provided.")
         if not place:
@@ -24,14 +35,26 @@ class Review(BaseModel):
         self.user = user   # User instance
         self.place = place # Place instance
     
-    def to_dict(self):
-        return {
+    @staticmethod
+    def validate(text, rating):
+        """Check the text and rating; shared by __init__ and the bulk import path."""
+        if not text or not isinstance(text, str):
+            raise ValueError("Review text is required and must be a string.")
+        if not isinstance(rating, int) or isinstance(rating, bool) or rating < 1 or rating > 5:
+            raise ValueError("Rating must be an integer between 1 and 5.")
+    
+    def to_dict(self, user_name=False):
+        """Serialize the review; `user_name` adds the reviewer's display name (load Review.user up front)."""
+        data = {
             'id': self.id,
             'text': self.text,
             'rating': self.rating,
-            'user_id': self.user.id if self.user else None,
-            'place_id': self.place.id if self.place else None
+            'user_id': self.user_id,
+            'place_id': self.place_id
         }
+        if user_name:
+            data['user_name'] = self.user.display_name
+        return data
     
     def __repr__(self):
         return f"Review(Rating: {self.rating}, Place: {self.place.title if self.place else 'N/A'}, User: {self.user.first_name if self.user else 'N/A'})"
@@ -1,6 +1,7 @@
 # app/models/user.py
 from app.models.base_model import BaseModel
-from app import db, bcrypt
+from app import db
+from app.utils.password_hasher import get_password_hasher
 
 class User(BaseModel):
     __tablename__ = 'User'
@@ -21,11 +22,16 @@ class User(BaseModel):
         self.hash_password(password)
         self.is_admin = is_admin
 
+    @property
+    def display_name(self):
+        return f"{self.first_name} {self.last_name}"
+
     def hash_password(self, password):
-        self.password = bcrypt.generate_password_hash(password).decode('utf-8')
+        # Runs on the app's bounded bcrypt pool; raises PasswordHasherBusy when saturated.
+        self.password = get_password_hasher().hash(password)
 
     def verify_password(self, password):
-        return bcrypt.check_password_hash(self.password, password)
+        return get_password_hasher().verify(self.password, password)
     
     def to_dict(self):
         return {
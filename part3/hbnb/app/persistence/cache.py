@@ -0,0 +1,273 @@
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app, has_app_context
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from app import db
+from app.persistence.repository import Repository
+from app.persistence.hooks import register_repository_hook
+from app.persistence.replicas import read_from_replica
+
+_MISSING = object()
+# Columns never written to the cache (a Redis backend is shared and may be persisted).
+# A cached object loads them from the database if they are ever read.
+UNCACHED_COLUMNS = frozenset(('password',))
+
+class CacheStats:
+    """Thread-safe hit/miss/invalidation counters for one cached repository."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def incr(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def as_dict(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else None
+        }
+
+class LRUCache:
+    """In-process cache bounded to `max_size` entries, each expiring `ttl` seconds after it was set."""
+
+    def __init__(self, max_size=10000, ttl=60):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def info(self):
+        return {'backend': 'memory', 'size': len(self._entries), 'max_size': self.max_size,
+                'ttl': self.ttl, 'evictions': self.evictions}
+
+class RedisCache:
+    """
+    Cache stored in Redis (or any client exposing get/set(ex=)/delete), shared by
+    every worker process. Values are pickled; expiry is delegated to Redis.
+    """
+
+    def __init__(self, client, ttl=60, prefix='hbnb:'):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url, ttl=60, prefix='hbnb:'):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("CACHE_BACKEND='redis' requires the 'redis' package.")
+        return cls(redis.Redis.from_url(url), ttl, prefix)
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        return _MISSING if value is None else pickle.loads(value)
+
+    def set(self, key, value):
+        self.client.set(self.prefix + key, pickle.dumps(value), ex=self.ttl)
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def clear(self):
+        pass  # Entries expire on their own; flushing a shared Redis is left to operators.
+
+    def info(self):
+        return {'backend': 'redis', 'ttl': self.ttl, 'prefix': self.prefix}
+
+def cache_key(model, obj_id):
+    return f"{model.__tablename__}:{obj_id}"
+
+class CachedRepository(Repository):
+    """
+    Read-through cache in front of a SQLAlchemyRepository.
+
+    get() serves a snapshot of the row's column values and attaches it to the current
+    session with merge(load=False), so a hit issues no SQL and relationships still
+    lazy-load normally. add/update/delete invalidate the entry, as do targeted
+    writes the wrapped repository reports through notify_write(); ORM writes made
+    through any other path are caught by the session flush hook below. Sessions that
+    read from a replica do not fill the cache, which would outlive the replica's lag.
+    Every other attribute is delegated to the wrapped repository.
+    """
+
+    def __init__(self, repository, backend, stats):
+        self.repository = repository
+        self.backend = backend
+        self.stats = stats
+        repository.write_listeners.append(self.invalidate)
+
+    @property
+    def model(self):
+        return self.repository.model
+
+    def __getattr__(self, name):
+        return getattr(self.repository, name)
+
+    def invalidate(self, obj_id):
+        key = cache_key(self.model, obj_id)
+        self.backend.delete(key)
+        self.stats.incr('invalidations')
+        # Inside a unit of work the write is not committed yet; drop the key again at commit.
+        db.session.info.setdefault('cache_invalidated', []).append(key)
+
+    def add(self, obj):
+        self.repository.add(obj)
+        self.invalidate(obj.id)
+
+    def get(self, obj_id):
+        key = cache_key(self.model, obj_id)
+        snapshot = self.backend.get(key)
+        if snapshot is not _MISSING:
+            self.stats.incr('hits')
+            return self._restore(snapshot)
+        self.stats.incr('misses')
+        obj = self.repository.get(obj_id)
+        if (obj is not None and not db.session.is_modified(obj) and inspect(obj).persistent
+                and not read_from_replica(db.session)):
+            self.backend.set(key, self._snapshot(obj))
+        return obj
+
+    def get_all(self):
+        return self.repository.get_all()
+
+    def update(self, obj_id, data, expected=None, unmodified_since=None):
+        try:
+            return self.repository.update(obj_id, data, expected, unmodified_since)
+        finally:
+            self.invalidate(obj_id)
+
+    def delete(self, obj_id):
+        try:
+            return self.repository.delete(obj_id)
+        finally:
+            self.invalidate(obj_id)
+
+    def get_by_attribute(self, attr_name, attr_value):
+        return self.repository.get_by_attribute(attr_name, attr_value)
+
+    def _snapshot(self, obj):
+        return {attr.key: getattr(obj, attr.key) for attr in inspect(self.model).column_attrs
+                if attr.key not in UNCACHED_COLUMNS}
+
+    def _restore(self, snapshot):
+        obj = self.model.__mapper__.class_manager.new_instance()
+        for key, value in snapshot.items():
+            set_committed_value(obj, key, value)
+        make_transient_to_detached(obj)
+        return db.session.merge(obj, load=False)
+
+class RepositoryCache:
+    """App-wide cache backend plus per-model statistics, stored in app.extensions."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.cached_models = set()
+        self._stats = {}
+
+    def wrap(self, repository):
+        name = repository.model.__tablename__
+        self.cached_models.add(repository.model)
+        stats = self._stats.setdefault(name, CacheStats())
+        return CachedRepository(repository, self.backend, stats)
+
+    def keys_for(self, objects):
+        return [cache_key(type(obj), obj.id) for obj in objects if type(obj) in self.cached_models]
+
+    def invalidate_keys(self, keys, count=True):
+        for key in keys:
+            self.backend.delete(key)
+            if count:
+                self._stats[key.split(':', 1)[0]].incr('invalidations')
+
+    def stats(self):
+        return {'backend': self.backend.info(),
+                'repositories': {name: stats.as_dict() for name, stats in self._stats.items()}}
+
+def get_repository_cache():
+    """Return the current app's RepositoryCache, or None when caching is disabled."""
+    if not has_app_context():
+        return None
+    return current_app.extensions.get('repository_cache')
+
+def init_repository_cache(app):
+    """Create the cache backend selected by CACHE_BACKEND ('memory', 'redis' or 'none')."""
+    backend_name = app.config.get('CACHE_BACKEND', 'none')
+    ttl = app.config.get('CACHE_TTL', 60)
+    if backend_name == 'memory':
+        backend = LRUCache(app.config.get('CACHE_MAX_SIZE', 10000), ttl)
+    elif backend_name == 'redis':
+        backend = RedisCache.from_url(app.config['CACHE_REDIS_URL'], ttl)
+    elif backend_name == 'none':
+        return None
+    else:
+        raise ValueError(f"Unknown CACHE_BACKEND: {backend_name}")
+    cache = RepositoryCache(backend)
+    app.extensions['repository_cache'] = cache
+    register_repository_hook(app, cache.wrap)
+    return cache
+
+@event.listens_for(db.session, 'after_flush')
+def _invalidate_flushed(session, flush_context):
+    # Covers writes that bypass the repositories (BaseModel.save, reset_password, ...).
+    cache = get_repository_cache()
+    if cache is not None:
+        keys = cache.keys_for(list(session.dirty) + list(session.deleted))
+        cache.invalidate_keys(keys)
+        session.info.setdefault('cache_invalidated', []).extend(keys)
+
+@event.listens_for(db.session, 'after_commit')
+def _invalidate_committed(session):
+    # A concurrent reader may have re-cached the old row between flush and commit.
+    keys = session.info.pop('cache_invalidated', [])
+    cache = get_repository_cache()
+    if cache is not None:
+        cache.invalidate_keys(keys, count=False)
+
+@event.listens_for(db.session, 'after_rollback')
+def _discard_invalidated(session):
+    # A read between flush and rollback may have cached the rolled-back row.
+    keys = session.info.pop('cache_invalidated', [])
+    cache = get_repository_cache()
+    if cache is not None:
+        cache.invalidate_keys(keys, count=False)
@@ -0,0 +1,19 @@
+from flask import current_app, has_app_context
+
+def register_repository_hook(app, hook):
+    """
+    Register `hook(repository) -> repository` to run on every repository the app's
+    facade builds, in registration order. Caches and metrics wrap repositories this way.
+    """
+    app.extensions.setdefault('repository_hooks', []).append(hook)
+
+def get_repository_hooks():
+    """Return the current app's repository hooks (none outside an app context)."""
+    if not has_app_context():
+        return ()
+    return tuple(current_app.extensions.get('repository_hooks', ()))
+
+def apply_repository_hooks(repository, hooks):
+    for hook in hooks:
+        repository = hook(repository)
+    return repository
@@ -0,0 +1,79 @@
+import inspect
+import threading
+import time
+from flask import current_app, has_app_context
+from app.persistence.hooks import register_repository_hook
+
+class RepositoryMetrics:
+    """Call counts, error counts and cumulative time per method of one repository."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._methods = {}
+
+    def record(self, method, elapsed, failed):
+        with self._lock:
+            stats = self._methods.setdefault(method, {'calls': 0, 'errors': 0, 'total_ms': 0.0})
+            stats['calls'] += 1
+            stats['errors'] += failed
+            stats['total_ms'] += elapsed * 1000
+
+    def as_dict(self):
+        with self._lock:
+            return {method: dict(stats, total_ms=round(stats['total_ms'], 3))
+                    for method, stats in sorted(self._methods.items())}
+
+class InstrumentedRepository:
+    """
+    Proxy timing every public method call of the wrapped repository. Attributes that
+    are not methods (model, write_listeners, ...) are passed through untouched.
+    """
+
+    def __init__(self, repository, metrics):
+        self.repository = repository
+        self.metrics = metrics
+
+    def __getattr__(self, name):
+        attr = getattr(self.repository, name)
+        if name.startswith('_') or not inspect.isroutine(attr):
+            return attr
+        metrics = self.metrics
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            failed = True
+            try:
+                result = attr(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                metrics.record(name, time.perf_counter() - start, failed)
+        return timed
+
+class RepositoryInstrumentation:
+    """Per-repository metrics for the app, stored in app.extensions."""
+
+    def __init__(self):
+        self._metrics = {}
+
+    def wrap(self, repository):
+        metrics = self._metrics.setdefault(repository.model.__tablename__, RepositoryMetrics())
+        return InstrumentedRepository(repository, metrics)
+
+    def stats(self):
+        return {name: metrics.as_dict() for name, metrics in self._metrics.items()}
+
+def get_repository_metrics():
+    """Return the current app's RepositoryInstrumentation, or None when disabled."""
+    if not has_app_context():
+        return None
+    return current_app.extensions.get('repository_metrics')
+
+def init_repository_metrics(app):
+    """Time repository calls when REPOSITORY_METRICS is enabled."""
+    if not app.config.get('REPOSITORY_METRICS', False):
+        return None
+    instrumentation = RepositoryInstrumentation()
+    app.extensions['repository_metrics'] = instrumentation
+    register_repository_hook(app, instrumentation.wrap)
+    return instrumentation
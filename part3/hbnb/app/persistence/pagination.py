@@ -0,0 +1,55 @@
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import and_, or_, tuple_
+
+# Default sort order for keyset pagination: (attribute, descending) pairs ending in a unique key.
+DEFAULT_ORDER = (('created_at', False), ('id', False))
+
+def _dump(value):
+    return {'dt': value.isoformat()} if isinstance(value, datetime) else value
+
+def _load(value):
+    return datetime.fromisoformat(value['dt']) if isinstance(value, dict) else value
+
+def encode_cursor(obj, order=DEFAULT_ORDER):
+    """Build an opaque cursor pointing just after `obj` in the given sort order."""
+    payload = json.dumps([_dump(getattr(obj, attr_name)) for attr_name, _ in order])
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor, order=DEFAULT_ORDER):
+    """Decode a cursor produced by encode_cursor into a tuple of sort-key values."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        if not isinstance(values, list) or len(values) != len(order):
+            raise ValueError
+        return tuple(_load(value) for value in values)
+    except (ValueError, TypeError, KeyError, UnicodeError):
+        raise ValueError("Invalid pagination cursor.")
+
+def keyset_query(query, model, limit, cursor=None, order=DEFAULT_ORDER):
+    """
+    Restrict `query` to the `limit` rows that follow `cursor` in `order`.
+    When every column sorts the same way the seek predicate is a row-value
+    comparison, (a, b) > (x, y), which the planner turns into a single index
+    range. Mixed directions expand it as (a > x) OR (a = x AND b < y) ...,
+    plus a plain bound on the first column (a >= x) so the index is still
+    entered at x rather than at the start of the range. One extra row is
+    requested so the caller can tell whether another page exists.
+    """
+    columns = [(getattr(model, attr_name), descending) for attr_name, descending in order]
+    if cursor:
+        values = decode_cursor(cursor, order)
+        directions = {descending for _, descending in columns}
+        if len(directions) == 1:
+            key = tuple_(*[column for column, _ in columns])
+            query = query.filter(key < tuple_(*values) if directions.pop() else key > tuple_(*values))
+        else:
+            clauses = []
+            for i, (column, descending) in enumerate(columns):
+                ties = [columns[j][0] == values[j] for j in range(i)]
+                clauses.append(and_(*ties, column < values[i] if descending else column > values[i]))
+            first, descending = columns[0]
+            query = query.filter(first <= values[0] if descending else first >= values[0], or_(*clauses))
+    ordering = [column.desc() if descending else column.asc() for column, descending in columns]
+    return query.order_by(*ordering).limit(limit + 1)
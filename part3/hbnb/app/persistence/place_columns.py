@@ -0,0 +1,284 @@
+"""
+Columnar, NumPy-backed copy of the Place columns the listing filters and sorts on.
+
+PlaceColumnIndex keeps one array per column (id, created_at, price, latitude,
+longitude, owner, review_count, rating_average) plus the amenity links, so a
+listing query becomes a handful of vectorized masks and a partial sort instead
+of a SQL scan. Only the ids of the requested page come out of it; the places
+themselves are then loaded by primary key, with the requested fieldset.
+
+The arrays are kept in sync with the database within the process: committed
+place changes are queued through place_sync, and the queued rows are re-read
+in one query before the next lookup. Writes made by other processes
+are picked up by a full reload once the copy is older than `max_age` seconds.
+"""
+import threading
+import time
+import numpy as np
+from flask import current_app, has_app_context
+from sqlalchemy import select
+from app import db
+from app.models.place import Place, place_amenity
+from app.persistence.hooks import register_repository_hook
+from app.persistence.pagination import decode_cursor
+from app.persistence.place_sync import register_place_index
+from app.persistence.replicas import primary_reads
+from app.persistence.repository import IN_CHUNK_SIZE, chunked
+
+_SELECT = (Place.id, Place.created_at, Place.price, Place.latitude, Place.longitude,
+           Place.owner_id, Place.review_count, Place.rating_average)
+# Array name and dtype per selected column, owner_id excepted (stored as an integer code).
+_ARRAYS = (('ids', 'S36'), ('created', np.int64), ('price', np.float64), ('latitude', np.float64),
+           ('longitude', np.float64), ('owner', np.int32), ('review_count', np.int32),
+           ('rating', np.float64), ('alive', bool))
+# Sort attributes the index can order by, and the array holding them.
+_SORT_ARRAYS = {'created_at': 'created', 'rating_average': 'rating'}
+
+def _micros(value):
+    return np.datetime64(value, 'us').astype(np.int64)
+
+def _best(values, count, descending):
+    """Mask of the `count` best `values`, plus anything tied with the last of them."""
+    if len(values) <= count:
+        return np.ones(len(values), bool)
+    if descending:
+        return values >= np.partition(values, len(values) - count)[len(values) - count]
+    return values <= np.partition(values, count - 1)[count - 1]
+
+def _id_prefixes(ids):
+    """First 8 bytes of each id as a big-endian integer, which sorts like the ids themselves."""
+    return np.frombuffer(ids.tobytes(), np.uint8).reshape(-1, 36)[:, :8].copy().view('>u8').ravel()
+
+class PlaceColumnIndex:
+    """In-process columnar index answering filtered, sorted place listings."""
+
+    FILTERS = frozenset(('min_price', 'max_price', 'owner_id', 'amenities', 'min_rating', 'max_rating', 'bbox'))
+
+    def __init__(self, max_age=300):
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self._pending_lock = threading.Lock()
+        self._pending = set()
+        self._loaded_at = None
+        self._reset()
+
+    def _reset(self, capacity=0):
+        for name, dtype in _ARRAYS:
+            setattr(self, name, np.zeros(capacity, dtype))
+        self._size = 0
+        self._dead = 0
+        self._rows = {}            # place id -> row
+        self._owner_codes = {}     # owner id -> code stored in `owner`
+        self._amenity_rows = {}    # amenity id -> set of rows
+        self._row_amenities = {}   # row -> amenity ids
+
+    # --- Synchronization ---
+    def mark(self, place_ids):
+        """Queue places whose row changed; they are re-read before the next lookup."""
+        with self._pending_lock:
+            self._pending.update(place_ids)
+
+    def sync(self):
+        """Reload everything when missing or older than max_age, else re-read the queued rows."""
+        # The queued ids are dropped once re-read, so they must not be read from a lagging replica.
+        with self._lock, primary_reads():
+            with self._pending_lock:
+                pending, self._pending = self._pending, set()
+            if self._loaded_at is None or time.monotonic() - self._loaded_at > self.max_age:
+                self._load_all()
+            elif pending:
+                self._refresh(pending)
+
+    def _load_all(self):
+        rows = db.session.execute(select(*_SELECT)).all()
+        self._reset(len(rows))
+        if rows:
+            ids, created, price, latitude, longitude, owners, review_count, rating = zip(*rows)
+            size = len(rows)
+            self.ids[:] = ids
+            self.created[:] = np.array(created, dtype='datetime64[us]').astype(np.int64)
+            self.price[:], self.latitude[:], self.longitude[:] = price, latitude, longitude
+            self.owner[:] = [self._owner_code(owner_id) for owner_id in owners]
+            self.review_count[:], self.rating[:] = review_count, rating
+            self.alive[:] = True
+            self._rows = dict(zip(ids, range(size)))
+            self._size = size
+        links = {}
+        for place_id, amenity_id in db.session.execute(select(place_amenity.c.place_id, place_amenity.c.amenity_id)):
+            links.setdefault(place_id, []).append(amenity_id)
+        for place_id, amenity_ids in links.items():
+            if place_id in self._rows:
+                self._set_amenities(self._rows[place_id], amenity_ids)
+        self._loaded_at = time.monotonic()
+
+    def _refresh(self, place_ids):
+        for chunk in chunked(place_ids, IN_CHUNK_SIZE):
+            rows = db.session.execute(select(*_SELECT).where(Place.id.in_(chunk))).all()
+            links = {}
+            for place_id, amenity_id in db.session.execute(
+                    select(place_amenity.c.place_id, place_amenity.c.amenity_id)
+                    .where(place_amenity.c.place_id.in_(chunk))):
+                links.setdefault(place_id, []).append(amenity_id)
+            for row in rows:
+                self._upsert(row, links.get(row[0], ()))
+            for place_id in set(chunk).difference(row[0] for row in rows):
+                self._remove(place_id)
+        if self._dead > max(1000, self._size // 2):
+            self._loaded_at = None  # Mostly tombstones: rebuild compactly on the next lookup.
+
+    def _upsert(self, row, amenity_ids):
+        place_id, created, price, latitude, longitude, owner_id, review_count, rating = row
+        position = self._rows.get(place_id)
+        if position is None:
+            position = self._append()
+            self._rows[place_id] = position
+        self.ids[position] = place_id
+        self.created[position] = _micros(created)
+        self.price[position], self.latitude[position], self.longitude[position] = price, latitude, longitude
+        self.owner[position] = self._owner_code(owner_id)
+        self.review_count[position], self.rating[position] = review_count, rating
+        self.alive[position] = True
+        self._set_amenities(position, amenity_ids)
+
+    def _remove(self, place_id):
+        position = self._rows.pop(place_id, None)
+        if position is not None:
+            self.alive[position] = False
+            self._set_amenities(position, ())
+            self._dead += 1
+
+    def _append(self):
+        if self._size == len(self.ids):
+            capacity = max(1024, 2 * self._size)
+            for name, dtype in _ARRAYS:
+                grown = np.zeros(capacity, dtype)
+                grown[:self._size] = getattr(self, name)[:self._size]
+                setattr(self, name, grown)
+        self._size += 1
+        return self._size - 1
+
+    def _owner_code(self, owner_id):
+        return self._owner_codes.setdefault(owner_id, len(self._owner_codes))
+
+    def _set_amenities(self, position, amenity_ids):
+        for amenity_id in self._row_amenities.pop(position, ()):
+            self._amenity_rows[amenity_id].discard(position)
+        if amenity_ids:
+            self._row_amenities[position] = tuple(amenity_ids)
+            for amenity_id in amenity_ids:
+                self._amenity_rows.setdefault(amenity_id, set()).add(position)
+
+    # --- Queries ---
+    def page(self, limit, cursor=None, filters=None, order=Place.SORT_ORDERS['created_at']):
+        """
+        Return (ids, has_more) for the `limit` places following `cursor` in `order`
+        that match `filters` (see PlaceRepository.apply_filters), or None when the
+        filters or the order are ones the index cannot evaluate.
+        """
+        filters = filters or {}
+        if not self.FILTERS.issuperset(filters) or not self._supports(order):
+            return None
+        with self._lock:
+            self.sync()
+            mask = self._mask(filters)
+            if cursor:
+                mask &= self._after(decode_cursor(cursor, order), order)
+            rows = self._top(mask.nonzero()[0], order, limit + 1)
+            ids = self.ids[rows].astype(str).tolist()
+        return ids[:limit], len(ids) > limit
+
+    @staticmethod
+    def _supports(order):
+        return (len(order) == 2 and order[0][0] in _SORT_ARRAYS
+                and order[1][0] == 'id' and order[1][1] == order[0][1])
+
+    def _mask(self, filters):
+        size = self._size
+        conditions = []
+
+        def between(array, minimum, maximum):
+            if minimum is not None:
+                conditions.append(array[:size] >= minimum)
+            if maximum is not None:
+                conditions.append(array[:size] <= maximum)
+
+        between(self.price, filters.get('min_price'), filters.get('max_price'))
+        if filters.get('owner_id') is not None:
+            conditions.append(self.owner[:size] == self._owner_codes.get(filters['owner_id'], -1))
+        for amenity_id in filters.get('amenities') or ():
+            rows = self._amenity_rows.get(amenity_id, ())
+            linked = np.zeros(size, bool)
+            linked[np.fromiter(rows, np.int64, len(rows))] = True
+            conditions.append(linked)
+        if filters.get('min_rating') is not None or filters.get('max_rating') is not None:
+            # Places without reviews have no rating, so they never match a rating bound.
+            conditions.append(self.review_count[:size] > 0)
+            between(self.rating, filters.get('min_rating'), filters.get('max_rating'))
+        if filters.get('bbox') is not None:
+            min_lat, min_lon, max_lat, max_lon = filters['bbox']
+            between(self.latitude, min_lat, max_lat)
+            if min_lon <= max_lon:
+                between(self.longitude, min_lon, max_lon)
+            else:
+                conditions.append((self.longitude[:size] >= min_lon) | (self.longitude[:size] <= max_lon))
+        mask = self.alive[:size].copy()
+        for condition in conditions:
+            mask &= condition
+        return mask
+
+    def _after(self, values, order):
+        """Mask of the rows strictly after the cursor position `values` in `order`."""
+        (attr_name, descending), _ = order
+        value, cursor_id = values
+        size = self._size
+        keys = getattr(self, _SORT_ARRAYS[attr_name])[:size]
+        value = _micros(value) if attr_name == 'created_at' else value
+        cursor_id = cursor_id.encode('ascii')
+        if descending:
+            return (keys < value) | ((keys == value) & (self.ids[:size] < cursor_id))
+        return (keys > value) | ((keys == value) & (self.ids[:size] > cursor_id))
+
+    def _top(self, rows, order, count):
+        """The first `count` of `rows` in `order`: partitions narrow them down before the sort."""
+        (attr_name, descending), _ = order
+        keys = getattr(self, _SORT_ARRAYS[attr_name])[rows]
+        keep = _best(keys, count, descending)
+        rows, keys = rows[keep], keys[keep]
+        if len(rows) > count:
+            # Sort keys with few distinct values (ratings) tie by the thousand at the
+            # cut-off; pick among the tied rows by their ids' leading bytes the same way.
+            tied = keys == (keys.min() if descending else keys.max())
+            keep = ~tied
+            tied_rows = tied.nonzero()[0]
+            keep[tied_rows[_best(_id_prefixes(self.ids[rows[tied_rows]]), count - keep.sum(), descending)]] = True
+            rows, keys = rows[keep], keys[keep]
+        ordered = np.lexsort((self.ids[rows], keys))
+        if descending:
+            ordered = ordered[::-1]
+        return rows[ordered[:count]]
+
+    def info(self):
+        return {'rows': self._size - self._dead, 'pending': len(self._pending),
+                'age_s': None if self._loaded_at is None else round(time.monotonic() - self._loaded_at, 1)}
+
+def get_place_column_index():
+    """Return the current app's PlaceColumnIndex, or None when it is disabled."""
+    if not has_app_context():
+        return None
+    return current_app.extensions.get('place_column_index')
+
+def init_place_column_index(app):
+    """Create the index when PLACE_COLUMN_INDEX is set and attach it to the place repository."""
+    if not app.config.get('PLACE_COLUMN_INDEX'):
+        return None
+    from app.persistence.place_repository import PlaceRepository
+    index = PlaceColumnIndex(app.config.get('PLACE_COLUMN_INDEX_MAX_AGE', 300))
+    app.extensions['place_column_index'] = index
+
+    def attach(repository):
+        if isinstance(repository, PlaceRepository):
+            repository.column_index = index
+        return repository
+    register_repository_hook(app, attach)
+    register_place_index(app, index)
+    return index
@@ -0,0 +1,367 @@
+from types import SimpleNamespace
+from sqlalchemy import and_, bindparam, case, func, or_, select
+from sqlalchemy.orm import joinedload, load_only, selectinload, subqueryload
+from app import db
+from app.persistence.unit_of_work import commit
+from app.persistence.repository import SQLAlchemyRepository, BULK_CHUNK_SIZE
+from app.persistence.pagination import DEFAULT_ORDER, encode_cursor, keyset_query
+from app.persistence.replicas import replica_read
+from app.persistence.versions import make_version
+from app.models.amenity import Amenity
+from app.models.place import Place, place_amenity
+from app.models.review import Review
+from app.models.user import User
+from app.utils.geo import bounding_box, geohash_encode, geohash_prefix_ranges, haversine_km
+
+class PlaceRepository(SQLAlchemyRepository):
+    # PlaceColumnIndex answering listing pages, attached by init_place_column_index() when enabled.
+    column_index = None
+    # PlaceSearchIndex answering full-text searches, attached by init_search_index().
+    search_index = None
+
+    def __init__(self):
+        super().__init__(Place)
+
+    def query_with_relations(self, fields=None, embed=None, filters=None, order=DEFAULT_ORDER, loader=None):
+        """
+        Build a query loading places with the requested relationships up front.
+        The owner is joined into the main SELECT and each collection is fetched with a
+        single subquery load, so the number of statements does not grow with the row count.
+        `loader`, when given, is the loader option used for every relationship instead.
+        Embedded reviews come with their reviewer's name, joined into the reviews query.
+        When `fields` is given only those columns (plus the keys needed for paging and
+        joins) are SELECTed; relationships missing from `embed` are not loaded at all.
+        `filters` is applied in SQL, see apply_filters().
+        """
+        embed = Place.EMBEDDABLE_RELATIONS if embed is None else embed
+        options = []
+        if fields is not None:
+            columns = {'id', *(attr_name for attr_name, _ in order)}
+            for field in fields:
+                columns.update(Place.DERIVED_FIELDS.get(field, (field,)))
+            if 'owner' in embed:
+                columns.add('owner_id')
+            options.append(load_only(*[getattr(Place, column) for column in sorted(columns)]))
+        if 'owner' in embed:
+            options.append(joinedload(Place.owner, innerjoin=True) if loader is None else loader(Place.owner))
+        if 'amenities' in embed:
+            options.append((loader or subqueryload)(Place.amenities))
+        if 'reviews' in embed:
+            # Reviewer names are joined into the reviews query rather than fetched per review.
+            options.append((loader or subqueryload)(Place.reviews)
+                           .joinedload(Review.user, innerjoin=True).load_only(User.first_name, User.last_name))
+        query = self.model.query.options(*options)
+        if filters:
+            query = self.apply_filters(query, filters)
+        return query
+
+    def apply_filters(self, query, filters):
+        """
+        Narrow `query` with the listing filters. Recognised keys (all optional):
+        min_price, max_price, owner_id, amenities (ids the place must all have),
+        min_rating and max_rating (bounds on the average review rating) and
+        bbox, a (min_lat, min_lon, max_lat, max_lon) tuple.
+        """
+        builder = self.query_builder(query)
+        if filters.get('bbox') is not None:
+            builder.where(self.bbox_criteria(*filters['bbox']))
+        builder.between('price', filters.get('min_price'), filters.get('max_price'))
+        builder.equals(owner_id=filters.get('owner_id'))
+        for amenity_id in filters.get('amenities') or ():
+            builder.where(Place.id.in_(
+                select(place_amenity.c.place_id).where(place_amenity.c.amenity_id == amenity_id)
+            ))
+        if filters.get('min_rating') is not None or filters.get('max_rating') is not None:
+            # Places without reviews have no rating, so they never match a rating bound.
+            builder.where(Place.review_count > 0)
+            builder.between('rating_average', filters.get('min_rating'), filters.get('max_rating'))
+        return builder.query
+
+    @staticmethod
+    def bbox_criteria(min_lat, min_lon, max_lat, max_lon):
+        """
+        SQL criteria selecting places inside a bounding box. The geohash prefix ranges
+        let the database range-scan idx_place_geohash instead of the whole table; the
+        coordinate bounds then trim the cells' overhang. min_lon > max_lon means the box
+        crosses the antimeridian.
+        """
+        cells = or_(*[and_(Place.geohash >= start, Place.geohash < end)
+                      for start, end in geohash_prefix_ranges(min_lat, min_lon, max_lat, max_lon)])
+        if min_lon <= max_lon:
+            longitude = Place.longitude.between(min_lon, max_lon)
+        else:
+            longitude = or_(Place.longitude >= min_lon, Place.longitude <= max_lon)
+        return and_(cells, Place.latitude.between(min_lat, max_lat), longitude)
+
+    @replica_read
+    def find_nearby(self, latitude, longitude, radius_km, limit, fields=None, embed=None):
+        """
+        Return up to `limit` (place, distance_km) pairs within `radius_km`, nearest first.
+        Candidates come from an indexed bounding-box scan that only reads coordinates;
+        the exact haversine test runs vectorized over them, and only the survivors are
+        loaded as full objects.
+        """
+        candidates = db.session.query(Place.id, Place.latitude, Place.longitude).filter(
+            self.bbox_criteria(*bounding_box(latitude, longitude, radius_km))
+        ).all()
+        if not candidates:
+            return []
+        ids, latitudes, longitudes = zip(*candidates)
+        distances = haversine_km(latitude, longitude, latitudes, longitudes)
+        inside = (distances <= radius_km).nonzero()[0]
+        nearest = inside[distances[inside].argsort(kind='stable')[:limit]]
+        distance_by_id = {ids[i]: float(distances[i]) for i in nearest}
+        places = self.query_with_relations(fields, embed).filter(Place.id.in_(list(distance_by_id))).all()
+        places.sort(key=lambda place: distance_by_id[place.id])
+        return [(place, distance_by_id[place.id]) for place in places]
+
+    def backfill_geohashes(self, batch_size=1000):
+        """Compute the geohash of rows inserted without one (e.g. by raw SQL). Returns the count."""
+        updated = 0
+        while True:
+            places = self.model.query.filter(Place.geohash.is_(None)).limit(batch_size).all()
+            if not places:
+                return updated
+            for place in places:
+                place.geohash = geohash_encode(place.latitude, place.longitude)
+            commit()
+            updated += len(places)
+
+    @replica_read
+    def get_with_relations(self, place_id, fields=None, embed=None):
+        return self.query_with_relations(fields, embed).filter(Place.id == place_id).first()
+
+    @replica_read
+    def get_all_with_relations(self, fields=None, embed=None, filters=None):
+        return self.query_with_relations(fields, embed, filters).all()
+
+    def stream_with_relations(self, fields=None, embed=None, filters=None, order=DEFAULT_ORDER,
+                              batch_size=1000):
+        """
+        Return a query iterating over every matching place in `order`, fetching
+        `batch_size` rows at a time from a server-side cursor. Relationships are loaded per batch with one IN query each,
+        so memory stays bounded by the batch whatever the number of rows.
+        """
+        query = self.query_with_relations(fields, embed, filters, order, loader=selectinload)
+        columns = [getattr(Place, attr_name) for attr_name, _ in order]
+        ordering = [column.desc() if descending else column.asc()
+                    for column, (_, descending) in zip(columns, order)]
+        return query.order_by(*ordering).yield_per(batch_size)
+
+    @replica_read
+    def get_page_with_relations(self, limit, cursor=None, fields=None, embed=None, filters=None,
+                                order=DEFAULT_ORDER):
+        """
+        Retrieve a page of places. With a column index attached, the filters, the sort
+        and the cursor are evaluated on its arrays and only the page is read from SQL,
+        by primary key; otherwise the whole query runs in SQL.
+        """
+        if self.column_index is not None:
+            page = self.column_index.page(limit, cursor, filters, order)
+            if page is not None:
+                return self._load_page(*page, fields, embed, order)
+        return self.get_page(limit, cursor, self.query_with_relations(fields, embed, filters, order), order)
+
+    def _load_page(self, ids, has_more, fields, embed, order):
+        if not ids:
+            return [], None
+        found = {place.id: place for place in
+                 self.query_with_relations(fields, embed, order=order).filter(Place.id.in_(ids))}
+        places = [found[place_id] for place_id in ids if place_id in found]
+        return places, encode_cursor(places[-1], order) if has_more and places else None
+
+    @replica_read
+    def get_version_with_relations(self, place_id, embed=None):
+        """Return the Version of a place as serialized with `embed`, or None when it does not exist."""
+        rows = db.session.query(Place.id, Place.updated_at, Place.owner_id).filter(Place.id == place_id).all()
+        return self._version(rows, embed, single=True) if rows else None
+
+    @replica_read
+    def get_page_version_with_relations(self, limit, cursor=None, embed=None, filters=None, order=DEFAULT_ORDER):
+        """
+        Return the Version of the page get_page_with_relations() would return for the
+        same arguments. The page is located the same way, but only the ids, updated_at
+        and owner_id of its rows are read.
+        """
+        columns = db.session.query(Place.id, Place.updated_at, Place.owner_id)
+        if self.column_index is not None:
+            page = self.column_index.page(limit, cursor, filters, order)
+            if page is not None:
+                position = {place_id: i for i, place_id in enumerate(page[0])}
+                rows = columns.filter(Place.id.in_(page[0])).all() if page[0] else []
+                return self._version(sorted(rows, key=lambda row: position[row.id]), embed)
+        if filters:
+            columns = self.apply_filters(columns, filters)
+        return self._version(keyset_query(columns, Place, limit, cursor, order).all()[:limit], embed)
+
+    def _version(self, rows, embed, single=False):
+        """
+        Version of the (id, updated_at, owner_id) place rows serialized with `embed`,
+        read in one statement. Reviews always count, since they drive the rating
+        aggregates. Amenity links have no timestamp of their own: they are counted
+        here, and changing them through the ORM touches the place (see models/place.py).
+        Embedded reviews carry their reviewer's name, so reviewers count with them.
+        """
+        embed = Place.EMBEDDABLE_RELATIONS if embed is None else embed
+        ids = [row.id for row in rows]
+        timestamps = [row.updated_at for row in rows]
+        if not ids:
+            return make_version(timestamps, ids, tuple(embed))
+        reviews = Review.place_id.in_(ids)
+        counts = [select(func.count(Review.id)).where(reviews).scalar_subquery()]
+        latest = [select(func.max(Review.updated_at)).where(reviews).scalar_subquery()]
+        if 'owner' in embed:
+            latest.append(select(func.max(User.updated_at))
+                          .where(User.id.in_({row.owner_id for row in rows})).scalar_subquery())
+        if 'reviews' in embed:
+            latest.append(select(func.max(User.updated_at))
+                          .join(Review, Review.user_id == User.id).where(reviews).scalar_subquery())
+        if 'amenities' in embed:
+            links = place_amenity.c.place_id.in_(ids)
+            counts.append(select(func.count()).select_from(place_amenity).where(links).scalar_subquery())
+            latest.append(select(func.max(Amenity.updated_at))
+                          .join(place_amenity, place_amenity.c.amenity_id == Amenity.id)
+                          .where(links).scalar_subquery())
+        values = db.session.execute(select(*counts, *latest)).one()
+        return make_version(timestamps + list(values[len(counts):]), ids, tuple(embed), tuple(values[:len(counts)]),
+                            single=single)
+
+    @replica_read
+    def search(self, query, limit, cursor=None, fields=None, embed=None):
+        """
+        Full-text search over titles, descriptions and review texts. Returns
+        ([(place, score)], next_cursor), best score first.
+        """
+        from app.persistence.search_index import PlaceSearchIndex, SEARCH_ORDER
+        # Without an attached index (repositories built without hooks), build a throwaway one.
+        index = self.search_index if self.search_index is not None else PlaceSearchIndex()
+        results, has_more = index.search(query, limit, cursor)
+        if not results:
+            return [], None
+        found = {place.id: place for place in
+                 self.query_with_relations(fields, embed).filter(Place.id.in_([place_id for place_id, _ in results]))}
+        hits = [(found[place_id], score) for place_id, score in results if place_id in found]
+        if not has_more or not hits:
+            return hits, None
+        last_id, last_score = results[-1]
+        return hits, encode_cursor(SimpleNamespace(score=last_score, id=last_id), SEARCH_ORDER)
+
+    def bulk_insert(self, rows, amenity_links=(), chunk_size=BULK_CHUNK_SIZE):
+        """
+        Insert places and their (place_id, amenity_id) links in one transaction.
+        The geohash is computed here since the ORM event does not fire for Core inserts;
+        rows must therefore carry their own 'id' when links reference them.
+        """
+        rows = self._with_defaults(rows)
+        for row in rows:
+            row['geohash'] = geohash_encode(row['latitude'], row['longitude'])
+        self._insert_chunks(Place.__table__, rows, chunk_size)
+        self._insert_chunks(place_amenity, [{'place_id': place_id, 'amenity_id': amenity_id}
+                                            for place_id, amenity_id in amenity_links], chunk_size)
+        commit()
+        ids = [row['id'] for row in rows]
+        for place_id in ids:
+            self.notify_write(place_id)
+        return ids
+
+    def update(self, obj_id, data, expected=None, unmodified_since=None):
+        """
+        Targeted update (see SQLAlchemyRepository.update) that keeps the geohash in step
+        with the coordinates, since the ORM event does not fire for it either. When only
+        one coordinate changes, the other is read first to derive it.
+        """
+        coordinates = {'latitude', 'longitude'} & set(data)
+        if coordinates:
+            if len(coordinates) == 1:
+                other = ({'latitude', 'longitude'} - coordinates).pop()
+                stored = db.session.scalar(select(getattr(Place, other)).where(Place.id == obj_id))
+                if stored is None:
+                    return None
+                data = dict(data, **{other: stored})
+            data = dict(data, geohash=geohash_encode(data['latitude'], data['longitude']))
+        return super().update(obj_id, data, expected, unmodified_since)
+
+    def apply_rating_change(self, place_id, added=None, removed=None):
+        """
+        Adjust a place's review aggregates for one review rated `added` and/or one
+        rated `removed` (an update passes both). See apply_rating_changes().
+        """
+        self.apply_rating_changes([(place_id, added, removed)])
+
+    def apply_rating_changes(self, changes):
+        """
+        Adjust review aggregates for a batch of (place_id, added, removed) changes.
+        Changes to the same place are summed first; then two UPDATEs run in the
+        current transaction, executemany over the places: one bumps the counters,
+        the next recomputes the average from them. Reviews are never scanned.
+        """
+        counters = ('review_count', 'rating_sum', *Place.RATING_HISTOGRAM_COLUMNS)
+        deltas = {}
+        for place_id, added, removed in changes:
+            for rating, delta in ((added, 1), (removed, -1)):
+                if rating:
+                    place_deltas = deltas.setdefault(place_id, dict.fromkeys(counters, 0))
+                    place_deltas['review_count'] += delta
+                    place_deltas['rating_sum'] += delta * rating
+                    place_deltas[f'rating_count_{rating}'] += delta
+        deltas = {place_id: place_deltas for place_id, place_deltas in deltas.items() if any(place_deltas.values())}
+        if not deltas:
+            return
+        table = Place.__table__
+        db.session.execute(
+            table.update().where(table.c.id == bindparam('_place_id')).values(
+                {column: table.c[column] + bindparam(f'_{column}') for column in counters}),
+            [dict({f'_{column}': delta for column, delta in place_deltas.items()}, _place_id=place_id)
+             for place_id, place_deltas in deltas.items()]
+        )
+        db.session.execute(
+            table.update().where(table.c.id == bindparam('_place_id')).values(
+                rating_average=self._average_expression(table.c.rating_sum, table.c.review_count)),
+            [{'_place_id': place_id} for place_id in deltas]
+        )
+        for place_id in deltas:
+            self._expire_aggregates(place_id)
+            self.notify_write(place_id)
+
+    def rebuild_rating_aggregates(self, batch_size=1000):
+        """
+        Recompute every place's aggregates from the Review table, fixing any drift.
+        Only places whose stored aggregates differ are updated (so the others keep
+        their updated_at and ETag), and each of them is reported through notify_write().
+        Returns the number of places repaired, including those left with stale
+        aggregates after their last review was removed.
+        """
+        table = Place.__table__
+        columns = ('review_count', 'rating_sum', *Place.RATING_HISTOGRAM_COLUMNS, 'rating_average')
+        totals = {row[0]: row[1:] for row in db.session.execute(select(
+            Review.place_id,
+            func.count(Review.id),
+            func.sum(Review.rating),
+            *[func.sum(case((Review.rating == rating, 1), else_=0)) for rating in range(1, 6)]
+        ).group_by(Review.place_id))}
+        no_reviews = (0,) * (len(columns) - 1)
+        rows = []
+        for place_id, *stored in db.session.execute(select(table.c.id, *(table.c[column] for column in columns))):
+            counts = tuple(totals.get(place_id, no_reviews))
+            average = counts[1] / counts[0] if counts[0] else 0.0
+            if tuple(stored[:-1]) != counts or abs((stored[-1] or 0.0) - average) > 1e-9:
+                rows.append(dict(zip((f'_{column}' for column in columns), (*counts, average)), _place_id=place_id))
+        statement = table.update().where(table.c.id == bindparam('_place_id')).values(
+            {column: bindparam(f'_{column}') for column in columns})
+        for start in range(0, len(rows), batch_size):
+            db.session.execute(statement, rows[start:start + batch_size])
+        for row in rows:
+            self._expire_aggregates(row['_place_id'])
+            self.notify_write(row['_place_id'])
+        commit()
+        return len(rows)
+
+    @staticmethod
+    def _average_expression(rating_sum, review_count):
+        return case((review_count > 0, rating_sum * 1.0 / review_count), else_=0.0)
+
+    def _expire_aggregates(self, place_id):
+        place = db.session.identity_map.get(db.session.identity_key(Place, place_id))
+        if place is not None:
+            db.session.expire(place, ['review_count', 'rating_sum', 'rating_average',
+                                      *Place.RATING_HISTOGRAM_COLUMNS])
@@ -0,0 +1,62 @@
+"""
+Change tracking for in-process indexes derived from places (PlaceColumnIndex,
+PlaceSearchIndex).
+
+A place index exposes mark(place_ids); every registered index is told which
+places changed once the change is committed. Changes are caught in two ways:
+ORM writes to places and to their reviews through the session flush hook, and
+targeted writes through the place repository's notify_write(), which every
+Core write (bulk import, rating aggregates...) calls.
+"""
+from itertools import chain
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from app import db
+from app.models.place import Place
+from app.models.review import Review
+from app.persistence.hooks import register_repository_hook
+
+def get_place_indexes():
+    """Return the current app's place indexes (none outside an app context)."""
+    if not has_app_context():
+        return ()
+    return tuple(current_app.extensions.get('place_indexes', ()))
+
+def register_place_index(app, index):
+    """Keep `index` informed of committed place changes from now on."""
+    if 'place_indexes' not in app.extensions:
+        app.extensions['place_indexes'] = []
+        register_repository_hook(app, _listen_to_place_writes)
+    app.extensions['place_indexes'].append(index)
+
+def _listen_to_place_writes(repository):
+    from app.persistence.place_repository import PlaceRepository
+    if isinstance(repository, PlaceRepository):
+        repository.write_listeners.append(_record_write)
+    return repository
+
+def _mark(place_ids):
+    for index in get_place_indexes():
+        index.mark(place_ids)
+
+def _record_write(place_id):
+    _mark((place_id,))
+    # Inside a unit of work the write is not committed yet; mark the place again at commit.
+    db.session.info.setdefault('places_written', []).append(place_id)
+
+@event.listens_for(db.session, 'after_flush')
+def _record_flushed(session, flush_context):
+    if get_place_indexes():
+        session.info.setdefault('places_written', []).extend(
+            obj.id if isinstance(obj, Place) else obj.place_id
+            for obj in chain(session.new, session.dirty, session.deleted) if isinstance(obj, (Place, Review)))
+
+@event.listens_for(db.session, 'after_commit')
+def _mark_committed(session):
+    place_ids = session.info.pop('places_written', [])
+    if place_ids:
+        _mark(place_ids)
+
+@event.listens_for(db.session, 'after_rollback')
+def _discard_written(session):
+    session.info.pop('places_written', None)
@@ -0,0 +1,207 @@
+"""
+Database connection pool configuration and instrumentation.
+
+configure_db_pool() turns the DB_POOL_* / DB_STATEMENT_TIMEOUT_MS settings into
+SQLALCHEMY_ENGINE_OPTIONS before Flask-SQLAlchemy builds the engine, and
+init_pool_monitor() then watches the engine's pool: how long checkouts wait for
+a connection, how many connections are in use and how far into overflow the
+pool goes. /api/v1/metrics reports them under 'db_pool'.
+
+In-memory SQLite keeps its single shared connection (sizing does not apply);
+file SQLite, MySQL and PostgreSQL get a TimedQueuePool sized from the config.
+"""
+import threading
+import time
+from collections import deque
+from flask import current_app, has_app_context
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+
+def is_memory_sqlite(url):
+    url = make_url(url)
+    return url.get_backend_name() == 'sqlite' and (
+        url.database in (None, '', ':memory:') or url.query.get('mode') == 'memory')
+
+class TimedQueuePool(QueuePool):
+    """QueuePool reporting how long each checkout waited, and each timeout, to its PoolMonitor."""
+
+    monitor = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            if self.monitor is not None:
+                self.monitor.record_timeout()
+            raise
+        finally:
+            if self.monitor is not None:
+                self.monitor.record_wait(time.perf_counter() - start)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.monitor = self.monitor
+        return pool
+
+def engine_options(config):
+    """Build SQLALCHEMY_ENGINE_OPTIONS from the DB_POOL_* settings; explicit options in the config win."""
+    url = config['SQLALCHEMY_DATABASE_URI']
+    options = {
+        'pool_pre_ping': config.get('DB_POOL_PRE_PING', True),
+        'pool_recycle': config.get('DB_POOL_RECYCLE', 1800),
+    }
+    if not is_memory_sqlite(url):
+        options.update(poolclass=TimedQueuePool, pool_size=config.get('DB_POOL_SIZE', 10),
+                       max_overflow=config.get('DB_MAX_OVERFLOW', 20), pool_timeout=config.get('DB_POOL_TIMEOUT', 30))
+    timeout_ms = config.get('DB_STATEMENT_TIMEOUT_MS', 0)
+    backend = make_url(url).get_backend_name()
+    if timeout_ms and backend == 'mysql':
+        # MySQL only bounds SELECTs this way; MariaDB would need max_statement_time instead.
+        options['connect_args'] = {'init_command': f'SET SESSION max_execution_time={int(timeout_ms)}'}
+    elif timeout_ms and backend == 'postgresql':
+        options['connect_args'] = {'options': f'-c statement_timeout={int(timeout_ms)}'}
+    options.update(config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+    return options
+
+def configure_db_pool(app):
+    """Set SQLALCHEMY_ENGINE_OPTIONS from the pool settings. Call before db.init_app(app)."""
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
+
+def install_sqlite_statement_timeout(engine, timeout_ms):
+    """
+    Interrupt SQLite statements running longer than `timeout_ms`, which SQLite has no
+    setting for: a progress handler aborts the statement once its deadline passes,
+    raising OperationalError('interrupted'). Rows fetched after execute() are not bounded.
+    """
+    limit = timeout_ms / 1000
+
+    @event.listens_for(engine, 'connect')
+    def _install(dbapi_connection, connection_record):
+        deadline = connection_record.info['statement_deadline'] = [None]
+        dbapi_connection.set_progress_handler(
+            lambda: deadline[0] is not None and time.monotonic() > deadline[0], 10000)
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        deadline = conn.info.get('statement_deadline')
+        if deadline is not None:
+            deadline[0] = time.monotonic() + limit
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _stop(conn, cursor, statement, parameters, context, executemany):
+        deadline = conn.info.get('statement_deadline')
+        if deadline is not None:
+            deadline[0] = None
+
+    @event.listens_for(engine, 'handle_error')
+    def _stop_on_error(context):
+        if context.connection is not None:
+            _stop(context.connection, None, None, None, None, None)
+
+class PoolMonitor:
+    """
+    Checkout counters for one engine's pool, fed by pool events and TimedQueuePool.
+    Wait percentiles are computed over the last `window` checkouts.
+    """
+
+    def __init__(self, engine, window=10000):
+        self.engine = engine
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=window)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.invalidations = 0
+        self.connects = 0
+        self.peak_in_use = 0
+        self.peak_overflow = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.waits = 0
+        if isinstance(engine.pool, TimedQueuePool):
+            engine.pool.monitor = self
+        event.listen(engine, 'checkout', self._on_checkout)
+        event.listen(engine, 'connect', self._on_connect)
+        event.listen(engine, 'invalidate', self._on_invalidate)
+
+    def record_wait(self, seconds):
+        with self._lock:
+            self._waits.append(seconds)
+            self.waits += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        in_use, overflow = self._usage()
+        with self._lock:
+            self.checkouts += 1
+            self.peak_in_use = max(self.peak_in_use, in_use or 0)
+            self.peak_overflow = max(self.peak_overflow, overflow or 0)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidations += 1
+
+    def _usage(self):
+        pool = self.engine.pool
+        if not isinstance(pool, QueuePool):
+            return None, None
+        return pool.checkedout(), max(pool.overflow(), 0)
+
+    def stats(self):
+        pool = self.engine.pool
+        in_use, overflow = self._usage()
+        with self._lock:
+            waits = sorted(self._waits)
+            return {
+                'pool': type(pool).__name__,
+                'size': pool.size() if isinstance(pool, QueuePool) else None,
+                'max_overflow': pool._max_overflow if isinstance(pool, QueuePool) else None,
+                'in_use': in_use,
+                'idle': pool.checkedin() if isinstance(pool, QueuePool) else None,
+                'overflow': overflow,
+                'peak_in_use': self.peak_in_use,
+                'peak_overflow': self.peak_overflow,
+                'checkouts': self.checkouts,
+                'connects': self.connects,
+                'timeouts': self.timeouts,
+                'invalidations': self.invalidations,
+                'checkout_wait_ms': {
+                    'mean': round(self.wait_total / self.waits * 1000, 3) if self.waits else None,
+                    'p50': _percentile_ms(waits, 0.5),
+                    'p99': _percentile_ms(waits, 0.99),
+                    'max': round(self.wait_max * 1000, 3)
+                }
+            }
+
+def _percentile_ms(sorted_seconds, q):
+    if not sorted_seconds:
+        return None
+    return round(sorted_seconds[min(len(sorted_seconds) - 1, int(q * len(sorted_seconds)))] * 1000, 3)
+
+def get_pool_monitor():
+    """Return the current app's PoolMonitor, or None outside an app context."""
+    if not has_app_context():
+        return None
+    return current_app.extensions.get('db_pool')
+
+def init_pool_monitor(app):
+    """Watch the app's engine pool and bound SQLite statements. Call after db.init_app(app)."""
+    from app import db
+    with app.app_context():
+        engine = db.engine
+    timeout_ms = app.config.get('DB_STATEMENT_TIMEOUT_MS', 0)
+    if timeout_ms and engine.dialect.name == 'sqlite':
+        install_sqlite_statement_timeout(engine, timeout_ms)
+    monitor = PoolMonitor(engine)
+    app.extensions['db_pool'] = monitor
+    return monitor
@@ -0,0 +1,220 @@
+"""
+Read-replica routing for GET requests.
+
+Each URL in DB_REPLICA_URIS gets an engine ('replica_0', ...) pooled like the
+primary. Repository methods marked @replica_read run their SELECTs on a replica
+when all of the following hold, and on the primary otherwise:
+
+- the request is a GET or HEAD;
+- the session has not written yet (read-your-writes: the first INSERT, UPDATE,
+  DELETE or flush pins the session to the primary for the rest of the request);
+- the statement is a plain SELECT (no FOR UPDATE);
+- a replica is within DB_REPLICA_MAX_LAG seconds of the primary. The lag guard
+  re-probes each replica at most every DB_REPLICA_LAG_CHECK_INTERVAL seconds, and
+  treats a failed probe as unhealthy.
+
+A session sticks to the first replica it reads from, so one response never mixes
+two replicas' views. In-process indexes that drop their queued rows once re-read
+load them under primary_reads(), since a lagging replica would pin the old rows. /api/v1/metrics reports the routing under 'db_replicas'.
+"""
+import functools
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from flask import current_app, has_app_context, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, exc, text
+from app.persistence.pool import engine_options, install_sqlite_statement_timeout
+
+SAFE_METHODS = frozenset(('GET', 'HEAD'))
+# Session.info keys: set once the session writes, and the replica it reads from.
+_PINNED_KEY = 'primary_pinned'
+_REPLICA_KEY = 'read_replica'
+
+_replica_reads = ContextVar('replica_reads', default=False)
+
+def replica_read(func):
+    """Mark a repository method as read-only: its SELECTs may be served by a replica."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _replica_reads.set(True)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _replica_reads.reset(token)
+    return wrapper
+
+@contextmanager
+def primary_reads():
+    """Run the block's SELECTs on the primary, even inside a @replica_read method."""
+    token = _replica_reads.set(False)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+def read_from_replica(session):
+    """Return whether `session` has served any read from a replica."""
+    return _REPLICA_KEY in session.info
+
+class RoutingSession(Session):
+    """db.session class sending eligible SELECTs to a replica (see the module docstring)."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            if self._flushing or not getattr(clause, 'is_select', False):
+                self.info[_PINNED_KEY] = True
+            elif (_replica_reads.get() and not self.info.get(_PINNED_KEY)
+                  and getattr(clause, '_for_update_arg', None) is None
+                  and has_request_context() and request.method in SAFE_METHODS):
+                engine = self._replica_engine()
+                if engine is not None:
+                    return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _replica_engine(self):
+        router = get_replica_router()
+        if router is None:
+            return None
+        name = self.info.get(_REPLICA_KEY)
+        replica = router.replicas[name] if name is not None else router.choose()
+        if replica is None:
+            return None
+        self.info[_REPLICA_KEY] = replica.name
+        router.record_read(replica)
+        return replica.engine
+
+def replica_lag(connection):
+    """
+    Return how many seconds the database behind `connection` lags its primary, or None
+    when replication is stopped. A server that is not replicating reports 0.
+    """
+    dialect = connection.dialect.name
+    if dialect == 'mysql':
+        row = connection.exec_driver_sql('SHOW REPLICA STATUS').mappings().first()
+        if row is None:
+            return 0.0
+        lag = row.get('Seconds_Behind_Source')
+        return None if lag is None else float(lag)
+    if dialect == 'postgresql':
+        # An idle primary leaves the last replay timestamp behind; caught-up WAL means no lag.
+        return float(connection.scalar(text(
+            "SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() "
+            "THEN 0 ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END")))
+    return 0.0  # SQLite has no replication
+
+class Replica:
+    """One replica engine, its last measured lag and its read counters."""
+
+    def __init__(self, name, engine):
+        self.name = name
+        self.engine = engine
+        self.lag = None
+        self.checked_at = None
+        self.reads = 0
+        self.skipped = 0
+        self.probe_errors = 0
+        self.probe_lock = threading.Lock()
+
+class ReplicaRouter:
+    """
+    Picks a replica for a session, round-robin among those whose lag is at most
+    `max_lag` seconds. `lag_probe(connection)` measures a replica's lag; it runs at
+    most every `check_interval` seconds per replica, in whichever request asks first.
+    """
+
+    def __init__(self, engines, max_lag=5.0, check_interval=1.0, lag_probe=replica_lag):
+        self.replicas = {name: Replica(name, engine) for name, engine in engines.items()}
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.lag_probe = lag_probe
+        self.primary_fallbacks = 0
+        self._order = list(self.replicas.values())
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
+
+    def choose(self):
+        """Return a replica within the lag limit, or None when every replica lags or fails."""
+        start = next(self._turn)
+        for offset in range(len(self._order)):
+            replica = self._order[(start + offset) % len(self._order)]
+            if self._within_lag(replica):
+                return replica
+            with self._lock:
+                replica.skipped += 1
+        with self._lock:
+            self.primary_fallbacks += 1
+        return None
+
+    def record_read(self, replica):
+        with self._lock:
+            replica.reads += 1
+
+    def _within_lag(self, replica):
+        due = replica.checked_at is None or time.monotonic() - replica.checked_at >= self.check_interval
+        # One thread probes; the others keep the last measure unless there is none yet.
+        if due and replica.probe_lock.acquire(blocking=replica.checked_at is None):
+            try:
+                self._probe(replica)
+            finally:
+                replica.probe_lock.release()
+        lag = replica.lag
+        return lag is not None and lag <= self.max_lag
+
+    def _probe(self, replica):
+        try:
+            with replica.engine.connect() as connection:
+                replica.lag = self.lag_probe(connection)
+        except exc.SQLAlchemyError:
+            replica.lag = None
+            with self._lock:
+                replica.probe_errors += 1
+        replica.checked_at = time.monotonic()
+
+    def dispose(self):
+        for replica in self._order:
+            replica.engine.dispose()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'max_lag': self.max_lag,
+                'check_interval': self.check_interval,
+                'primary_fallbacks': self.primary_fallbacks,
+                'replicas': {replica.name: {
+                    'lag': replica.lag,
+                    'within_lag': replica.lag is not None and replica.lag <= self.max_lag,
+                    'reads': replica.reads,
+                    'skipped': replica.skipped,
+                    'probe_errors': replica.probe_errors
+                } for replica in self._order}
+            }
+
+def get_replica_router():
+    """Return the current app's ReplicaRouter, or None when no replica is configured."""
+    if not has_app_context():
+        return None
+    return current_app.extensions.get('db_replicas')
+
+def init_db_replicas(app):
+    """
+    Create an engine per DB_REPLICA_URIS entry, pooled like the primary, and route reads
+    to them. Call before configure_db_pool(app), which replaces SQLALCHEMY_ENGINE_OPTIONS
+    with the primary's options.
+    """
+    urls = app.config.get('DB_REPLICA_URIS', ())
+    if not urls:
+        return None
+    timeout_ms = app.config.get('DB_STATEMENT_TIMEOUT_MS', 0)
+    engines = {}
+    for i, url in enumerate(urls):
+        engine = create_engine(url, **engine_options(dict(app.config, SQLALCHEMY_DATABASE_URI=url)))
+        if timeout_ms and engine.dialect.name == 'sqlite':
+            install_sqlite_statement_timeout(engine, timeout_ms)
+        engines[f'replica_{i}'] = engine
+    router = ReplicaRouter(engines, app.config.get('DB_REPLICA_MAX_LAG', 5.0),
+                           app.config.get('DB_REPLICA_LAG_CHECK_INTERVAL', 1.0))
+    app.extensions['db_replicas'] = router
+    return router
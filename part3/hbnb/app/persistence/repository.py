@@ -1,6 +1,16 @@
+import uuid
 from abc import ABC, abstractmethod
+from datetime import datetime
+from sqlalchemy import inspect, select
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
 from app import db
 from app.models import User, Place, Review, Amenity
+from app.persistence.unit_of_work import commit
+from app.persistence.pagination import DEFAULT_ORDER, encode_cursor, keyset_query
+from app.persistence.replicas import replica_read
+from app.persistence.versions import make_version
 
 class Repository(ABC):
     @abstractmethod
@@ -16,7 +26,7 @@ class Repository(ABC):
         pass
 
     @abstractmethod
-    def update(self, obj_id, data):
+    def update(self, obj_id, data, expected=None, unmodified_since=None):
         pass
 
     @abstractmethod
@@ -27,35 +37,304 @@ class Repository(ABC):
     def get_by_attribute(self, attr_name, attr_value):
         pass
 
+# IN lists are split to stay under the database's bound-parameter limit (999 on
+# older SQLite builds); bulk INSERT/DELETE statements are issued per chunk.
+IN_CHUNK_SIZE = 500
+BULK_CHUNK_SIZE = 1000
+
+class UpdateConflict(Exception):
+    """
+    Raised by a conditional update() when the row exists but fails a condition.
+    `conditions` names the ones it failed: columns of `expected`, and 'updated_at'
+    when the row was modified after `unmodified_since`.
+    """
+
+    def __init__(self, obj_id, conditions):
+        super().__init__(f"Update of {obj_id} rejected: {', '.join(conditions)} did not match.")
+        self.obj_id = obj_id
+        self.conditions = tuple(conditions)
+
+def chunked(items, size):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+class QueryBuilder:
+    """
+    Compose optional filters onto a model query so they run in SQL.
+    Criteria whose value is None are skipped, letting callers pass request
+    parameters straight through. Every method returns the builder for chaining.
+    """
+
+    def __init__(self, model, query):
+        self.model = model
+        self.query = query
+
+    def equals(self, **values):
+        for attr_name, value in values.items():
+            if value is not None:
+                self.query = self.query.filter(getattr(self.model, attr_name) == value)
+        return self
+
+    def between(self, attr_name, minimum=None, maximum=None):
+        column = getattr(self.model, attr_name)
+        if minimum is not None:
+            self.query = self.query.filter(column >= minimum)
+        if maximum is not None:
+            self.query = self.query.filter(column <= maximum)
+        return self
+
+    def where(self, *criteria):
+        self.query = self.query.filter(*criteria)
+        return self
+
+    @replica_read
+    def all(self):
+        return self.query.all()
+
 class SQLAlchemyRepository(Repository):
     def __init__(self, model):
         self.model = model
+        # Callables invoked with an object id after a write that bypasses add/update/delete.
+        self.write_listeners = []
+
+    def notify_write(self, obj_id):
+        for listener in self.write_listeners:
+            listener(obj_id)
 
     def add(self, obj):
         db.session.add(obj)
-        db.session.commit()
+        commit()
 
+    @replica_read
     def get(self, obj_id):
         return self.model.query.get(obj_id)
 
+    @replica_read
     def get_all(self):
         return self.model.query.all()
 
-    def update(self, obj_id, data):
+    def query_builder(self, query=None):
+        """Start a QueryBuilder on `query`, or on the whole table when omitted."""
+        return QueryBuilder(self.model, self.model.query if query is None else query)
+
+    @replica_read
+    def get_page(self, limit, cursor=None, query=None, order=DEFAULT_ORDER):
+        """
+        Retrieve up to `limit` objects following `cursor`, by default ordered by (created_at, id).
+        Returns a (items, next_cursor) tuple; next_cursor is None on the last page.
+        """
+        if query is None:
+            query = self.model.query
+        items = keyset_query(query, self.model, limit, cursor, order).all()
+        if len(items) > limit:
+            items = items[:limit]
+            return items, encode_cursor(items[-1], order)
+        return items, None
+
+    @replica_read
+    def get_version(self, obj_id):
+        """Return the Version of an object from its updated_at alone, or None when it does not exist."""
+        updated_at = db.session.scalar(select(self.model.updated_at).where(self.model.id == obj_id))
+        return None if updated_at is None else make_version((updated_at,), obj_id, single=True)
+
+    @replica_read
+    def get_page_version(self, limit, cursor=None, order=DEFAULT_ORDER):
+        """
+        Return the Version of the page get_page(limit, cursor, order=order) would return.
+        The same keyset query runs, but only reads the ids and updated_at of the rows.
+        """
+        columns = db.session.query(self.model.id, self.model.updated_at)
+        rows = keyset_query(columns, self.model, limit, cursor, order).all()
+        return make_version((updated_at for _, updated_at in rows), [obj_id for obj_id, _ in rows])
+
+    def iter_pages(self, limit, cursor=None, query=None, order=DEFAULT_ORDER):
+        """Yield successive pages of at most `limit` objects until the table is exhausted."""
+        while True:
+            items, cursor = self.get_page(limit, cursor, query, order)
+            if items:
+                yield items
+            if cursor is None:
+                return
+
+    @replica_read
+    def get_many(self, ids):
+        """Load the objects with the given ids using one IN query per chunk. Returns {id: obj}."""
+        found = {}
+        for chunk in chunked(set(ids), IN_CHUNK_SIZE):
+            for obj in self.model.query.filter(self.model.id.in_(chunk)):
+                found[obj.id] = obj
+        return found
+
+    @replica_read
+    def get_many_version(self, ids):
+        """Return the Version of the objects get_many(ids) would return, from their updated_at."""
+        rows = []
+        for chunk in chunked(set(ids), IN_CHUNK_SIZE):
+            rows.extend(db.session.execute(
+                select(self.model.id, self.model.updated_at).where(self.model.id.in_(chunk))).all())
+        rows.sort()
+        return make_version((updated_at for _, updated_at in rows), [obj_id for obj_id, _ in rows])
+
+    @replica_read
+    def existing_ids(self, ids):
+        """Return the subset of `ids` present in the table, reading only the primary key."""
+        found = set()
+        for chunk in chunked(set(ids), IN_CHUNK_SIZE):
+            found.update(db.session.scalars(select(self.model.id).where(self.model.id.in_(chunk))))
+        return found
+
+    def bulk_insert(self, rows, chunk_size=BULK_CHUNK_SIZE):
+        """
+        Insert `rows` (dicts of column values) with one executemany INSERT per chunk,
+        committing once at the end. Missing ids and timestamps are filled in, other
+        column defaults are applied by SQLAlchemy. Returns the inserted ids in order.
+        ORM events do not fire, so callers supply derived columns themselves.
+        """
+        rows = self._with_defaults(rows)
+        self._insert_chunks(self.model.__table__, rows, chunk_size)
+        commit()
+        ids = [row['id'] for row in rows]
+        for obj_id in ids:
+            self.notify_write(obj_id)
+        return ids
+
+    def bulk_update(self, changes, objects=None):
+        """
+        Apply `changes`, a {id: data} mapping, to the objects and commit once; the flush
+        batches the UPDATEs. `objects` is the {id: obj} mapping from an earlier get_many()
+        call, loaded here when omitted. Returns the updated objects.
+        """
+        if objects is None:
+            objects = self.get_many(changes)
+        objects = {obj_id: obj for obj_id, obj in objects.items() if obj_id in changes}
+        for obj_id, obj in objects.items():
+            for key, value in changes[obj_id].items():
+                setattr(obj, key, value)
+        commit()
+        for obj_id in objects:
+            self.notify_write(obj_id)
+        return list(objects.values())
+
+    def bulk_delete(self, ids, chunk_size=BULK_CHUNK_SIZE):
+        """
+        Delete the rows with the given ids with one DELETE ... IN per chunk, committing
+        once. Association rows of many-to-many relationships are removed first, as the
+        ORM does for a single delete. Returns the number of rows deleted.
+        """
+        table = self.model.__table__
+        secondaries = [(rel.secondary, rel.synchronize_pairs[0][1])
+                       for rel in inspect(self.model).relationships if rel.secondary is not None]
+        deleted = 0
+        for chunk in chunked(set(ids), min(chunk_size, IN_CHUNK_SIZE)):
+            for secondary, column in secondaries:
+                db.session.execute(secondary.delete().where(column.in_(chunk)))
+            deleted += db.session.execute(table.delete().where(table.c.id.in_(chunk))).rowcount
+        commit()
+        db.session.expire_all()
+        for obj_id in ids:
+            self.notify_write(obj_id)
+        return deleted
+
+    @staticmethod
+    def _insert_chunks(table, rows, chunk_size=BULK_CHUNK_SIZE):
+        for chunk in chunked(rows, chunk_size):
+            db.session.execute(table.insert(), chunk)
+
+    @staticmethod
+    def _with_defaults(rows):
+        now = datetime.utcnow()
+        return [dict({'id': str(uuid.uuid4()), 'created_at': now, 'updated_at': now}, **row) for row in rows]
+
+    def update(self, obj_id, data, expected=None, unmodified_since=None):
+        """
+        Apply `data` with a single UPDATE ... WHERE id = ? RETURNING the row, and return
+        the updated object, or None when no row has that id. Nothing is read before
+        the write, and the returned values become the object's committed state, so
+        serializing it afterwards issues no SELECT either. Databases without UPDATE
+        ... RETURNING (MySQL) run the UPDATE, check its rowcount and select the row
+        back by primary key in the same transaction.
+
+        `expected` maps columns to the values the row must still hold (its owner, the
+        rating being replaced...), and `unmodified_since` makes the write optimistic:
+        the row's updated_at must not be later. Both go into the WHERE clause; when
+        they exclude an existing row, one probe tells it from a missing row and
+        UpdateConflict is raised. Keys that are not columns (relationships) fall back
+        to loading the object and setting its attributes.
+        """
+        expected = expected or {}
+        table = self.model.__table__
+        if not set(data) <= set(table.c.keys()):
+            return self._update_object(obj_id, data, expected, unmodified_since)
+        statement = table.update().where(table.c.id == obj_id, *self._conditions(expected, unmodified_since))
+        if db.engine.dialect.update_returning:
+            row = db.session.execute(statement.values(data).returning(*table.c)).mappings().one_or_none()
+        elif db.session.execute(statement.values(data)).rowcount:
+            # MySQL has no UPDATE ... RETURNING: read the row back inside the same transaction.
+            row = db.session.execute(select(*table.c).where(table.c.id == obj_id)).mappings().one()
+        else:
+            row = None
+        if row is None:
+            self._raise_conflict(obj_id, expected, unmodified_since)
+            return None
+        commit()
+        self.notify_write(obj_id)
+        return self._attach(row)
+
+    def _conditions(self, expected, unmodified_since=None):
+        criteria = [getattr(self.model, column) == value for column, value in expected.items()]
+        if unmodified_since is not None:
+            criteria.append(self.model.updated_at <= unmodified_since)
+        return criteria
+
+    def _raise_conflict(self, obj_id, expected, unmodified_since=None):
+        """After a conditional write matched no row: raise UpdateConflict unless the row is missing."""
+        if not expected and unmodified_since is None:
+            return
+        columns = [getattr(self.model, column) for column in expected] + [self.model.updated_at]
+        row = db.session.execute(select(*columns).where(self.model.id == obj_id)).one_or_none()
+        if row is not None:
+            self._check_conditions(obj_id, dict(zip(list(expected) + ['updated_at'], row)), expected, unmodified_since)
+
+    @staticmethod
+    def _check_conditions(obj_id, current, expected, unmodified_since=None):
+        failed = [column for column, value in expected.items() if current[column] != value]
+        if unmodified_since is not None and current['updated_at'] > unmodified_since:
+            failed.append('updated_at')
+        if failed:
+            raise UpdateConflict(obj_id, failed)
+
+    def _update_object(self, obj_id, data, expected, unmodified_since=None):
         obj = self.get(obj_id)
         if obj:
+            self._check_conditions(obj_id, {column: getattr(obj, column) for column in [*expected, 'updated_at']},
+                                   expected, unmodified_since)
             for key, value in data.items():
                 setattr(obj, key, value)
-            db.session.commit()
+            commit()
+        return obj
+
+    def _attach(self, row):
+        """Return the session's object for `row` (a mapping of every column) with those values as committed state."""
+        obj = db.session.identity_map.get(identity_key(self.model, row['id']))
+        attached = obj is not None
+        if not attached:
+            obj = self.model.__mapper__.class_manager.new_instance()
+        for key, value in row.items():
+            set_committed_value(obj, key, value)
+        if not attached:
+            make_transient_to_detached(obj)
+            db.session.add(obj)
         return obj
 
     def delete(self, obj_id):
         obj = self.get(obj_id)
         if obj:
             db.session.delete(obj)
-            db.session.commit()
+            commit()
             return True
         return False
 
+    @replica_read
     def get_by_attribute(self, attr_name, attr_value):
         return self.model.query.filter(getattr(self.model, attr_name) == attr_value).first()
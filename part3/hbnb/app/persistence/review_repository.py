@@ -0,0 +1,86 @@
+from sqlalchemy import exists, select
+from sqlalchemy.orm import joinedload
+from app.persistence.repository import SQLAlchemyRepository, IN_CHUNK_SIZE, chunked
+from app.persistence.unit_of_work import commit
+from app.persistence.pagination import DEFAULT_ORDER, keyset_query
+from app.persistence.replicas import replica_read
+from app.persistence.versions import make_version
+from app.models.review import Review
+from app.models.user import User
+from app import db
+
+class ReviewRepository(SQLAlchemyRepository):
+    def __init__(self):
+        super().__init__(Review)
+
+    @replica_read
+    def reviewed_pairs(self, user_ids, place_ids):
+        """
+        Return the (user_id, place_id) pairs that already have a review, among the given
+        users and places. Only the two key columns are read, one IN query per chunk of
+        places; the user list is pushed into SQL too when it is small (the common
+        single-author batch).
+        """
+        user_ids = set(user_ids)
+        pairs = set()
+        if not user_ids:
+            return pairs
+        for chunk in chunked(set(place_ids), IN_CHUNK_SIZE):
+            query = select(Review.user_id, Review.place_id).where(Review.place_id.in_(chunk))
+            if len(user_ids) <= IN_CHUNK_SIZE:
+                query = query.where(Review.user_id.in_(user_ids))
+            pairs.update(tuple(row) for row in db.session.execute(query))
+        return {pair for pair in pairs if pair[0] in user_ids}
+
+    @replica_read
+    def has_reviewed(self, user_id, place_id):
+        """Tell whether `user_id` already reviewed `place_id`, with one EXISTS probe on idx_review_user_place."""
+        return db.session.scalar(select(exists().where(Review.user_id == user_id, Review.place_id == place_id)))
+
+    @replica_read
+    def get_page_for_place(self, place_id, limit, cursor=None, order=DEFAULT_ORDER):
+        """
+        Retrieve a page of the reviews of one place in `order`, with each reviewer's
+        name joined in. The place_id equality plus the keyset order match
+        idx_review_place_created / idx_review_place_rating, so a page costs an index
+        seek however many reviews the place has.
+        """
+        query = Review.query.filter(Review.place_id == place_id).options(
+            joinedload(Review.user, innerjoin=True).load_only(User.first_name, User.last_name))
+        return self.get_page(limit, cursor, query, order)
+
+    @replica_read
+    def get_page_version_for_place(self, place_id, limit, cursor=None, order=DEFAULT_ORDER):
+        """
+        Return the Version of the page get_page_for_place would return, from the ids
+        and updated_at of its reviews and of their authors (whose names it embeds).
+        """
+        columns = db.session.query(Review.id, Review.updated_at, User.updated_at).join(Review.user).filter(
+            Review.place_id == place_id)
+        rows = keyset_query(columns, Review, limit, cursor, order).all()
+        timestamps = [timestamp for _, review_at, user_at in rows for timestamp in (review_at, user_at)]
+        return make_version(timestamps, [review_id for review_id, _, _ in rows])
+
+    def delete_rated(self, ids):
+        """
+        Delete the reviews with the given ids and return (place_id, rating) for each row
+        actually deleted, as the DELETE saw it: callers moving the places' aggregates
+        subtract exactly those ratings, whatever a cached or replicated copy held.
+        Databases without DELETE ... RETURNING (MySQL) lock the rows with SELECT ... FOR
+        UPDATE first, in the same transaction.
+        """
+        table = Review.__table__
+        deleted = []
+        for chunk in chunked(set(ids), IN_CHUNK_SIZE):
+            statement = table.delete().where(table.c.id.in_(chunk))
+            if db.engine.dialect.delete_returning:
+                deleted.extend(db.session.execute(statement.returning(table.c.place_id, table.c.rating)))
+            else:
+                deleted.extend(db.session.execute(select(table.c.place_id, table.c.rating).where(
+                    table.c.id.in_(chunk)).with_for_update()))
+                db.session.execute(statement)
+        commit()
+        db.session.expire_all()
+        for review_id in ids:
+            self.notify_write(review_id)
+        return [tuple(row) for row in deleted]
@@ -0,0 +1,225 @@
+"""
+In-process full-text index over places: title, description and review texts.
+
+Each place is one document. Its terms come from the title (counted TITLE_WEIGHT
+times, so a title match outranks a passing mention), the description and every
+review of the place. Queries are ranked with Okapi BM25; a document matches
+when it contains any query term.
+
+The index is built from the database on first use and then updated
+incrementally: place_sync queues the places whose row or reviews changed, and
+those documents are re-read and re-indexed before the next search. Postings are
+kept in dicts for cheap updates and compiled to NumPy arrays per term on demand,
+so scoring a term is one vectorized expression over its documents.
+
+place_sync only sees the writes of its own process. Changes made by other
+processes are picked up by a full rebuild once the index is older than
+`max_age` seconds (SEARCH_INDEX_MAX_AGE), so that is how long they can be
+missing from search results.
+"""
+import math
+import re
+import threading
+import time
+from collections import Counter
+import numpy as np
+from flask import current_app, has_app_context
+from sqlalchemy import select
+from app import db
+from app.models.place import Place
+from app.models.review import Review
+from app.persistence.hooks import register_repository_hook
+from app.persistence.pagination import decode_cursor
+from app.persistence.place_sync import register_place_index
+from app.persistence.replicas import primary_reads
+from app.persistence.repository import IN_CHUNK_SIZE, chunked
+
+_TOKEN = re.compile(r'[^\W_]+')
+TITLE_WEIGHT = 3
+# Keyset order of search results: best score first, ties by id.
+SEARCH_ORDER = (('score', True), ('id', False))
+
+def tokenize(text):
+    return _TOKEN.findall(text.lower()) if text else []
+
+class PlaceSearchIndex:
+    """BM25-ranked inverted index of place documents."""
+
+    def __init__(self, k1=1.2, b=0.75, max_age=300):
+        self.k1 = k1
+        self.b = b
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self._pending_lock = threading.Lock()
+        self._pending = set()
+        self._loaded_at = None
+        self._reset()
+
+    def _reset(self):
+        self._docs = {}           # place id -> document number
+        self._ids = np.zeros(0, 'S36')
+        self._lengths = np.zeros(0, np.float64)
+        self._size = 0
+        self._live = 0
+        self._total_length = 0
+        self._free = []           # document numbers of removed places, reused first
+        self._postings = {}       # term -> {document: term frequency}
+        self._doc_terms = {}      # document -> Counter of its terms
+        self._compiled = {}       # term -> (documents, frequencies) arrays
+
+    # --- Synchronization ---
+    def mark(self, place_ids):
+        """Queue places whose text changed; they are re-indexed before the next search."""
+        with self._pending_lock:
+            self._pending.update(place_ids)
+
+    def sync(self):
+        """Build the index when missing or older than max_age (0: never), else re-index queued places."""
+        # On the primary: a replica that lags the write would re-index the place's old text.
+        with self._lock, primary_reads():
+            with self._pending_lock:
+                pending, self._pending = self._pending, set()
+            if self._loaded_at is None or (self.max_age and time.monotonic() - self._loaded_at > self.max_age):
+                self._load_all()
+            elif pending:
+                self._refresh(pending)
+
+    def _load_all(self):
+        self._reset()
+        documents = {place_id: self._terms(title, description)
+                     for place_id, title, description in db.session.execute(
+                         select(Place.id, Place.title, Place.description))}
+        for place_id, text in db.session.execute(select(Review.place_id, Review.text)):
+            terms = documents.get(place_id)
+            if terms is not None:
+                terms.update(tokenize(text))
+        for place_id, terms in documents.items():
+            self._index(place_id, terms)
+        self._loaded_at = time.monotonic()
+
+    def _refresh(self, place_ids):
+        for chunk in chunked(place_ids, IN_CHUNK_SIZE):
+            documents = {place_id: self._terms(title, description)
+                         for place_id, title, description in db.session.execute(
+                             select(Place.id, Place.title, Place.description).where(Place.id.in_(chunk)))}
+            for place_id, text in db.session.execute(
+                    select(Review.place_id, Review.text).where(Review.place_id.in_(list(documents)))):
+                documents[place_id].update(tokenize(text))
+            for place_id in chunk:
+                self._unindex(place_id)
+                if place_id in documents:
+                    self._index(place_id, documents[place_id])
+
+    @staticmethod
+    def _terms(title, description):
+        terms = Counter(tokenize(description))
+        for term in tokenize(title):
+            terms[term] += TITLE_WEIGHT
+        return terms
+
+    def _index(self, place_id, terms):
+        if self._free:
+            document = self._free.pop()
+        else:
+            document = self._size
+            self._grow(document + 1)
+            self._size += 1
+        self._docs[place_id] = document
+        self._ids[document] = place_id
+        length = sum(terms.values())
+        self._lengths[document] = length
+        self._total_length += length
+        self._live += 1
+        self._doc_terms[document] = terms
+        for term, frequency in terms.items():
+            self._postings.setdefault(term, {})[document] = frequency
+            self._compiled.pop(term, None)
+
+    def _unindex(self, place_id):
+        document = self._docs.pop(place_id, None)
+        if document is None:
+            return
+        for term in self._doc_terms.pop(document):
+            postings = self._postings[term]
+            del postings[document]
+            if not postings:
+                del self._postings[term]
+            self._compiled.pop(term, None)
+        self._total_length -= self._lengths[document]
+        self._lengths[document] = 0
+        self._live -= 1
+        self._free.append(document)
+
+    def _grow(self, size):
+        if size > len(self._ids):
+            capacity = max(1024, 2 * len(self._ids), size)
+            ids, lengths = np.zeros(capacity, 'S36'), np.zeros(capacity, np.float64)
+            ids[:len(self._ids)], lengths[:len(self._lengths)] = self._ids, self._lengths
+            self._ids, self._lengths = ids, lengths
+
+    def _postings_arrays(self, term):
+        compiled = self._compiled.get(term)
+        if compiled is None:
+            postings = self._postings.get(term, {})
+            compiled = (np.fromiter(postings.keys(), np.int64, len(postings)),
+                        np.fromiter(postings.values(), np.float64, len(postings)))
+            self._compiled[term] = compiled
+        return compiled
+
+    # --- Queries ---
+    def search(self, query, limit, cursor=None):
+        """
+        Return ([(place_id, score)], has_more) for the `limit` best matches of
+        `query` following `cursor` (see SEARCH_ORDER).
+        """
+        terms = set(tokenize(query))
+        if not terms:
+            return [], False
+        with self._lock:
+            self.sync()
+            if not self._live:
+                return [], False
+            scores = np.zeros(self._size, np.float64)
+            average_length = self._total_length / self._live
+            for term in terms:
+                documents, frequencies = self._postings_arrays(term)
+                if not len(documents):
+                    continue
+                idf = math.log(1 + (self._live - len(documents) + 0.5) / (len(documents) + 0.5))
+                norms = self.k1 * (1 - self.b + self.b * self._lengths[documents] / average_length)
+                scores[documents] += idf * frequencies * (self.k1 + 1) / (frequencies + norms)
+            matches = scores.nonzero()[0]
+            if cursor:
+                score, place_id = decode_cursor(cursor, SEARCH_ORDER)
+                found, ids = scores[matches], self._ids[matches]
+                matches = matches[(found < score) | ((found == score) & (ids > place_id.encode('ascii')))]
+            count = limit + 1
+            if len(matches) > count:
+                found = scores[matches]
+                matches = matches[found >= np.partition(found, len(found) - count)[len(found) - count]]
+            ranked = matches[np.lexsort((self._ids[matches], -scores[matches]))][:count]
+            results = list(zip(self._ids[ranked].astype(str).tolist(), scores[ranked].tolist()))
+        return results[:limit], len(results) > limit
+
+    def info(self):
+        return {'documents': self._live, 'terms': len(self._postings), 'pending': len(self._pending)}
+
+def get_search_index():
+    """Return the current app's PlaceSearchIndex, or None outside an app context."""
+    if not has_app_context():
+        return None
+    return current_app.extensions.get('search_index')
+
+def init_search_index(app):
+    """Create the place search index and attach it to the place repository."""
+    from app.persistence.place_repository import PlaceRepository
+    index = PlaceSearchIndex(max_age=app.config.get('SEARCH_INDEX_MAX_AGE', 300))
+    app.extensions['search_index'] = index
+
+    def attach(repository):
+        if isinstance(repository, PlaceRepository):
+            repository.search_index = index
+        return repository
+    register_repository_hook(app, attach)
+    register_place_index(app, index)
+    return index
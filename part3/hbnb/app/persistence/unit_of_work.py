@@ -0,0 +1,41 @@
+from contextlib import contextmanager
+from app import db
+
+_DEPTH_KEY = 'unit_of_work_depth'
+
+@contextmanager
+def unit_of_work():
+    """
+    Group every write made inside the block into one transaction.
+
+    Repositories end their writes with commit() below, which only flushes while a
+    unit of work is open; the outermost block commits once on success and rolls
+    back on any exception. Nested blocks join the outermost one.
+
+    Usage:
+        with unit_of_work():
+            repository.add(amenity)
+            place.amenities.append(amenity)
+    """
+    info = db.session.info
+    depth = info.get(_DEPTH_KEY, 0)
+    info[_DEPTH_KEY] = depth + 1
+    try:
+        yield db.session
+        if depth == 0:
+            db.session.commit()
+    except BaseException:
+        db.session.rollback()
+        raise
+    finally:
+        info[_DEPTH_KEY] = depth
+
+def in_unit_of_work():
+    return db.session.info.get(_DEPTH_KEY, 0) > 0
+
+def commit():
+    """Commit the session, or just flush it when a unit of work will commit later."""
+    if in_unit_of_work():
+        db.session.flush()
+    else:
+        db.session.commit()
@@ -1,11 +1,13 @@
+from app.persistence.unit_of_work import commit
 from app.persistence.repository import SQLAlchemyRepository
+from app.persistence.replicas import replica_read
 from app.models.user import User
-from app import db
 
 class UserRepository(SQLAlchemyRepository):
     def __init__(self):
         super().__init__(User)
 
+    @replica_read
     def get_by_email(self, email):
         """
         Retrieve a user by their email address.
@@ -22,5 +24,5 @@ class UserRepository(SQLAlchemyRepository):
         if not user:
             raise ValueError("User not found.")
         user.hash_password(new_password)
-        db.session.commit()  # Commit the changes to the database
+        commit()
         return user
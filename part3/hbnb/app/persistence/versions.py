@@ -0,0 +1,26 @@
+"""
+Versions of stored representations, for conditional GETs.
+
+A Version is computed from updated_at columns and row counts only, without
+loading or serializing the objects it describes. Its tag changes whenever the
+representation can change, and last_modified is the latest updated_at seen.
+The HTTP layer turns it into a strong ETag and a Last-Modified header.
+
+Only a single resource's Version is `single`: a collection can lose a row
+without its latest updated_at moving, so If-Modified-Since is only honored
+for single resources, and collections rely on the ETag.
+"""
+import hashlib
+from collections import namedtuple
+
+Version = namedtuple('Version', ('last_modified', 'tag', 'single'), defaults=(False,))
+
+def make_version(timestamps, *parts, single=False):
+    """
+    Build a Version from the updated_at values of everything represented
+    (None entries are ignored) and any other values the representation depends
+    on, such as ids, counts or query options. `single` marks one resource.
+    """
+    timestamps = [timestamp for timestamp in timestamps if timestamp is not None]
+    digest = hashlib.blake2b(repr((timestamps, parts)).encode('utf-8'), digest_size=16)
+    return Version(max(timestamps, default=None), digest.hexdigest(), single)
@@ -0,0 +1,21 @@
+class BulkResult:
+    """
+    Outcome of a bulk operation. Items are identified by their index in the request,
+    so a client can match every success and every error back to what it sent.
+    """
+
+    def __init__(self):
+        self.items = []
+        self.errors = []
+
+    def succeed(self, index, obj_id):
+        self.items.append({'index': index, 'id': obj_id})
+
+    def fail(self, index, error):
+        self.errors.append({'index': index, 'error': str(error)})
+
+    def to_dict(self):
+        return {
+            'items': sorted(self.items, key=lambda item: item['index']),
+            'errors': sorted(self.errors, key=lambda error: error['index'])
+        }
@@ -1,18 +1,41 @@
 # app/services/facade.py
+import uuid
+from contextlib import nullcontext
+from flask import current_app
 from app.persistence.user_repository import UserRepository
+from app.persistence.place_repository import PlaceRepository
+from app.persistence.review_repository import ReviewRepository
 from app.persistence.repository import SQLAlchemyRepository
+from app.persistence.hooks import get_repository_hooks, apply_repository_hooks
+from app.persistence.unit_of_work import unit_of_work
 from app.models.user import User
 from app.models.place import Place
 from app.models.review import Review
 from app.models.amenity import Amenity
-from app import db
+from app.services.bulk import BulkResult
+from app.utils.password_hasher import get_password_hasher
 
 class HBnBFacade:
-    def __init__(self):
-        self.user_repository = UserRepository()
-        self.place_repository = SQLAlchemyRepository(Place)
-        self.review_repository = SQLAlchemyRepository(Review)
-        self.amenity_repository = SQLAlchemyRepository(Amenity)
+    """
+    Entry point of the business logic. One instance is built per app by init_facade()
+    and shared by every request: repositories hold no per-request state, and all of
+    them go through db.session, which Flask-SQLAlchemy scopes to the app context.
+    """
+
+    def __init__(self, hooks=None):
+        # Each repository goes through the app's hooks (read-through cache, metrics...).
+        hooks = get_repository_hooks() if hooks is None else hooks
+        self.user_repository = apply_repository_hooks(UserRepository(), hooks)
+        self.place_repository = apply_repository_hooks(PlaceRepository(), hooks)
+        self.review_repository = apply_repository_hooks(ReviewRepository(), hooks)
+        self.amenity_repository = apply_repository_hooks(SQLAlchemyRepository(Amenity), hooks)
+    
+    def transaction(self):
+        """
+        Unit of work: facade calls made inside `with facade.transaction():` share one
+        commit, and everything is rolled back if the block raises.
+        """
+        return unit_of_work()
     
     # --- User Methods ---
     def create_user(self, user_data):
@@ -29,12 +52,29 @@ class HBnBFacade:
     def get_all_users(self):
         return self.user_repository.get_all()
 
-    def update_user(self, user_id, data):
-        user = self.user_repository.get(user_id)
-        if not user:
-            raise ValueError("User not found.")
-        updated_user = self.user_repository.update(user_id, data)
-        return updated_user
+    def get_users_page(self, limit, cursor=None):
+        return self.user_repository.get_page(limit, cursor)
+
+    def get_users_by_ids(self, user_ids):
+        """Return the users with the given ids, in the order asked, skipping unknown ids."""
+        found = self.user_repository.get_many(user_ids)
+        return [found[user_id] for user_id in dict.fromkeys(user_ids) if user_id in found]
+
+    def get_users_by_ids_version(self, user_ids):
+        return self.user_repository.get_many_version(user_ids)
+
+    def get_user_version(self, user_id):
+        return self.user_repository.get_version(user_id)
+
+    def get_users_page_version(self, limit, cursor=None):
+        return self.user_repository.get_page_version(limit, cursor)
+
+    def update_user(self, user_id, data, unmodified_since=None):
+        """Update a user with one UPDATE statement and return it, or None when it does not exist."""
+        if 'password' in data:
+            # The UPDATE writes values as given; hash like User.hash_password() would.
+            data = dict(data, password=get_password_hasher().hash(data['password']))
+        return self.user_repository.update(user_id, data, unmodified_since=unmodified_since)
 
     def reset_user_password(self, email, new_password):
         return self.user_repository.reset_password(email, new_password)
@@ -60,22 +100,63 @@ class HBnBFacade:
         self.place_repository.add(place)
         return place.to_dict()
 
-    def get_place(self, place_id):
-        place = self.place_repository.get(place_id)
+    def get_place(self, place_id, fields=None, embed=None):
+        place = self.place_repository.get_with_relations(place_id, fields, embed)
         if not place:
             return None
-        return place.to_dict()
+        return place.to_dict(fields, embed)
 
-    def get_all_places(self):
-        places = self.place_repository.get_all()
-        return [self.get_place(place.id) for place in places]
+    def get_place_version(self, place_id, embed=None):
+        return self.place_repository.get_version_with_relations(place_id, embed)
 
-    def update_place(self, place_id, data):
-        place = self.place_repository.get(place_id)
-        if not place:
-            raise ValueError("Place not found.")
-        updated_place = self.place_repository.update(place_id, data)
-        return self.get_place(place_id)
+    def get_places_page_version(self, limit, cursor=None, embed=None, filters=None, sort='created_at'):
+        return self.place_repository.get_page_version_with_relations(
+            limit, cursor, embed, filters, Place.SORT_ORDERS[sort])
+
+    def get_all_places(self, fields=None, embed=None, filters=None):
+        # Relations are eager-loaded in bulk, so serializing never triggers per-row queries.
+        places = self.place_repository.get_all_with_relations(fields, embed, filters)
+        return [place.to_dict(fields, embed) for place in places]
+
+    def get_places_page(self, limit, cursor=None, fields=None, embed=None, filters=None, sort='created_at'):
+        places, next_cursor = self.place_repository.get_page_with_relations(
+            limit, cursor, fields, embed, filters, Place.SORT_ORDERS[sort])
+        return [place.to_dict(fields, embed) for place in places], next_cursor
+
+    def search_places(self, query, limit, cursor=None, fields=None, embed=None):
+        results, next_cursor = self.place_repository.search(query, limit, cursor, fields, embed)
+        return [dict(place.to_dict(fields, embed), score=round(score, 4)) for place, score in results], next_cursor
+
+    def stream_places(self, fields=None, embed=None, filters=None, sort='created_at'):
+        """Serialize every matching place lazily, one batch of rows at a time."""
+        places = self.place_repository.stream_with_relations(fields, embed, filters, Place.SORT_ORDERS[sort])
+        return (place.to_dict(fields, embed) for place in places)
+
+    def rebuild_rating_aggregates(self):
+        return self.place_repository.rebuild_rating_aggregates()
+
+    def get_places_nearby(self, latitude, longitude, radius_km, limit, fields=None, embed=None):
+        results = self.place_repository.find_nearby(latitude, longitude, radius_km, limit, fields, embed)
+        return [dict(place.to_dict(fields, embed), distance_km=round(distance, 3)) for place, distance in results]
+
+    def update_place(self, place_id, data, owner_id=None, unmodified_since=None):
+        """
+        Update a place with one UPDATE statement and return its columns serialized, or
+        None when it does not exist. With `owner_id`, a place owned by anyone else is
+        refused; `unmodified_since` refuses it when changed after that time. Both raise
+        UpdateConflict (see SQLAlchemyRepository.update). Keys outside
+        PLACE_UPDATABLE_FIELDS (owner, rating aggregates...) are ignored.
+        """
+        data = {key: value for key, value in data.items() if key in self.PLACE_UPDATABLE_FIELDS}
+        if 'amenities' in data:
+            amenities = self.amenity_repository.get_many(data['amenities'])
+            missing = [amenity_id for amenity_id in data['amenities'] if amenity_id not in amenities]
+            if missing:
+                raise ValueError(f"Amenity not found: {', '.join(missing)}")
+            data = dict(data, amenities=[amenities[amenity_id] for amenity_id in dict.fromkeys(data['amenities'])])
+        expected = None if owner_id is None else {'owner_id': owner_id}
+        place = self.place_repository.update(place_id, data, expected, unmodified_since)
+        return None if place is None else place.to_dict(embed=())
 
     def delete_place(self, place_id):
         if not self.place_repository.delete(place_id):
@@ -98,7 +179,10 @@ class HBnBFacade:
             user=user,
             place=place
         )
-        self.review_repository.add(review)
+        # Added before the aggregate UPDATE autoflushes the user's and place's reviews backrefs.
+        with self.transaction():
+            self.review_repository.add(review)
+            self.place_repository.apply_rating_change(place.id, added=review.rating)
         return review
 
     def get_review(self, review_id):
@@ -107,22 +191,72 @@ class HBnBFacade:
     def get_all_reviews(self):
         return self.review_repository.get_all()
 
-    def update_review(self, review_id, data):
-        review = self.review_repository.get(review_id)
-        if not review:
-            raise ValueError("Review not found.")
-        updated_review = self.review_repository.update(review_id, data)
-        return self.get_review(review_id)
+    def get_reviews_page(self, limit, cursor=None):
+        return self.review_repository.get_page(limit, cursor)
+
+    def get_review_version(self, review_id):
+        return self.review_repository.get_version(review_id)
+
+    def get_reviews_page_version(self, limit, cursor=None):
+        return self.review_repository.get_page_version(limit, cursor)
+
+    def update_review(self, review_id, data, user_id=None, unmodified_since=None):
+        """
+        Update a review with one UPDATE statement and return it, or None when it does
+        not exist. `user_id` and `unmodified_since` work as in update_place(). A new
+        rating first reads the one it replaces, for the place's aggregates, and only
+        overwrites that same rating, so a concurrent change cannot skew them. Keys
+        outside REVIEW_UPDATABLE_FIELDS are ignored.
+        """
+        data = {key: value for key, value in data.items() if key in self.REVIEW_UPDATABLE_FIELDS}
+        if 'rating' in data and (not isinstance(data['rating'], int) or not 1 <= data['rating'] <= 5):
+            raise ValueError("Rating must be an integer between 1 and 5.")
+        if 'text' in data and (not isinstance(data['text'], str) or not data['text'].strip()):
+            raise ValueError("Review text is required and must be a string.")
+        expected = {} if user_id is None else {'user_id': user_id}
+        rating_changes = []
+        if 'rating' in data:
+            review = self.review_repository.get(review_id)
+            if not review:
+                return None
+            if data['rating'] != review.rating:
+                expected['rating'] = review.rating
+                rating_changes.append((review.place_id, data['rating'], review.rating))
+        # Without aggregates to move, the UPDATE commits on its own and its row stays loaded.
+        with self.transaction() if rating_changes else nullcontext():
+            self.place_repository.apply_rating_changes(rating_changes)
+            review = self.review_repository.update(review_id, data, expected, unmodified_since)
+        if review is not None:
+            # Review text is indexed with its place (see app/persistence/place_sync.py).
+            self.place_repository.notify_write(review.place_id)
+        return review
 
     def delete_review(self, review_id):
-        if not self.review_repository.delete(review_id):
-            raise ValueError("Failed to delete review.")
+        # The rating removed from the aggregates is the one the DELETE itself returns.
+        with self.transaction():
+            deleted = self.review_repository.delete_rated([review_id])
+            if not deleted:
+                raise ValueError("Failed to delete review.")
+            place_id, rating = deleted[0]
+            self.place_repository.apply_rating_change(place_id, removed=rating)
         return True
     def get_reviews_by_place(self, place_id):
-        # Option 1: Query directly using SQLAlchemy
-        return self.review_repository.model.query.filter(
-            self.review_repository.model.place_id == place_id
-        ).all()
+        # Ordered like the default page of get_place_reviews_page, off the same index.
+        return Review.query.filter(Review.place_id == place_id).order_by(Review.created_at, Review.id).all()
+
+    def get_place_reviews_page(self, place_id, limit, cursor=None, sort='created_at'):
+        reviews, next_cursor = self.review_repository.get_page_for_place(
+            place_id, limit, cursor, Review.SORT_ORDERS[sort])
+        return [review.to_dict(user_name=True) for review in reviews], next_cursor
+
+    def get_place_reviews_page_version(self, place_id, limit, cursor=None, sort='created_at'):
+        """Version of a page of a place's reviews, or None when the place does not exist."""
+        if not self.place_repository.existing_ids((place_id,)):
+            return None
+        return self.review_repository.get_page_version_for_place(place_id, limit, cursor, Review.SORT_ORDERS[sort])
+
+    def has_reviewed(self, user_id, place_id):
+        return self.review_repository.has_reviewed(user_id, place_id)
 
     # --- Amenity Methods ---
     def create_amenity(self, amenity_data):
@@ -139,23 +273,330 @@ class HBnBFacade:
         
         # Create the Amenity instance using the provided name.
         amenity = Amenity(amenity_data['name'])
-        self.amenity_repository.add(amenity)
-        
-        # Associate the new amenity with the Place.
-        # (This is similar to how reviews are created and linked to a Place.)
-        place.amenities.append(amenity)
-        db.session.commit()  # Commit the association
+        # The amenity and its association with the Place are committed together.
+        with self.transaction():
+            self.amenity_repository.add(amenity)
+            place.amenities.append(amenity)
         
         return amenity
 
     def update_amenity(self, amenity_id, data):
-        amenity = self.amenity_repository.get(amenity_id)
-        if not amenity:
-            return None
-        self.amenity_repository.update(amenity_id, data)
-        return self.amenity_repository.get(amenity_id)
+        return self.amenity_repository.update(amenity_id, data)
 
     def delete_amenity(self, amenity_id):
         if not self.amenity_repository.delete(amenity_id):
             raise ValueError("Failed to delete amenity.")
         return True
+
+    # --- Bulk Methods ---
+    # Each item is checked on its own in a first pass that does no I/O; everything the
+    # batch references is then resolved with one IN query per table, and the valid
+    # items are written in a single transaction. Failures are reported per item
+    # (by index) in the returned BulkResult instead of aborting the batch.
+
+    PLACE_UPDATABLE_FIELDS = ('title', 'description', 'price', 'latitude', 'longitude', 'amenities')
+    REVIEW_UPDATABLE_FIELDS = ('text', 'rating')
+
+    def bulk_create_places(self, items, owner_id=None):
+        """Create places in bulk. `owner_id`, when given, overrides each item's owner."""
+        result = BulkResult()
+        pending = []
+        for index, item in enumerate(items):
+            try:
+                item = self._bulk_item(item)
+                data = dict(item, owner_id=owner_id or item.get('owner_id'))
+                Place.validate(data.get('title'), data.get('description'), data.get('price'),
+                               data.get('latitude'), data.get('longitude'))
+                if not data['owner_id']:
+                    raise ValueError("Owner must be provided.")
+                data['amenities'] = self._bulk_id_list(data.get('amenities'), "Amenities")
+            except ValueError as e:
+                result.fail(index, e)
+                continue
+            pending.append((index, data))
+        owners = self.user_repository.existing_ids(data['owner_id'] for _, data in pending)
+        amenities = self.amenity_repository.existing_ids(
+            amenity_id for _, data in pending for amenity_id in data['amenities'])
+        rows, links, indexes = [], [], []
+        for index, data in pending:
+            missing = [amenity_id for amenity_id in data['amenities'] if amenity_id not in amenities]
+            if data['owner_id'] not in owners:
+                result.fail(index, "Owner not found.")
+            elif missing:
+                result.fail(index, f"Amenity not found: {', '.join(missing)}")
+            else:
+                place_id = str(uuid.uuid4())
+                rows.append({
+                    'id': place_id,
+                    'title': data['title'].strip(),
+                    'description': data['description'].strip(),
+                    'price': float(data['price']),
+                    'latitude': data['latitude'],
+                    'longitude': data['longitude'],
+                    'owner_id': data['owner_id']
+                })
+                links.extend((place_id, amenity_id) for amenity_id in data['amenities'])
+                indexes.append(index)
+        if rows:
+            for index, place_id in zip(indexes, self.place_repository.bulk_insert(rows, links)):
+                result.succeed(index, place_id)
+        return result
+
+    def bulk_update_places(self, items, owner_id=None):
+        """Update places in bulk. With `owner_id`, places owned by anyone else are refused."""
+        result = BulkResult()
+        pending = self._bulk_updates(items, self.PLACE_UPDATABLE_FIELDS, result)
+        for place_id, (index, data) in list(pending.items()):
+            if 'amenities' in data:
+                try:
+                    data['amenities'] = self._bulk_id_list(data['amenities'], "Amenities")
+                except ValueError as e:
+                    result.fail(index, e)
+                    del pending[place_id]
+        places = self.place_repository.get_many(pending)
+        amenities = self.amenity_repository.get_many(
+            amenity_id for _, data in pending.values() for amenity_id in data.get('amenities', ()))
+        changes = {}
+        for place_id, (index, data) in pending.items():
+            place = places.get(place_id)
+            missing = [amenity_id for amenity_id in data.get('amenities', ()) if amenity_id not in amenities]
+            try:
+                if place is None:
+                    raise ValueError("Place not found.")
+                if owner_id is not None and place.owner_id != owner_id:
+                    raise ValueError("Unauthorized action.")
+                if missing:
+                    raise ValueError(f"Amenity not found: {', '.join(missing)}")
+                Place.validate(*(data.get(field, getattr(place, field))
+                                 for field in ('title', 'description', 'price', 'latitude', 'longitude')))
+            except ValueError as e:
+                result.fail(index, e)
+                continue
+            if 'amenities' in data:
+                data['amenities'] = [amenities[amenity_id] for amenity_id in data['amenities']]
+            changes[place_id] = data
+            result.succeed(index, place_id)
+        if changes:
+            self.place_repository.bulk_update(changes, places)
+        return result
+
+    def bulk_delete_places(self, ids, owner_id=None):
+        """Delete places in bulk. Places that still have reviews are refused."""
+        result = BulkResult()
+        pending = self._bulk_ids(ids, result)
+        places = self.place_repository.get_many(pending)
+        deleted = []
+        for place_id, index in pending.items():
+            place = places.get(place_id)
+            if place is None:
+                result.fail(index, "Place not found.")
+            elif owner_id is not None and place.owner_id != owner_id:
+                result.fail(index, "Unauthorized action.")
+            elif place.review_count:
+                result.fail(index, "Place has reviews; delete them first.")
+            else:
+                deleted.append(place_id)
+                result.succeed(index, place_id)
+        if deleted:
+            self.place_repository.bulk_delete(deleted)
+        return result
+
+    def bulk_create_reviews(self, items, user_id=None):
+        """Create reviews in bulk. `user_id`, when given, overrides each item's author."""
+        result = BulkResult()
+        pending = []
+        for index, item in enumerate(items):
+            try:
+                item = self._bulk_item(item)
+                data = dict(item, user_id=user_id or item.get('user_id'))
+                Review.validate(data.get('text'), data.get('rating'))
+                if not data['user_id'] or not data.get('place_id'):
+                    raise ValueError("User or Place not found.")
+            except ValueError as e:
+                result.fail(index, e)
+                continue
+            pending.append((index, data))
+        users = self.user_repository.existing_ids(data['user_id'] for _, data in pending)
+        places = self.place_repository.get_many(data['place_id'] for _, data in pending)
+        reviewed = self.review_repository.reviewed_pairs(
+            (data['user_id'] for _, data in pending), (data['place_id'] for _, data in pending))
+        rows, indexes = [], []
+        for index, data in pending:
+            pair = (data['user_id'], data['place_id'])
+            place = places.get(data['place_id'])
+            if data['user_id'] not in users or place is None:
+                result.fail(index, "User or Place not found.")
+            elif place.owner_id == data['user_id']:
+                result.fail(index, "You cannot review your own place.")
+            elif pair in reviewed:
+                result.fail(index, "You have already reviewed this place.")
+            else:
+                reviewed.add(pair)
+                rows.append({
+                    'id': str(uuid.uuid4()),
+                    'text': data['text'].strip(),
+                    'rating': data['rating'],
+                    'user_id': data['user_id'],
+                    'place_id': data['place_id']
+                })
+                indexes.append(index)
+        if rows:
+            with self.transaction():
+                self.place_repository.apply_rating_changes([(row['place_id'], row['rating'], None) for row in rows])
+                review_ids = self.review_repository.bulk_insert(rows)
+            for index, review_id in zip(indexes, review_ids):
+                result.succeed(index, review_id)
+        return result
+
+    def bulk_update_reviews(self, items, user_id=None):
+        """Update reviews in bulk. With `user_id`, reviews written by anyone else are refused."""
+        result = BulkResult()
+        pending = self._bulk_updates(items, self.REVIEW_UPDATABLE_FIELDS, result)
+        reviews = self.review_repository.get_many(pending)
+        changes, rating_changes = {}, []
+        for review_id, (index, data) in pending.items():
+            review = reviews.get(review_id)
+            try:
+                if review is None:
+                    raise ValueError("Review not found.")
+                if user_id is not None and review.user_id != user_id:
+                    raise ValueError("Unauthorized action.")
+                Review.validate(data.get('text', review.text), data.get('rating', review.rating))
+            except ValueError as e:
+                result.fail(index, e)
+                continue
+            if data.get('rating', review.rating) != review.rating:
+                rating_changes.append((review.place_id, data['rating'], review.rating))
+            changes[review_id] = data
+            result.succeed(index, review_id)
+        if changes:
+            with self.transaction():
+                self.place_repository.apply_rating_changes(rating_changes)
+                self.review_repository.bulk_update(changes, reviews)
+        return result
+
+    def bulk_delete_reviews(self, ids, user_id=None):
+        """Delete reviews in bulk. With `user_id`, reviews written by anyone else are refused."""
+        result = BulkResult()
+        pending = self._bulk_ids(ids, result)
+        reviews = self.review_repository.get_many(pending)
+        deleted = []
+        for review_id, index in pending.items():
+            review = reviews.get(review_id)
+            if review is None:
+                result.fail(index, "Review not found.")
+            elif user_id is not None and review.user_id != user_id:
+                result.fail(index, "Unauthorized action.")
+            else:
+                deleted.append(review)
+                result.succeed(index, review_id)
+        if deleted:
+            with self.transaction():
+                rated = self.review_repository.delete_rated([review.id for review in deleted])
+                self.place_repository.apply_rating_changes([(place_id, None, rating) for place_id, rating in rated])
+        return result
+
+    def bulk_create_amenities(self, items):
+        result = BulkResult()
+        rows, indexes = [], []
+        for index, item in enumerate(items):
+            try:
+                item = self._bulk_item(item)
+                Amenity.validate(item.get('name'))
+            except ValueError as e:
+                result.fail(index, e)
+                continue
+            rows.append({'name': item['name'].strip()})
+            indexes.append(index)
+        if rows:
+            for index, amenity_id in zip(indexes, self.amenity_repository.bulk_insert(rows)):
+                result.succeed(index, amenity_id)
+        return result
+
+    def bulk_update_amenities(self, items):
+        result = BulkResult()
+        pending = self._bulk_updates(items, ('name',), result)
+        amenities = self.amenity_repository.get_many(pending)
+        changes = {}
+        for amenity_id, (index, data) in pending.items():
+            try:
+                if amenity_id not in amenities:
+                    raise ValueError("Amenity not found.")
+                Amenity.validate(data.get('name', amenities[amenity_id].name))
+            except ValueError as e:
+                result.fail(index, e)
+                continue
+            changes[amenity_id] = data
+            result.succeed(index, amenity_id)
+        if changes:
+            self.amenity_repository.bulk_update(changes, amenities)
+        return result
+
+    def bulk_delete_amenities(self, ids):
+        result = BulkResult()
+        pending = self._bulk_ids(ids, result)
+        existing = self.amenity_repository.existing_ids(pending)
+        for amenity_id, index in pending.items():
+            if amenity_id in existing:
+                result.succeed(index, amenity_id)
+            else:
+                result.fail(index, "Amenity not found.")
+        if existing:
+            self.amenity_repository.bulk_delete(existing)
+        return result
+
+    @staticmethod
+    def _bulk_item(item):
+        if not isinstance(item, dict):
+            raise ValueError("Item must be an object.")
+        return item
+
+    @staticmethod
+    def _bulk_id_list(ids, label):
+        ids = [] if ids is None else ids
+        if not isinstance(ids, list) or not all(isinstance(obj_id, str) for obj_id in ids):
+            raise ValueError(f"{label} must be a list of IDs.")
+        return list(dict.fromkeys(ids))
+
+    def _bulk_ids(self, ids, result):
+        """Map each id to its index, failing non-strings and repeats. Returns {id: index}."""
+        pending = {}
+        for index, obj_id in enumerate(ids):
+            if not isinstance(obj_id, str):
+                result.fail(index, "ID must be a string.")
+            elif obj_id in pending:
+                result.fail(index, "Duplicate ID in batch.")
+            else:
+                pending[obj_id] = index
+        return pending
+
+    def _bulk_updates(self, items, allowed, result):
+        """Check the shape of update items ({'id', ...fields}). Returns {id: (index, data)}."""
+        pending = {}
+        for index, item in enumerate(items):
+            try:
+                item = self._bulk_item(item)
+                obj_id = item.get('id')
+                data = {key: value for key, value in item.items() if key != 'id'}
+                unknown = sorted(set(data) - set(allowed))
+                if not isinstance(obj_id, str):
+                    raise ValueError("ID must be a string.")
+                if obj_id in pending:
+                    raise ValueError("Duplicate ID in batch.")
+                if unknown:
+                    raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+            except ValueError as e:
+                result.fail(index, e)
+                continue
+            pending[obj_id] = (index, data)
+        return pending
+
+def init_facade(app):
+    """Build the app's facade once, after every repository hook has been registered."""
+    with app.app_context():
+        app.extensions['facade'] = HBnBFacade()
+    return app.extensions['facade']
+
+def get_facade():
+    """Return the current app's shared facade."""
+    return current_app.extensions['facade']
@@ -0,0 +1,77 @@
+"""
+Response compression negotiated from Accept-Encoding.
+
+Buffered responses are compressed by an after_request hook once they reach
+COMPRESSION_MIN_SIZE bytes; streamed responses (see app/api/v1/streaming.py)
+are compressed chunk by chunk with compress_stream(). gzip is always available;
+brotli ('br') is offered when the optional 'brotli' package is installed.
+
+A compressed body gets its own strong ETag, the identity one suffixed with the
+coding ("<tag>-gzip"), as different bytes must not share a strong validator.
+"""
+import zlib
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = ('application/json', 'text/html', 'text/plain', 'text/css', 'application/javascript')
+
+def available_codings():
+    """Content codings this process can produce, preferred first."""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+def negotiate_coding():
+    """The coding to use for the current request, or None for identity."""
+    if not current_app.config.get('COMPRESSION_ENABLED', True):
+        return None
+    return request.accept_encodings.best_match(available_codings())
+
+def encoded_etags(tag):
+    """Every ETag a representation tagged `tag` may have been sent with."""
+    return (tag, *(f'{tag}-{coding}' for coding in available_codings()))
+
+def compressor(coding, level=None):
+    """Return (compress, flush) callables for `coding`."""
+    level = current_app.config.get('COMPRESSION_LEVEL', 6) if level is None else level
+    if coding == 'br':
+        # Brotli quality runs 0-11; zlib levels 1-9 map onto the fast half of it.
+        stream = brotli.Compressor(quality=min(level, 11))
+        return stream.process, stream.finish
+    stream = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 16 + 15: gzip container
+    return stream.compress, stream.flush
+
+def compress_stream(chunks, coding):
+    """Compress an iterable of byte chunks, yielding compressed output as it becomes available."""
+    compress, flush = compressor(coding)
+    for chunk in chunks:
+        data = compress(chunk)
+        if data:
+            yield data
+    yield flush()
+
+def _compress_response(response):
+    if (response.direct_passthrough or response.is_streamed or response.status_code < 200
+            or response.status_code in (204, 206, 304) or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+    if response.content_length is not None and response.content_length < current_app.config.get(
+            'COMPRESSION_MIN_SIZE', 1024):
+        return response
+    response.vary.add('Accept-Encoding')
+    coding = negotiate_coding()
+    if coding is None:
+        return response
+    compress, flush = compressor(coding)
+    response.set_data(compress(response.get_data()) + flush())
+    response.headers['Content-Encoding'] = coding
+    tag, weak = response.get_etag()
+    if tag:
+        response.set_etag(f'{tag}-{coding}', weak)
+    return response
+
+def init_compression(app):
+    """Compress the app's buffered responses according to the COMPRESSION_* settings."""
+    app.after_request(_compress_response)
@@ -1,6 +1,6 @@
 from functools import wraps
-from flask import jsonify
 from flask_jwt_extended import verify_jwt_in_request, get_jwt
+from app.utils.password_hasher import PasswordHasherBusy
 
 def admin_required(fn):
     @wraps(fn)
@@ -8,6 +8,17 @@ def admin_required(fn):
         verify_jwt_in_request()  # Ensure a valid JWT is provided
         claims = get_jwt()       # Retrieve all JWT claims
         if not claims.get('is_admin'):
-            return jsonify({'error': 'Admin privileges required'}), 403
+            # Resources return plain dicts; flask-restx cannot serialize a jsonify() Response.
+            return {'error': 'Admin privileges required'}, 403
         return fn(*args, **kwargs)
     return wrapper
+
+def sheds_load(fn):
+    """Answer 503 with Retry-After when the bcrypt pool is saturated, instead of queueing."""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        try:
+            return fn(*args, **kwargs)
+        except PasswordHasherBusy:
+            return {'error': 'Server busy, please retry shortly.'}, 503, {'Retry-After': '1'}
+    return wrapper
@@ -0,0 +1,102 @@
+import math
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+GEOHASH_PRECISION = 12
+_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+# Sorts after every geohash character, so [prefix, prefix + _PREFIX_END) is a prefix range.
+_PREFIX_END = '{'
+
+def geohash_encode(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Encode a coordinate as a geohash string of `precision` characters."""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, bit_count, even = [], 0, 0, True
+    while len(chars) < precision:
+        if even:
+            mid = (lon_range[0] + lon_range[1]) / 2
+            if longitude >= mid:
+                bits = bits * 2 + 1
+                lon_range[0] = mid
+            else:
+                bits = bits * 2
+                lon_range[1] = mid
+        else:
+            mid = (lat_range[0] + lat_range[1]) / 2
+            if latitude >= mid:
+                bits = bits * 2 + 1
+                lat_range[0] = mid
+            else:
+                bits = bits * 2
+                lat_range[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits, bit_count = 0, 0
+    return ''.join(chars)
+
+def geohash_cell_size(precision):
+    """Return the (height, width) in degrees of a geohash cell at `precision`."""
+    total_bits = 5 * precision
+    lon_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lon_bits)
+
+def geohash_prefix_ranges(min_lat, min_lon, max_lat, max_lon, max_cells=32):
+    """
+    Cover a bounding box with geohash cells and return them as sorted
+    (start, end) string ranges suitable for an indexed BETWEEN-style scan.
+    The finest precision needing at most `max_cells` cells is used. A box whose
+    min_lon is greater than max_lon is treated as crossing the antimeridian.
+    """
+    if min_lon > max_lon:
+        return sorted(set(
+            geohash_prefix_ranges(min_lat, min_lon, max_lat, 180.0, max_cells // 2) +
+            geohash_prefix_ranges(min_lat, -180.0, max_lat, max_lon, max_cells // 2)
+        ))
+    min_lat, max_lat = max(min_lat, -90.0), min(max_lat, 90.0)
+    precision = 1
+    for candidate in range(1, GEOHASH_PRECISION + 1):
+        height, width = geohash_cell_size(candidate)
+        rows = math.floor(max_lat / height) - math.floor(min_lat / height) + 1
+        cols = math.floor(max_lon / width) - math.floor(min_lon / width) + 1
+        if rows * cols > max_cells:
+            break
+        precision = candidate
+    height, width = geohash_cell_size(precision)
+    prefixes = set()
+    lat = math.floor(min_lat / height) * height
+    while lat <= max_lat and lat < 90.0:
+        lon = math.floor(min_lon / width) * width
+        while lon <= max_lon and lon < 180.0:
+            prefixes.add(geohash_encode(lat + height / 2, lon + width / 2, precision))
+            lon += width
+        lat += height
+    return [(prefix, prefix + _PREFIX_END) for prefix in sorted(prefixes)]
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    Return (min_lat, min_lon, max_lat, max_lon) enclosing a circle of `radius_km`.
+    Longitudes are normalized to [-180, 180]; min_lon > max_lon means the box
+    crosses the antimeridian. Near the poles the box spans every longitude.
+    """
+    delta_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = latitude - delta_lat, latitude + delta_lat
+    if min_lat <= -90.0 or max_lat >= 90.0:
+        return max(min_lat, -90.0), -180.0, min(max_lat, 90.0), 180.0
+    delta_lon = math.degrees(math.asin(min(1.0, math.sin(radius_km / EARTH_RADIUS_KM) /
+                                           math.cos(math.radians(latitude)))))
+    if delta_lon >= 180.0:
+        return min_lat, -180.0, max_lat, 180.0
+    min_lon = (longitude - delta_lon + 180.0) % 360.0 - 180.0
+    max_lon = (longitude + delta_lon + 180.0) % 360.0 - 180.0
+    return min_lat, min_lon, max_lat, max_lon
+
+def haversine_km(latitude, longitude, latitudes, longitudes):
+    """Vectorized great-circle distance in km from one point to arrays of points."""
+    lat1 = np.radians(latitude)
+    lat2 = np.radians(np.asarray(latitudes, dtype=np.float64))
+    delta_lat = lat2 - lat1
+    delta_lon = np.radians(np.asarray(longitudes, dtype=np.float64) - longitude)
+    a = np.sin(delta_lat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(delta_lon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
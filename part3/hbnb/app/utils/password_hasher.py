@@ -0,0 +1,87 @@
+import atexit
+import hmac
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+import bcrypt
+from flask import current_app
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing queue is full; the API answers 503."""
+
+def _hash_password(password, rounds):
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=rounds)).decode('utf-8')
+
+def _check_password(password_hash, password):
+    password_hash = password_hash.encode('utf-8')
+    return hmac.compare_digest(bcrypt.hashpw(password.encode('utf-8'), password_hash), password_hash)
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a bounded process pool so a burst of logins cannot pin every
+    request thread. At most `max_pending` operations may be queued or running;
+    beyond that, and when a result takes longer than `timeout` seconds,
+    PasswordHasherBusy is raised instead of queueing more work.
+    With workers=0 hashing runs inline on the calling thread.
+    """
+
+    def __init__(self, rounds=12, workers=0, max_pending=32, timeout=10.0):
+        self.rounds = rounds
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def hash(self, password):
+        if not password:
+            raise ValueError('Password must be non-empty.')
+        return self._run(_hash_password, password, self.rounds)
+
+    def verify(self, password_hash, password):
+        return self._run(_check_password, password_hash, password)
+
+    def _run(self, fn, *args):
+        if not self.workers:
+            return fn(*args)
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusy("Password hashing queue is full.")
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise PasswordHasherBusy("Password hashing timed out.")
+
+    def _get_executor(self):
+        # Created on first use; 'spawn' avoids forking a process that already runs threads.
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+                atexit.register(self.shutdown)
+            return self._executor
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+def init_password_hasher(app):
+    """Create the app's PasswordHasher from the BCRYPT_LOG_ROUNDS / PASSWORD_HASHER_* settings."""
+    app.extensions['password_hasher'] = PasswordHasher(
+        rounds=app.config.get('BCRYPT_LOG_ROUNDS', 12),
+        workers=app.config.get('PASSWORD_HASHER_WORKERS', 0),
+        max_pending=app.config.get('PASSWORD_HASHER_MAX_PENDING', 32),
+        timeout=app.config.get('PASSWORD_HASHER_TIMEOUT', 10.0)
+    )
+    return app.extensions['password_hasher']
+
+def get_password_hasher():
+    return current_app.extensions['password_hasher']
@@ -0,0 +1,60 @@
+from sqlalchemy import event
+from app import db
+
+class QueryCounter:
+    """
+    Context manager counting the SQL statements sent to the engine while it is active.
+
+    Usage:
+        with QueryCounter() as counter:
+            facade.get_all_places()
+        print(counter.count)
+    """
+
+    def __init__(self, engine=None):
+        self.engine = engine
+        self.statements = []
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        if self.engine is None:
+            self.engine = db.engine
+        event.listen(self.engine, 'before_cursor_execute', self._before_cursor_execute)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        event.remove(self.engine, 'before_cursor_execute', self._before_cursor_execute)
+        return False
+
+class CommitCounter:
+    """
+    Context manager counting the transactions committed on the engine while it is active.
+
+    Usage:
+        with CommitCounter() as counter:
+            facade.create_amenity(data)
+        print(counter.count)
+    """
+
+    def __init__(self, engine=None):
+        self.engine = engine
+        self.count = 0
+
+    def _commit(self, conn):
+        self.count += 1
+
+    def __enter__(self):
+        if self.engine is None:
+            self.engine = db.engine
+        event.listen(self.engine, 'commit', self._commit)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        event.remove(self.engine, 'commit', self._commit)
+        return False
@@ -0,0 +1,56 @@
+"""
+Benchmark importing places one request at a time against the bulk facade method.
+
+The per-item path is what importers did through POST /api/v1/places/: an owner
+lookup, one lookup per amenity and a commit for every place. The bulk path
+validates the batch, resolves owners and amenities with one IN query each and
+inserts in chunks inside a single transaction.
+
+Usage:
+    python -m benchmarks.bench_bulk_import [places]
+"""
+import sys
+from app import db
+from app.models.place import Place, place_amenity
+from app.services.facade import HBnBFacade
+from app.utils.query_counter import QueryCounter
+from benchmarks.common import make_app, seed_users, seed_amenities, timed
+
+def run(places=5000):
+    app, ctx = make_app()
+    facade = HBnBFacade()
+    owners = seed_users(100)
+    amenities = seed_amenities(10)
+    items = [{
+        'title': f'Imported {i}',
+        'description': f'Imported place {i}',
+        'price': 10 + i % 490,
+        'latitude': (i % 180) - 89.5,
+        'longitude': (i % 360) - 179.5,
+        'owner_id': owners[i % len(owners)],
+        'amenities': [amenities[i % len(amenities)], amenities[(i + 1) % len(amenities)]]
+    } for i in range(places)]
+
+    def one_by_one():
+        for item in items:
+            facade.create_place(dict(item))
+
+    def bulk():
+        result = facade.bulk_create_places(items)
+        assert not result.errors, result.errors[:3]
+
+    print(f"{places} places")
+    print(f"{'case':<12} {'statements':>10} {'seconds':>8} {'places/s':>10}")
+    for name, fn in (('one by one', one_by_one), ('bulk', bulk)):
+        db.session.execute(place_amenity.delete())
+        db.session.execute(Place.__table__.delete())
+        db.session.commit()
+        db.session.expunge_all()
+        with QueryCounter() as counter:
+            elapsed, _ = timed(fn, repeat=1)
+        assert Place.query.count() == places
+        print(f"{name:<12} {counter.count:>10} {elapsed:>8.3f} {places / elapsed:>10.0f}")
+    ctx.pop()
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
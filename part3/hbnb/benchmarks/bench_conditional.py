@@ -0,0 +1,47 @@
+"""
+Benchmark conditional GETs for the requests the part4 pages poll.
+
+Seeds `places` places (one amenity and one review each), then replays the
+listing page of index.js, the place details of place.js and a user lookup,
+first as plain GETs and then revalidated with the ETag of the first
+response, as a browser cache does for `Cache-Control: no-cache` responses.
+Reports the body size and the server CPU time per request for both.
+
+Usage:
+    python -m benchmarks.bench_conditional [places] [requests]
+"""
+import sys
+import time
+from benchmarks.common import make_app, seed_users, seed_amenities, seed_places
+
+def cpu_per_request(client, url, requests, headers=None):
+    """Mean CPU seconds spent serving `url` (the test client runs the app in-process)."""
+    start = time.process_time()
+    for _ in range(requests):
+        response = client.get(url, headers=headers)
+    return (time.process_time() - start) / requests, response
+
+def run(places=20000, requests=200):
+    app, ctx = make_app()
+    owners = seed_users(100)
+    place_ids = seed_places(places, owners, seed_amenities(10), reviewer_ids=owners)
+    client = app.test_client()
+    urls = [
+        ('index.js listing', '/api/v1/places/?limit=100&fields=title,description,price,latitude,longitude&embed='),
+        ('place.js details', f'/api/v1/places/{place_ids[places // 2]}'),
+        ('user details', f'/api/v1/users/{owners[0]}'),
+    ]
+    print(f"{places} places, {requests} requests per case")
+    print(f"{'request':<18} {'200 bytes':>10} {'200 ms':>8} {'304 bytes':>10} {'304 ms':>8}")
+    for name, url in urls:
+        full_time, full = cpu_per_request(client, url, requests)
+        revalidated_time, revalidated = cpu_per_request(client, url, requests,
+                                                        headers={'If-None-Match': full.headers['ETag']})
+        assert full.status_code == 200 and revalidated.status_code == 304, name
+        print(f"{name:<18} {len(full.data):>10} {full_time * 1000:>8.2f} "
+              f"{len(revalidated.data):>10} {revalidated_time * 1000:>8.2f}")
+    ctx.pop()
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:]]
+    run(*args)
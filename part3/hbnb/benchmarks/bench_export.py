@@ -0,0 +1,62 @@
+"""
+Benchmark the streamed place export against building the whole list in memory.
+
+Grows the table to each size in `sizes` (places with an owner, an amenity and a
+review) and reads GET /api/v1/places/export to the end, gzip-encoded, tracing
+the peak Python memory allocated meanwhile. Peak memory must stay flat as the
+table grows. For sizes up to `buffered_limit`, the same rows are also
+serialized the buffered way (facade.get_all_places() + one json.dumps) for
+comparison.
+
+Usage:
+    python -m benchmarks.bench_export [max_places]
+"""
+import json
+import sys
+import time
+import tracemalloc
+from app import db
+from app.services.facade import get_facade
+from benchmarks.common import make_app, seed_users, seed_amenities, seed_places
+
+def traced(fn):
+    """Run `fn` under tracemalloc; return (seconds, peak MiB, result)."""
+    db.session.expire_all()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+def run(max_places=1000000, buffered_limit=100000):
+    app, ctx = make_app()
+    owners = seed_users(1000)
+    amenities = seed_amenities(10)
+    client = app.test_client()
+
+    def stream():
+        response = client.get('/api/v1/places/export', headers={'Accept-Encoding': 'gzip'})
+        size = sum(len(chunk) for chunk in response.iter_encoded())
+        response.close()
+        return size
+
+    def buffered():
+        return len(json.dumps({'items': get_facade().get_all_places(), 'next_cursor': None}))
+
+    seeded = 0
+    print(f"{'places':>8} {'stream s':>9} {'stream MiB':>11} {'gzip MiB':>9} {'buffered s':>11} {'buffered MiB':>13}")
+    for size in (max_places // 100, max_places // 10, max_places):
+        seed_places(size - seeded, owners, amenities, reviewer_ids=owners, seed=size)
+        seeded = size
+        stream_time, stream_peak, sent = traced(stream)
+        line = f"{size:>8} {stream_time:>9.1f} {stream_peak:>11.1f} {sent / 2 ** 20:>9.1f}"
+        if size <= buffered_limit:
+            buffered_time, buffered_peak, _ = traced(buffered)
+            line += f" {buffered_time:>11.1f} {buffered_peak:>13.1f}"
+        print(line)
+    ctx.pop()
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,33 @@
+"""
+Microbenchmark of the per-request facade construction removed by init_facade().
+
+Resources used to call HBnBFacade() on every request, building four repositories
+and running each through the repository hooks (cache, metrics). They now fetch the
+app's shared instance with get_facade(). The script reports the cost of both per
+request and what it adds up to at a given request rate.
+
+Usage:
+    python -m benchmarks.bench_facade_wiring [requests_per_second]
+"""
+import sys
+import timeit
+from app.services.facade import HBnBFacade, get_facade
+from benchmarks.common import make_app
+
+def per_call(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number
+
+def run(rate=5000, number=20000):
+    app, ctx = make_app()
+    with app.test_request_context('/api/v1/places/'):
+        construct = per_call(HBnBFacade, number)
+        shared = per_call(get_facade, number)
+    print(f"{'case':<22} {'us/request':>10} {f'CPU ms/s at {rate} req/s':>24}")
+    for name, seconds in (('HBnBFacade() per call', construct), ('get_facade()', shared)):
+        print(f"{name:<22} {seconds * 1e6:>10.2f} {seconds * rate * 1000:>24.1f}")
+    print(f"saved: {(construct - shared) * rate * 1000:.1f} ms of CPU per second "
+          f"({(construct - shared) * rate * 100:.1f}% of one core)")
+    ctx.pop()
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,68 @@
+"""
+Login load benchmark: p50/p99 latency of POST /api/v1/auth/login versus concurrency.
+
+Runs the same burst with bcrypt inline on the request threads and on the bounded
+process pool, and reports how many requests were shed with 503.
+
+Usage:
+    python -m benchmarks.bench_login [requests_per_level] [rounds]
+"""
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from config import TestingConfig
+from app import db
+from app.services.facade import HBnBFacade
+from benchmarks.common import make_app
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def run_level(app, concurrency, requests):
+    credentials = {"email": "bench@example.com", "password": "secret"}
+
+    def login(_):
+        client = app.test_client()
+        start = time.perf_counter()
+        status = client.post('/api/v1/auth/login', json=credentials).status_code
+        return time.perf_counter() - start, status
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(login, range(requests)))
+    elapsed = time.perf_counter() - start
+    latencies = [latency for latency, status in results if status == 200]
+    shed = sum(1 for _, status in results if status == 503)
+    return latencies, shed, elapsed
+
+def run(requests=64, rounds=10, levels=(1, 4, 16, 64)):
+    database = os.path.join(tempfile.mkdtemp(), 'bench_login.db')
+    for workers in (0, os.cpu_count() or 1):
+        config = type('BenchConfig', (TestingConfig,), {
+            'SQLALCHEMY_DATABASE_URI': f'sqlite:///{database}',
+            'BCRYPT_LOG_ROUNDS': rounds,
+            'PASSWORD_HASHER_WORKERS': workers,
+            'PASSWORD_HASHER_MAX_PENDING': 4 * max(workers, 1)
+        })
+        app, ctx = make_app(config)
+        HBnBFacade().create_user({"first_name": "Bench", "last_name": "User",
+                                  "email": "bench@example.com", "password": "secret"})
+        db.session.remove()
+        mode = f"pool ({workers} workers)" if workers else "inline"
+        print(f"\n{mode}, bcrypt rounds={rounds}, {requests} logins per level")
+        print(f"{'concurrency':>11} {'p50 ms':>8} {'p99 ms':>8} {'ok/s':>7} {'503':>5}")
+        run_level(app, 1, 2)  # warm up workers
+        for concurrency in levels:
+            latencies, shed, elapsed = run_level(app, concurrency, requests)
+            p50 = percentile(latencies, 0.50) * 1000 if latencies else float('nan')
+            p99 = percentile(latencies, 0.99) * 1000 if latencies else float('nan')
+            print(f"{concurrency:>11} {p50:>8.1f} {p99:>8.1f} {len(latencies) / elapsed:>7.1f} {shed:>5}")
+        app.extensions['password_hasher'].shutdown()
+        ctx.pop()
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 64,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 10)
@@ -0,0 +1,53 @@
+"""
+Benchmark listing pages served by the NumPy column index against the SQL path.
+
+Seeds `places` places (one amenity link and one review each), then fetches the
+first page of 20 for several filter/sort combinations, once through a plain
+PlaceRepository and once through one with a PlaceColumnIndex attached. Both
+must return the same ids.
+
+Usage:
+    python -m benchmarks.bench_place_columns [places]
+"""
+import sys
+import time
+from app.models.place import Place
+from app.persistence.place_columns import PlaceColumnIndex
+from app.persistence.place_repository import PlaceRepository
+from benchmarks.common import make_app, seed_users, seed_amenities, seed_places, timed
+
+def run(places=1000000):
+    app, ctx = make_app()
+    owners = seed_users(1000)
+    amenities = seed_amenities(10)
+    seed_places(places, owners, amenities, reviewer_ids=owners)
+    sql = PlaceRepository()
+    sql.rebuild_rating_aggregates()  # Seeded reviews bypass the incremental counters.
+    indexed = PlaceRepository()
+    indexed.column_index = PlaceColumnIndex()
+    start = time.perf_counter()
+    indexed.column_index.sync()
+    print(f"{places} places, column index loaded in {time.perf_counter() - start:.2f} s")
+
+    cases = [
+        ('newest, no filter', {}, 'created_at'),
+        ('max_price=50', {'max_price': 50}, 'created_at'),
+        ('owner', {'owner_id': owners[7]}, 'created_at'),
+        ('amenity + max_price=100', {'amenities': (amenities[3],), 'max_price': 100}, 'created_at'),
+        ('min_rating=4, by rating', {'min_rating': 4}, 'rating'),
+        ('bbox, by rating', {'bbox': (10.0, 10.0, 40.0, 60.0)}, 'rating'),
+    ]
+    print(f"{'case':<28} {'SQL ms':>8} {'columns ms':>11}")
+    for name, filters, sort in cases:
+        def page(repository):
+            items, _ = repository.get_page_with_relations(20, fields=('title', 'price'), embed=(),
+                                                          filters=filters, order=Place.SORT_ORDERS[sort])
+            return [place.id for place in items]
+        sql_time, expected = timed(page, sql, repeat=3)
+        column_time, got = timed(page, indexed, repeat=3)
+        assert got == expected, name
+        print(f"{name:<28} {sql_time * 1000:>8.1f} {column_time * 1000:>11.1f}")
+    ctx.pop()
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
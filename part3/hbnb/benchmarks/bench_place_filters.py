@@ -0,0 +1,44 @@
+"""
+Benchmark server-side place filtering against downloading the full list.
+
+The "full list" path mirrors what part4 index.js used to do: fetch every place and
+drop the ones above the selected max price on the client. The filtered path pushes
+the same predicate (plus an amenity filter) into SQL through PlaceRepository.
+
+Usage:
+    python -m benchmarks.bench_place_filters [places]
+"""
+import sys
+from app.services.facade import HBnBFacade
+from benchmarks.common import make_app, seed_users, seed_amenities, seed_places, timed
+
+def run(places=100000):
+    app, ctx = make_app()
+    facade = HBnBFacade()
+    owners = seed_users(100)
+    amenities = seed_amenities(10)
+    seed_places(places, owners, amenities)
+    fields, embed = ('title', 'price', 'latitude', 'longitude'), ()
+
+    def full_list(max_price):
+        return [place for place in facade.get_all_places(fields, embed) if place['price'] <= max_price]
+
+    def filtered(filters):
+        return facade.get_all_places(fields, embed, filters)
+
+    print(f"{places} places")
+    print(f"{'case':<32} {'rows':>8} {'seconds':>8}")
+    full_time, everything = timed(full_list, float('inf'), repeat=3)
+    print(f"{'full list':<32} {len(everything):>8} {full_time:>8.3f}")
+    for max_price in (50, 100):
+        client_time, client_rows = timed(full_list, max_price, repeat=3)
+        server_time, server_rows = timed(filtered, {'max_price': max_price}, repeat=3)
+        assert len(client_rows) == len(server_rows)
+        print(f"{f'full list + client max_price={max_price}':<32} {len(client_rows):>8} {client_time:>8.3f}")
+        print(f"{f'SQL max_price={max_price}':<32} {len(server_rows):>8} {server_time:>8.3f}")
+    amenity_time, amenity_rows = timed(filtered, {'max_price': 100, 'amenities': (amenities[0],)}, repeat=3)
+    print(f"{'SQL max_price=100 + amenity':<32} {len(amenity_rows):>8} {amenity_time:>8.3f}")
+    ctx.pop()
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,41 @@
+"""
+Benchmark GET /api/v1/places/ at the facade level.
+
+Seeds up to 10k places (each with an owner, an amenity and a review) and checks that
+the number of SQL statements issued by HBnBFacade.get_all_places() stays the same as
+the table grows.
+
+Usage:
+    python -m benchmarks.bench_place_listing [max_places]
+"""
+import sys
+from app import db
+from app.services.facade import HBnBFacade
+from app.utils.query_counter import QueryCounter
+from benchmarks.common import make_app, seed_users, seed_amenities, seed_places, timed
+
+def run(max_places=10000, steps=4):
+    app, ctx = make_app()
+    facade = HBnBFacade()
+    owners = seed_users(50)
+    amenities = seed_amenities(10)
+    seeded = 0
+    counts = []
+    print(f"{'places':>8} {'queries':>8} {'seconds':>8}")
+    for step in range(1, steps + 1):
+        target = max_places * step // steps
+        seed_places(target - seeded, owners, amenities, owners, seed=step)
+        seeded = target
+        db.session.expire_all()
+        with QueryCounter() as counter:
+            places = facade.get_all_places()
+        assert len(places) == seeded
+        elapsed, _ = timed(lambda: (db.session.expire_all(), facade.get_all_places()), repeat=3)
+        counts.append(counter.count)
+        print(f"{seeded:>8} {counter.count:>8} {elapsed:>8.3f}")
+    ctx.pop()
+    assert len(set(counts)) == 1, f"query count grew with N: {counts}"
+    return counts
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
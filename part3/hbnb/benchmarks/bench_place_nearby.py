@@ -0,0 +1,52 @@
+"""
+Benchmark GET /api/v1/places/nearby at the repository level.
+
+Seeds synthetic places uniformly over the globe in steps up to `max_places` and,
+at each size, times radius searches against a full scan that reads every
+coordinate and runs the same vectorized haversine. The indexed search should
+stay roughly flat as the table grows while the full scan grows linearly.
+
+Usage:
+    python -m benchmarks.bench_place_nearby [max_places] [radius_km]
+"""
+import random
+import sys
+import time
+from app import db
+from app.models.place import Place
+from app.persistence.place_repository import PlaceRepository
+from app.utils.geo import haversine_km
+from benchmarks.common import make_app, seed_users, seed_places
+
+def full_scan(latitude, longitude, radius_km):
+    rows = db.session.query(Place.id, Place.latitude, Place.longitude).all()
+    ids, latitudes, longitudes = zip(*rows)
+    return int((haversine_km(latitude, longitude, latitudes, longitudes) <= radius_km).sum())
+
+def run(max_places=1000000, radius_km=50.0, steps=4, searches=50):
+    app, ctx = make_app()
+    repository = PlaceRepository()
+    owners = seed_users(100)
+    rng = random.Random(7)
+    centers = [(rng.uniform(-60, 60), rng.uniform(-180, 180)) for _ in range(searches)]
+    seeded = 0
+    print(f"radius {radius_km} km, {searches} searches per size")
+    print(f"{'places':>8} {'nearby ms/search':>17} {'full scan ms':>13} {'avg hits':>9}")
+    for step in range(1, steps + 1):
+        target = max_places * step // steps
+        seed_places(target - seeded, owners, seed=step)
+        seeded = target
+        start = time.perf_counter()
+        hits = sum(len(repository.find_nearby(lat, lon, radius_km, 500, fields=(), embed=()))
+                   for lat, lon in centers)
+        nearby_ms = (time.perf_counter() - start) * 1000 / searches
+        start = time.perf_counter()
+        scan_hits = full_scan(*centers[0], radius_km)
+        scan_ms = (time.perf_counter() - start) * 1000
+        print(f"{seeded:>8} {nearby_ms:>17.2f} {scan_ms:>13.1f} {hits / searches:>9.2f}")
+        assert scan_hits == len(repository.find_nearby(*centers[0], radius_km, seeded, fields=(), embed=()))
+    ctx.pop()
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 50.0)
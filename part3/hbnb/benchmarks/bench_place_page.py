@@ -0,0 +1,53 @@
+"""
+Benchmark loading the part4 place page as the review count grows.
+
+For places with 10 to `max_reviews` reviews (each by a different user), times
+the previous place.js flow, GET /places/<id> followed by one GET /users/<id>
+per review, awaited in turn, against the current one: a single GET
+/places/<id> whose reviews carry the reviewer's name. Times are in-process
+server time, so real clients add one network round trip per request on top.
+
+Usage:
+    python -m benchmarks.bench_place_page [max_reviews]
+"""
+import sys
+import uuid
+from datetime import datetime
+from app import db
+from app.models.review import Review
+from benchmarks.common import make_app, seed_users, seed_places, timed
+
+def run(max_reviews=1000):
+    app, ctx = make_app()
+    client = app.test_client()
+    users = seed_users(1 + max_reviews)
+    owner, guests = users[:1], users[1:]
+    print(f"{'reviews':>8} {'before reqs':>12} {'before ms':>10} {'after reqs':>11} {'after ms':>9}")
+    for count in (10, 100, max_reviews):
+        place_id = seed_places(1, owner, seed=count)[0]
+        reviewers = guests[:count]
+        now = datetime.utcnow()
+        db.session.execute(Review.__table__.insert(), [{
+            'id': str(uuid.uuid4()), 'text': 'Lovely stay', 'rating': 5, 'user_id': user_id,
+            'place_id': place_id, 'created_at': now, 'updated_at': now
+        } for user_id in reviewers])
+        db.session.commit()
+
+        def before():
+            reviews = client.get(f'/api/v1/places/{place_id}').get_json()['reviews']
+            names = [client.get(f"/api/v1/users/{review['user_id']}").get_json()['first_name'] for review in reviews]
+            return 1 + len(names)
+
+        def after():
+            reviews = client.get(f'/api/v1/places/{place_id}').get_json()['reviews']
+            assert all(review['user_name'] for review in reviews)
+            return 1
+
+        before_time, before_requests = timed(before, repeat=3)
+        after_time, after_requests = timed(after, repeat=3)
+        print(f"{count:>8} {before_requests:>12} {before_time * 1000:>10.1f} "
+              f"{after_requests:>11} {after_time * 1000:>9.1f}")
+    ctx.pop()
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
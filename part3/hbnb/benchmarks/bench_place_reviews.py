@@ -0,0 +1,82 @@
+"""
+Benchmark reading the reviews of a place with `reviews` reviews.
+
+Seeds that many reviewers and reviews on one place, next to as many other
+places with one review each, then times:
+  - the previous way to list them, GET /places/<id>?embed=reviews, against the
+    first and a deep page of GET /places/<id>/reviews in both sort orders;
+  - the previous duplicate-review check of POST /reviews/ (every review of the
+    place loaded, then each author compared) against the EXISTS probe.
+
+Usage:
+    python -m benchmarks.bench_place_reviews [reviews]
+"""
+import random
+import sys
+import uuid
+from datetime import datetime, timedelta
+from app import db
+from app.models.review import Review
+from app.services.facade import get_facade
+from benchmarks.common import make_app, seed_users, seed_places, timed
+
+def deep_cursor(client, url, pages):
+    """Return the cursor `pages` pages into `url` (walked once, outside the timings)."""
+    cursor = None
+    for _ in range(pages):
+        cursor = client.get(url + (f'&cursor={cursor}' if cursor else '')).get_json()['next_cursor']
+    return cursor
+
+def run(reviews=100000):
+    app, ctx = make_app()
+    client = app.test_client()
+    facade = get_facade()
+    users = seed_users(1 + reviews)
+    owner, reviewers = users[:1], users[1:]
+    seed_places(reviews, owner, reviewer_ids=reviewers, seed=1)
+    place_id = seed_places(1, owner, seed=2)[0]
+    rng = random.Random(3)
+    start = datetime.utcnow() - timedelta(seconds=reviews)
+    rows = [{
+        'id': str(uuid.uuid4()), 'text': f'Review {i}', 'rating': rng.randint(1, 5), 'user_id': user_id,
+        'place_id': place_id, 'created_at': start + timedelta(seconds=i), 'updated_at': start + timedelta(seconds=i)
+    } for i, user_id in enumerate(reviewers)]
+    for offset in range(0, len(rows), 5000):
+        db.session.execute(Review.__table__.insert(), rows[offset:offset + 5000])
+    db.session.commit()
+    print(f"{reviews} reviews on the place, {reviews} on other places")
+
+    def get(url):
+        response = client.get(url)
+        assert response.status_code == 200, url
+        return len(response.data)
+
+    print(f"{'request':<44} {'ms':>9} {'bytes':>11}")
+    cases = [('GET /places/<id>?embed=reviews (before)', f'/api/v1/places/{place_id}?fields=title&embed=reviews', 1)]
+    for sort in ('created_at', 'rating'):
+        url = f'/api/v1/places/{place_id}/reviews?limit=50&sort={sort}'
+        cases.append((f'reviews sort={sort} first page', url, 20))
+        cases.append((f'reviews sort={sort} page 1000', f'{url}&cursor={deep_cursor(client, url, 1000)}', 20))
+    for name, url, repeat in cases:
+        db.session.expire_all()
+        elapsed, size = timed(get, url, repeat=repeat)
+        print(f"{name:<44} {elapsed * 1000:>9.2f} {size:>11}")
+
+    reviewer = reviewers[-1]
+
+    def loop_check():
+        db.session.expire_all()
+        return any(review.user.id == reviewer for review in facade.get_reviews_by_place(place_id))
+
+    def probe():
+        return facade.has_reviewed(reviewer, place_id)
+
+    for name, fn, repeat in (('duplicate check, load and loop (before)', loop_check, 1),
+                             ('duplicate check, EXISTS probe', probe, 100)):
+        elapsed, found = timed(fn, repeat=repeat)
+        assert found
+        print(f"{name:<44} {elapsed * 1000:>9.2f}")
+    ctx.pop()
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
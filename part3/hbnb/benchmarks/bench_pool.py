@@ -0,0 +1,102 @@
+"""
+Load test the connection pool with concurrent HTTP clients.
+
+Serves the app from a threaded WSGI server on a SQLite file (the in-memory
+database shares one connection, so it has no pool to exhaust), then runs
+`clients` threads that each send `requests` requests: place listings, place
+details, a place's reviews and, one time in ten, an owner's PUT. Reports the
+throughput, the latency percentiles, the failed requests and the pool
+statistics /api/v1/metrics exposes; timeouts must stay at 0.
+
+Usage:
+    python -m benchmarks.bench_pool [clients] [requests] [pool_size] [max_overflow]
+"""
+import http.client
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from flask_jwt_extended import create_access_token
+from werkzeug.serving import make_server
+from app.persistence.pool import get_pool_monitor
+from benchmarks.common import make_app, seed_users, seed_amenities, seed_places
+from config import TestingConfig
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+def run(clients=200, requests=20, pool_size=10, max_overflow=20):
+    path = os.path.join(tempfile.mkdtemp(), 'bench_pool.db')
+
+    class FileConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+        DB_POOL_SIZE = pool_size
+        DB_MAX_OVERFLOW = max_overflow
+        REPOSITORY_METRICS = False
+    app, ctx = make_app(FileConfig)
+    owners = seed_users(clients)
+    place_ids = seed_places(2000, owners, seed_amenities(10), reviewer_ids=owners)
+    owner_of = {place_id: owners[i % len(owners)] for i, place_id in enumerate(place_ids)}
+    tokens = {owner: create_access_token(identity=owner) for owner in owners}
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_port
+
+    latencies, failures, lock = [], [], threading.Lock()
+    start_line = threading.Barrier(clients)
+
+    def client(seed):
+        rng = random.Random(seed)
+        start_line.wait()
+        for _ in range(requests):
+            place_id = rng.choice(place_ids)
+            method, url, body, headers = 'GET', rng.choice((
+                '/api/v1/places/?limit=20', f'/api/v1/places/{place_id}', f'/api/v1/places/{place_id}/reviews')), None, {}
+            if rng.random() < 0.1:
+                method, url = 'PUT', f'/api/v1/places/{place_id}'
+                body = json.dumps({'price': round(rng.uniform(10, 500), 2)})
+                headers = {'Content-Type': 'application/json', 'Authorization': f'Bearer {tokens[owner_of[place_id]]}'}
+            began = time.perf_counter()
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=120)
+            try:
+                connection.request(method, url, body, headers)
+                status = connection.getresponse().status
+            except OSError as e:
+                status = repr(e)
+            finally:
+                connection.close()
+            with lock:
+                latencies.append(time.perf_counter() - began)
+                if status != 200:
+                    failures.append((method, url, status))
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    began = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - began
+    server.shutdown()
+
+    stats = get_pool_monitor().stats()
+    print(f"{clients} clients x {requests} requests, pool_size={pool_size} max_overflow={max_overflow}")
+    print(f"{len(latencies) / elapsed:.0f} req/s, latency p50 {percentile(latencies, 0.5) * 1000:.1f} ms, "
+          f"p99 {percentile(latencies, 0.99) * 1000:.1f} ms, {len(failures)} failed")
+    for failure in failures[:5]:
+        print("  failed:", *failure)
+    print(f"pool: peak in use {stats['peak_in_use']}, peak overflow {stats['peak_overflow']}, "
+          f"timeouts {stats['timeouts']}, checkouts {stats['checkouts']}, "
+          f"checkout wait p50 {stats['checkout_wait_ms']['p50']} ms, p99 {stats['checkout_wait_ms']['p99']} ms, "
+          f"max {stats['checkout_wait_ms']['max']} ms")
+    ctx.pop()
+    os.remove(path)
+
+if __name__ == '__main__':
+    run(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,79 @@
+"""
+Benchmark full-text place search on the in-process BM25 index.
+
+Seeds `places` places and `reviews` reviews whose words are drawn from a
+Zipf-distributed vocabulary (a few very common words, a long tail of rare
+ones), builds the index, then times PlaceRepository.search() for one-, two-
+and three-word queries mixing common and rare words. Latency includes loading
+the page of places from SQL; p50 and p99 are reported over `queries` searches.
+
+Usage:
+    python -m benchmarks.bench_search [reviews] [places] [queries]
+"""
+import random
+import sys
+import time
+import uuid
+from datetime import datetime
+import numpy as np
+from app import db
+from app.models.review import Review
+from app.persistence.place_repository import PlaceRepository
+from app.persistence.search_index import PlaceSearchIndex
+from benchmarks.common import make_app, seed_users, seed_places
+
+VOCABULARY = 20000
+WORDS_PER_REVIEW = 30
+
+def seed_reviews(count, place_ids, user_ids, rng, chunk_size=20000):
+    """Insert `count` reviews of Zipf-distributed words ('w0' most common) on random places."""
+    now = datetime.utcnow()
+    for offset in range(0, count, chunk_size):
+        size = min(chunk_size, count - offset)
+        words = np.minimum(rng.zipf(1.2, (size, WORDS_PER_REVIEW)), VOCABULARY) - 1
+        places = rng.integers(0, len(place_ids), size)
+        db.session.execute(Review.__table__.insert(), [{
+            'id': str(uuid.uuid4()),
+            'text': ' '.join(f'w{word}' for word in words[i]),
+            'rating': int(1 + i % 5),
+            'user_id': user_ids[i % len(user_ids)],
+            'place_id': place_ids[places[i]],
+            'created_at': now,
+            'updated_at': now
+        } for i in range(size)])
+        db.session.commit()
+
+def run(reviews=500000, places=100000, queries=1000):
+    app, ctx = make_app()
+    users = seed_users(1000)
+    place_ids = seed_places(places, users)
+    seed_reviews(reviews, place_ids, users, np.random.default_rng(42))
+    repository = PlaceRepository()
+    repository.search_index = PlaceSearchIndex()
+    start = time.perf_counter()
+    repository.search_index.sync()
+    info = repository.search_index.info()
+    print(f"{places} places, {reviews} reviews: {info['terms']} terms indexed in "
+          f"{time.perf_counter() - start:.2f} s")
+
+    rng = random.Random(7)
+    common, tail = range(0, 50), range(50, VOCABULARY)
+    shapes = [('1 common word', lambda: [rng.choice(common)]),
+              ('1 rare word', lambda: [rng.choice(tail)]),
+              ('2 words', lambda: [rng.choice(common), rng.choice(tail)]),
+              ('3 common words', lambda: rng.sample(common, 3))]
+    print(f"{'query':<16} {'p50 ms':>8} {'p99 ms':>8}")
+    for name, words in shapes:
+        timings = []
+        for _ in range(queries):
+            query = ' '.join(f'w{word}' for word in words())
+            start = time.perf_counter()
+            repository.search(query, 20, fields=('title',), embed=())
+            timings.append(time.perf_counter() - start)
+        p50, p99 = np.percentile(timings, [50, 99]) * 1000
+        print(f"{name:<16} {p50:>8.2f} {p99:>8.2f}")
+    ctx.pop()
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:]]
+    run(*args)
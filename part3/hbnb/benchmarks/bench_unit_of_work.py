@@ -0,0 +1,53 @@
+"""
+Benchmark commit-per-operation against unit-of-work transactions.
+
+Each simulated request creates a place, adds an amenity to it and updates its
+price: three facade writes. Run on a file-backed SQLite database so every commit
+pays for a journal sync, as it would on a real server.
+
+    per operation   every facade call commits on its own
+    per request     the request's three calls share one facade.transaction()
+    per 100 reqs    an importer groups 100 requests into one transaction
+
+Usage:
+    python -m benchmarks.bench_unit_of_work [requests]
+"""
+import os
+import sys
+import tempfile
+from contextlib import nullcontext
+from app.services.facade import HBnBFacade
+from app.utils.query_counter import CommitCounter
+from benchmarks.common import make_app, seed_users, timed
+
+def run(requests=500):
+    directory = tempfile.mkdtemp()
+    os.environ['TEST_DATABASE_URL'] = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+    app, ctx = make_app()
+    facade = HBnBFacade()
+    owner_id = seed_users(1)[0]
+
+    def handle(i):
+        place = facade.create_place({'title': f'Place {i}', 'description': 'Benchmark place', 'price': 50,
+                                     'latitude': 10.0, 'longitude': 20.0, 'owner_id': owner_id})
+        facade.create_amenity({'name': f'Amenity {i}', 'place_id': place['id']})
+        facade.update_place(place['id'], {'price': 60})
+
+    def workload(per_request, group=1):
+        for start in range(0, requests, group):
+            with facade.transaction() if group > 1 else nullcontext():
+                for i in range(start, min(start + group, requests)):
+                    with facade.transaction() if per_request else nullcontext():
+                        handle(i)
+
+    print(f"{requests} requests x 3 writes, SQLite file {directory}")
+    print(f"{'case':<16} {'commits':>8} {'seconds':>8} {'req/s':>8}")
+    for name, per_request, group in (('per operation', False, 1), ('per request', True, 1),
+                                     ('per 100 reqs', True, 100)):
+        with CommitCounter() as counter:
+            elapsed, _ = timed(workload, per_request, group, repeat=1)
+        print(f"{name:<16} {counter.count:>8} {elapsed:>8.3f} {requests / elapsed:>8.0f}")
+    ctx.pop()
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,105 @@
+"""Shared helpers for the benchmark scripts: app setup, bulk seeding and timing."""
+import time
+import uuid
+import random
+from datetime import datetime, timedelta
+from app import create_app, db
+from app.utils.geo import geohash_encode
+
+PLACEHOLDER_HASH = '$2b$04$' + 'x' * 53
+
+def make_app(config_class="config.TestingConfig"):
+    """Create the app and push an application context with a fresh schema."""
+    app = create_app(config_class)
+    ctx = app.app_context()
+    ctx.push()
+    db.drop_all()
+    db.create_all()
+    return app, ctx
+
+def seed_users(count):
+    """Insert `count` users with a placeholder password hash and return their ids."""
+    from app.models.user import User
+    now = datetime.utcnow()
+    rows = [{
+        'id': str(uuid.uuid4()),
+        'first_name': f'First{i}',
+        'last_name': f'Last{i}',
+        'email': f'user{i}@bench.io',
+        'password': PLACEHOLDER_HASH,
+        'is_admin': False,
+        'created_at': now,
+        'updated_at': now
+    } for i in range(count)]
+    db.session.execute(User.__table__.insert(), rows)
+    db.session.commit()
+    return [row['id'] for row in rows]
+
+def seed_amenities(count):
+    """Insert `count` amenities and return their ids."""
+    from app.models.amenity import Amenity
+    now = datetime.utcnow()
+    rows = [{'id': str(uuid.uuid4()), 'name': f'Amenity {i}', 'created_at': now, 'updated_at': now}
+            for i in range(count)]
+    db.session.execute(Amenity.__table__.insert(), rows)
+    db.session.commit()
+    return [row['id'] for row in rows]
+
+def seed_places(count, owner_ids, amenity_ids=(), reviewer_ids=(), chunk_size=5000, seed=42):
+    """
+    Bulk insert `count` places spread over `owner_ids`, each linked to one amenity and
+    reviewed once when amenities/reviewers are given. Returns the inserted place ids.
+    """
+    from app.models.place import Place, place_amenity
+    from app.models.review import Review
+    rng = random.Random(seed)
+    start = datetime.utcnow() - timedelta(seconds=count)
+    place_ids = []
+    for offset in range(0, count, chunk_size):
+        places, links, reviews = [], [], []
+        for i in range(offset, min(offset + chunk_size, count)):
+            created = start + timedelta(seconds=i)
+            place_id = str(uuid.uuid4())
+            latitude, longitude = rng.uniform(-90, 90), rng.uniform(-180, 180)
+            places.append({
+                'id': place_id,
+                'title': f'Place {i}',
+                'description': f'Description of place {i}',
+                'price': round(rng.uniform(10, 500), 2),
+                'latitude': latitude,
+                'longitude': longitude,
+                'geohash': geohash_encode(latitude, longitude),
+                'owner_id': owner_ids[i % len(owner_ids)],
+                'created_at': created,
+                'updated_at': created
+            })
+            if amenity_ids:
+                links.append({'place_id': place_id, 'amenity_id': amenity_ids[i % len(amenity_ids)]})
+            if reviewer_ids:
+                reviews.append({
+                    'id': str(uuid.uuid4()),
+                    'text': f'Review of place {i}',
+                    'rating': rng.randint(1, 5),
+                    'user_id': reviewer_ids[i % len(reviewer_ids)],
+                    'place_id': place_id,
+                    'created_at': created,
+                    'updated_at': created
+                })
+            place_ids.append(place_id)
+        db.session.execute(Place.__table__.insert(), places)
+        if links:
+            db.session.execute(place_amenity.insert(), links)
+        if reviews:
+            db.session.execute(Review.__table__.insert(), reviews)
+        db.session.commit()
+    return place_ids
+
+def timed(fn, *args, repeat=5, **kwargs):
+    """Run `fn` `repeat` times and return (best elapsed seconds, last result)."""
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
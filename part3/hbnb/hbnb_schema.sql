@@ -11,7 +11,8 @@ CREATE TABLE IF NOT EXISTS User (
     password VARCHAR(255) NOT NULL,
     is_admin BOOLEAN DEFAULT FALSE,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX idx_user_created_at (created_at, id)  -- Keyset pagination
 );
 
 -- Create the Place table
@@ -23,8 +24,23 @@ CREATE TABLE IF NOT EXISTS Place (
     latitude FLOAT,
     longitude FLOAT,
     owner_id CHAR(36) NOT NULL,  -- Use CHAR(36) for UUIDs
+    geohash CHAR(12),  -- Derived from latitude/longitude by the application
+    -- Review aggregates, maintained incrementally by the application
+    review_count INT NOT NULL DEFAULT 0,
+    rating_sum INT NOT NULL DEFAULT 0,
+    rating_average FLOAT NOT NULL DEFAULT 0,
+    rating_count_1 INT NOT NULL DEFAULT 0,
+    rating_count_2 INT NOT NULL DEFAULT 0,
+    rating_count_3 INT NOT NULL DEFAULT 0,
+    rating_count_4 INT NOT NULL DEFAULT 0,
+    rating_count_5 INT NOT NULL DEFAULT 0,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX idx_place_created_at (created_at, id),  -- Keyset pagination
+    INDEX idx_place_price (price),  -- min_price / max_price filters
+    INDEX idx_place_owner_id (owner_id, created_at),  -- owner_id filter
+    INDEX idx_place_geohash (geohash),  -- Nearby / bounding-box search
+    INDEX idx_place_rating (rating_average, id),  -- sort=rating and rating filters
     FOREIGN KEY (owner_id) REFERENCES User(id) ON DELETE CASCADE
 );
 
@@ -38,6 +54,9 @@ CREATE TABLE IF NOT EXISTS Review (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     UNIQUE (user_id, place_id),
+    INDEX idx_review_created_at (created_at, id),  -- Keyset pagination
+    INDEX idx_review_place_rating (place_id, rating, id),  -- Rating filters, a place's reviews by rating
+    INDEX idx_review_place_created (place_id, created_at, id),  -- A place's reviews by date
     FOREIGN KEY (user_id) REFERENCES User(id) ON DELETE CASCADE,
     FOREIGN KEY (place_id) REFERENCES Place(id) ON DELETE CASCADE
 );
@@ -55,6 +74,7 @@ CREATE TABLE IF NOT EXISTS Place_Amenity (
     place_id CHAR(36) NOT NULL,  -- Use CHAR(36) for UUIDs
     amenity_id CHAR(36) NOT NULL,  -- Use CHAR(36) for UUIDs
     PRIMARY KEY (place_id, amenity_id),
+    INDEX idx_place_amenity_amenity_id (amenity_id),  -- Amenity filter
     FOREIGN KEY (place_id) REFERENCES Place(id) ON DELETE CASCADE,
     FOREIGN KEY (amenity_id) REFERENCES Amenity(id) ON DELETE CASCADE
 );
@@ -67,14 +87,25 @@ INSERT INTO User (id, first_name, last_name, email, password, is_admin) VALUES
     (UUID(), 'John', 'Doe', 'john.doe@example.com', '$2b$12$7sImr.//j/2D/3yRmzAp8OeTOZnPZATJv7XymP7zN5j6ZekrJUXTG', FALSE),
     (UUID(), 'Jane', 'Doe', 'jane.doe@example.com', '$2b$12$5bKJp95kYOwFr.O1CvF/BO7WjFX5M78g.FXjUdPBb6UlOV9dOi8Ym', FALSE);
 
-INSERT INTO Place (id, title, description, price, latitude, longitude, owner_id) VALUES
-    (UUID(), 'Cozy Apartment', 'A nice cozy apartment in the city center.', 100.00, 40.7128, -74.0060, (SELECT id FROM User WHERE email = 'john.doe@example.com')),
-    (UUID(), 'Beach House', 'A beautiful house near the beach.', 200.00, 34.0522, -118.2437, (SELECT id FROM User WHERE email = 'jane.doe@example.com'));
+INSERT INTO Place (id, title, description, price, latitude, longitude, owner_id, geohash) VALUES
+    (UUID(), 'Cozy Apartment', 'A nice cozy apartment in the city center.', 100.00, 40.7128, -74.0060, (SELECT id FROM User WHERE email = 'john.doe@example.com'), 'dr5regw3ppyz'),
+    (UUID(), 'Beach House', 'A beautiful house near the beach.', 200.00, 34.0522, -118.2437, (SELECT id FROM User WHERE email = 'jane.doe@example.com'), '9q5ctr186n4v');
 
 INSERT INTO Review (id, text, rating, user_id, place_id) VALUES
     (UUID(), 'Great place!', 5, (SELECT id FROM User WHERE email = 'john.doe@example.com'), (SELECT id FROM Place WHERE title = 'Cozy Apartment')),
     (UUID(), 'Had an amazing stay.', 4, (SELECT id FROM User WHERE email = 'jane.doe@example.com'), (SELECT id FROM Place WHERE title = 'Beach House'));
 
+-- Initialize the rating aggregates of the seeded places (same as `flask rebuild-ratings`)
+UPDATE Place p SET
+    review_count = (SELECT COUNT(*) FROM Review r WHERE r.place_id = p.id),
+    rating_sum = (SELECT COALESCE(SUM(r.rating), 0) FROM Review r WHERE r.place_id = p.id),
+    rating_average = (SELECT COALESCE(AVG(r.rating), 0) FROM Review r WHERE r.place_id = p.id),
+    rating_count_1 = (SELECT COUNT(*) FROM Review r WHERE r.place_id = p.id AND r.rating = 1),
+    rating_count_2 = (SELECT COUNT(*) FROM Review r WHERE r.place_id = p.id AND r.rating = 2),
+    rating_count_3 = (SELECT COUNT(*) FROM Review r WHERE r.place_id = p.id AND r.rating = 3),
+    rating_count_4 = (SELECT COUNT(*) FROM Review r WHERE r.place_id = p.id AND r.rating = 4),
+    rating_count_5 = (SELECT COUNT(*) FROM Review r WHERE r.place_id = p.id AND r.rating = 5);
+
 INSERT INTO Amenity (id, name) VALUES
     (UUID(), 'WiFi'),
     (UUID(), 'Swimming Pool'),
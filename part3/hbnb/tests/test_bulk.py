@@ -0,0 +1,173 @@
+import unittest
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.services.facade import HBnBFacade
+from app.models.place import Place
+from app.utils.geo import geohash_encode
+from app.utils.query_counter import QueryCounter
+
+class TestBulkEndpoints(unittest.TestCase):
+    def setUp(self):
+        """Create an owner, a reviewer and two amenities, with a token for each user."""
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.facade = HBnBFacade()
+        self.owner = self.create_user("owner")
+        self.reviewer = self.create_user("reviewer")
+        result = self.facade.bulk_create_amenities([{"name": "WiFi"}, {"name": "Pool"}]).to_dict()
+        self.amenity_ids = [item['id'] for item in result['items']]
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def create_user(self, name):
+        return self.facade.create_user({
+            "first_name": name,
+            "last_name": "User",
+            "email": f"{name}@example.com",
+            "password": "secret"
+        })
+
+    def headers(self, user, is_admin=False):
+        token = create_access_token(identity=user.id, additional_claims={'is_admin': is_admin})
+        return {'Authorization': f'Bearer {token}'}
+
+    def place(self, i, **overrides):
+        return dict({
+            "title": f"Place {i}",
+            "description": "A place",
+            "price": 10 + i,
+            "latitude": 48.85,
+            "longitude": 2.35,
+            "amenities": self.amenity_ids
+        }, **overrides)
+
+    def create_places(self, count):
+        response = self.client.post('/api/v1/places/batch', json={'places': [self.place(i) for i in range(count)]},
+                                    headers=self.headers(self.owner))
+        self.assertEqual(response.status_code, 201)
+        return [item['id'] for item in response.get_json()['items']]
+
+    def test_create_places_in_constant_statements(self):
+        """Test that a batch costs one lookup per table and one INSERT per table, not per item."""
+        items, owner_id = [self.place(i) for i in range(50)], self.owner.id
+        with QueryCounter() as counter:
+            result = self.facade.bulk_create_places(items, owner_id=owner_id).to_dict()
+        self.assertEqual(len(result['items']), 50)
+        self.assertEqual(result['errors'], [])
+        inserts = [statement for statement in counter.statements if statement.lstrip().upper().startswith('INSERT')]
+        self.assertEqual(len(inserts), 2)
+        self.assertEqual(counter.count, 4)
+        place = db.session.get(Place, result['items'][0]['id'])
+        self.assertEqual(place.owner_id, self.owner.id)
+        self.assertEqual(place.geohash, geohash_encode(48.85, 2.35))
+        self.assertEqual(place.review_count, 0)
+        self.assertEqual(sorted(amenity.id for amenity in place.amenities), sorted(self.amenity_ids))
+
+    def test_create_reports_errors_per_item(self):
+        """Test that invalid items are reported by index while the valid ones are created."""
+        items = [
+            self.place(0),
+            self.place(1, price=-5),
+            self.place(2, amenities=["missing-amenity"]),
+            "not an object",
+            self.place(4)
+        ]
+        response = self.client.post('/api/v1/places/batch', json={'places': items}, headers=self.headers(self.owner))
+        self.assertEqual(response.status_code, 207)
+        data = response.get_json()
+        self.assertEqual([item['index'] for item in data['items']], [0, 4])
+        self.assertEqual(data['errors'], [
+            {'index': 1, 'error': 'Price must be a positive number.'},
+            {'index': 2, 'error': 'Amenity not found: missing-amenity'},
+            {'index': 3, 'error': 'Item must be an object.'}
+        ])
+        self.assertEqual(Place.query.count(), 2)
+
+    def test_non_admin_cannot_create_for_other_owner(self):
+        """Test that owner_id in the payload is ignored for regular users."""
+        response = self.client.post('/api/v1/places/batch', json={'places': [self.place(0, owner_id=self.reviewer.id)]},
+                                    headers=self.headers(self.owner))
+        place = db.session.get(Place, response.get_json()['items'][0]['id'])
+        self.assertEqual(place.owner_id, self.owner.id)
+
+    def test_update_and_delete_places(self):
+        """Test batch updates keep the geohash in sync and refuse other users' places."""
+        place_ids = self.create_places(3)
+        response = self.client.put('/api/v1/places/batch', json={'places': [
+            {"id": place_ids[0], "latitude": -33.87, "longitude": 151.21, "amenities": []},
+            {"id": place_ids[1], "title": ""},
+            {"id": "missing", "price": 20}
+        ]}, headers=self.headers(self.owner))
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual([error['index'] for error in response.get_json()['errors']], [1, 2])
+        place = db.session.get(Place, place_ids[0])
+        self.assertEqual(place.geohash, geohash_encode(-33.87, 151.21))
+        self.assertEqual(place.amenities, [])
+
+        response = self.client.delete('/api/v1/places/batch', json={'ids': place_ids[:2]},
+                                      headers=self.headers(self.reviewer))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual({error['error'] for error in response.get_json()['errors']}, {'Unauthorized action.'})
+        response = self.client.delete('/api/v1/places/batch', json={'ids': place_ids[:2]},
+                                      headers=self.headers(self.owner))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Place.query.count(), 1)
+
+    def test_reviews_maintain_rating_aggregates(self):
+        """Test review batches apply their ratings and reject duplicates and self-reviews."""
+        place_ids = self.create_places(2)
+        response = self.client.post('/api/v1/reviews/batch', json={'reviews': [
+            {"text": "Great", "rating": 5, "place_id": place_ids[0]},
+            {"text": "Okay", "rating": 3, "place_id": place_ids[1]},
+            {"text": "Again", "rating": 1, "place_id": place_ids[0]},
+            {"text": "Bad rating", "rating": 9, "place_id": place_ids[1]}
+        ]}, headers=self.headers(self.reviewer))
+        data = response.get_json()
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(data['errors'], [
+            {'index': 2, 'error': 'You have already reviewed this place.'},
+            {'index': 3, 'error': 'Rating must be an integer between 1 and 5.'}
+        ])
+        response = self.client.post('/api/v1/reviews/batch', json={'reviews': [
+            {"text": "Mine", "rating": 5, "place_id": place_ids[0]}
+        ]}, headers=self.headers(self.owner))
+        self.assertEqual(response.get_json()['errors'][0]['error'], 'You cannot review your own place.')
+
+        first, second = (item['id'] for item in data['items'])
+        self.client.put('/api/v1/reviews/batch', json={'reviews': [{"id": first, "rating": 4}]},
+                        headers=self.headers(self.reviewer))
+        self.client.delete('/api/v1/reviews/batch', json={'ids': [second]}, headers=self.headers(self.reviewer))
+        db.session.expire_all()
+        rated, unrated = (db.session.get(Place, place_id) for place_id in place_ids)
+        self.assertEqual((rated.review_count, rated.rating_sum, rated.rating_average), (1, 4, 4.0))
+        self.assertEqual(rated.rating_histogram['4'], 1)
+        self.assertEqual((unrated.review_count, unrated.rating_sum), (0, 0))
+
+    def test_amenities_require_admin(self):
+        """Test that amenity batches are admin-only and delete the amenity links."""
+        place_ids = self.create_places(1)
+        response = self.client.delete('/api/v1/amenities/batch', json={'ids': self.amenity_ids},
+                                      headers=self.headers(self.owner))
+        self.assertEqual(response.status_code, 403)
+        response = self.client.delete('/api/v1/amenities/batch', json={'ids': self.amenity_ids + ['missing']},
+                                      headers=self.headers(self.owner, is_admin=True))
+        self.assertEqual(response.status_code, 207)
+        db.session.expire_all()
+        self.assertEqual(db.session.get(Place, place_ids[0]).amenities, [])
+
+    def test_rejects_malformed_batches(self):
+        """Test that a missing, empty or oversized array is refused outright."""
+        headers = self.headers(self.owner)
+        self.assertEqual(self.client.post('/api/v1/places/batch', json=[], headers=headers).status_code, 400)
+        self.assertEqual(self.client.post('/api/v1/places/batch', json={'places': []}, headers=headers).status_code, 400)
+        oversized = {'ids': ['x'] * 10001}
+        self.assertEqual(self.client.delete('/api/v1/places/batch', json=oversized, headers=headers).status_code, 400)
+
+if __name__ == '__main__':
+    unittest.main()
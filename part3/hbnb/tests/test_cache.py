@@ -0,0 +1,164 @@
+import unittest
+from unittest.mock import patch
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.persistence.cache import LRUCache, RedisCache, _MISSING
+from app.services.facade import HBnBFacade
+from app.utils.query_counter import QueryCounter
+
+class FakeRedis:
+    """Minimal Redis-compatible client storing values in a dict."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, name):
+        return self.data.get(name)
+
+    def set(self, name, value, ex=None):
+        self.data[name] = value
+
+    def delete(self, name):
+        self.data.pop(name, None)
+
+class TestLRUCache(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        """Test that the oldest untouched entry is evicted past max_size."""
+        cache = LRUCache(max_size=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertIs(cache.get('b'), _MISSING)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.evictions, 1)
+
+    def test_entries_expire_after_ttl(self):
+        """Test that an entry is not served once its TTL has elapsed."""
+        cache = LRUCache(max_size=10, ttl=5)
+        with patch('app.persistence.cache.time.monotonic', return_value=100.0):
+            cache.set('a', 1)
+        with patch('app.persistence.cache.time.monotonic', return_value=104.0):
+            self.assertEqual(cache.get('a'), 1)
+        with patch('app.persistence.cache.time.monotonic', return_value=105.0):
+            self.assertIs(cache.get('a'), _MISSING)
+
+class TestCachedRepository(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.facade = HBnBFacade()
+        self.user = self.facade.create_user({
+            "first_name": "Cached",
+            "last_name": "User",
+            "email": "cached@example.com",
+            "password": "secret"
+        })
+        self.user_id = self.user.id
+        self.new_request()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def new_request(self):
+        """Drop the session so the next lookups behave like a fresh request."""
+        db.session.remove()
+        self.facade = HBnBFacade()
+
+    def stats(self):
+        return self.app.extensions['repository_cache'].stats()['repositories']['User']
+
+    def test_hit_issues_no_query(self):
+        """Test that a second lookup in a later request is served without SQL."""
+        self.facade.get_user_by_id(self.user_id)
+        self.new_request()
+        with QueryCounter() as counter:
+            user = self.facade.get_user_by_id(self.user_id)
+        self.assertEqual(counter.count, 0)
+        self.assertEqual(user.email, "cached@example.com")
+        self.assertEqual(self.stats()['hits'], 1)
+        self.assertEqual(self.stats()['misses'], 1)
+
+    def test_cached_object_is_attached_to_session(self):
+        """Test that relationships still lazy-load on an object served from cache."""
+        self.facade.get_user_by_id(self.user_id)
+        self.new_request()
+        user = self.facade.get_user_by_id(self.user_id)
+        self.assertIn(user, db.session)
+        self.assertEqual(user.places, [])
+
+    def test_no_stale_read_after_update(self):
+        """Test that an update through the facade invalidates the cached row."""
+        self.facade.get_user_by_id(self.user_id)
+        self.new_request()
+        self.facade.update_user(self.user_id, {"first_name": "Renamed"})
+        self.new_request()
+        self.assertEqual(self.facade.get_user_by_id(self.user_id).first_name, "Renamed")
+
+    def test_no_stale_read_after_write_outside_repository(self):
+        """Test that the flush hook invalidates writes that bypass update()."""
+        old_hash = self.facade.get_user_by_id(self.user_id).password
+        self.new_request()
+        self.facade.reset_user_password("cached@example.com", "new-secret")
+        self.new_request()
+        user = self.facade.get_user_by_id(self.user_id)
+        self.assertNotEqual(user.password, old_hash)
+        self.assertTrue(user.verify_password("new-secret"))
+
+    def test_no_stale_read_after_rollback(self):
+        """Test that a row re-read inside a rolled-back transaction is not served from cache."""
+        with self.assertRaises(RuntimeError):
+            with self.facade.transaction():
+                self.facade.update_user(self.user_id, {"first_name": "Changed"})
+                self.assertEqual(self.facade.get_user_by_id(self.user_id).first_name, "Changed")
+                raise RuntimeError("abort")
+        self.new_request()
+        self.assertEqual(self.facade.get_user_by_id(self.user_id).first_name, "Cached")
+
+    def test_password_hash_is_not_cached(self):
+        """Test that the password hash stays out of the cache and still loads on demand."""
+        cache = self.app.extensions['repository_cache']
+        cache.backend = RedisCache(FakeRedis(), ttl=60)
+        self.new_request()
+        self.facade.get_user_by_id(self.user_id)
+        self.assertNotIn(b'password', next(iter(cache.backend.client.data.values())))
+        self.new_request()
+        user = self.facade.get_user_by_id(self.user_id)
+        self.assertEqual(self.stats()['hits'], 1)
+        self.assertTrue(user.verify_password("secret"))
+
+    def test_no_stale_read_after_delete(self):
+        """Test that a deleted row is not served from cache."""
+        self.facade.get_user_by_id(self.user_id)
+        self.new_request()
+        self.facade.user_repository.delete(self.user_id)
+        self.new_request()
+        self.assertIsNone(self.facade.get_user_by_id(self.user_id))
+
+    def test_redis_backend(self):
+        """Test the Redis-compatible backend round-trips snapshots and honours invalidation."""
+        cache = self.app.extensions['repository_cache']
+        cache.backend = RedisCache(FakeRedis(), ttl=60)
+        self.new_request()
+        self.facade.get_user_by_id(self.user_id)
+        self.assertEqual(len(cache.backend.client.data), 1)
+        self.new_request()
+        self.facade.update_user(self.user_id, {"last_name": "Updated"})
+        self.assertEqual(cache.backend.client.data, {})
+        self.new_request()
+        self.assertEqual(self.facade.get_user_by_id(self.user_id).last_name, "Updated")
+
+    def test_metrics_endpoint_reports_cache_stats(self):
+        """Test that admins can read hit/miss counters from /api/v1/metrics/."""
+        self.facade.get_user_by_id(self.user_id)
+        token = create_access_token(identity=self.user_id, additional_claims={'is_admin': True})
+        response = self.app.test_client().get('/api/v1/metrics/', headers={'Authorization': f'Bearer {token}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['cache']['repositories']['User']['misses'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+import unittest
+from app import create_app, db
+from app.services.facade import get_facade
+from app.utils.query_counter import QueryCounter
+from config import TestingConfig
+
+class TestConditionalGet(unittest.TestCase):
+    def setUp(self):
+        """Seed a place with an owner, an amenity and a review."""
+        self.app = create_app(TestingConfig)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        self.facade = get_facade()
+        self.owner = self.create_user("owner")
+        self.reviewer = self.create_user("reviewer")
+        self.wifi = self.facade.amenity_repository.model("WiFi")
+        self.facade.amenity_repository.add(self.wifi)
+        self.place = self.facade.create_place({
+            "title": "Beach house", "description": "Sunny", "price": 80, "latitude": 10.0, "longitude": 20.0,
+            "owner_id": self.owner.id, "amenities": [self.wifi.id]
+        })["id"]
+        self.review = self.facade.create_review({"text": "Great", "rating": 5,
+                                                 "user_id": self.reviewer.id, "place_id": self.place})
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def create_user(self, name):
+        return self.facade.create_user({"first_name": name, "last_name": "User",
+                                        "email": f"{name}@example.com", "password": "secret"})
+
+    def remove_amenity(self):
+        place = self.facade.place_repository.get(self.place)
+        place.amenities.remove(self.wifi)
+        db.session.commit()
+
+    def etag(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.headers['ETag']
+
+    def assertNotModified(self, url, etag):
+        response = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+        self.assertEqual(response.headers['ETag'], etag)
+
+    def assertModified(self, url, etag):
+        response = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+    def test_unchanged_resources_answer_304(self):
+        """Test that each endpoint answers a matching If-None-Match with an empty 304."""
+        for url in (f'/api/v1/places/{self.place}', '/api/v1/places/', f'/api/v1/reviews/{self.review.id}',
+                    '/api/v1/reviews/', f'/api/v1/users/{self.owner.id}'):
+            with self.subTest(url=url):
+                etag = self.etag(url)
+                self.assertTrue(etag.startswith('"'))
+                self.assertNotModified(url, etag)
+
+    def test_304_skips_loading_and_serializing(self):
+        """Test that a revalidated place page costs the version queries only."""
+        url = '/api/v1/places/'
+        etag = self.etag(url)
+        with QueryCounter() as counter:
+            self.assertNotModified(url, etag)
+        # Page rows, then one statement for every relationship aggregate.
+        self.assertEqual(counter.count, 2)
+        self.assertFalse(any('description' in statement for statement in counter.statements))
+
+    def test_place_version_follows_its_relations(self):
+        """Test that changes to the place, its reviews, links, amenities, owner and reviewers change the ETag."""
+        url = f'/api/v1/places/{self.place}'
+        changes = [
+            lambda: self.facade.update_place(self.place, {"price": 90.0}),
+            lambda: self.facade.update_review(self.review.id, {"text": "Still great"}),
+            lambda: self.facade.update_user(self.reviewer.id, {"last_name": "Renamed"}),
+            lambda: self.facade.delete_review(self.review.id),
+            lambda: self.facade.amenity_repository.update(self.wifi.id, {"name": "Fast WiFi"}),
+            self.remove_amenity,
+            lambda: self.facade.update_user(self.owner.id, {"first_name": "Renamed"}),
+        ]
+        for change in changes:
+            etag = self.etag(url)
+            change()
+            self.assertModified(url, etag)
+
+    def test_embed_scopes_the_version(self):
+        """Test that related rows left out by ?embed= do not change the ETag."""
+        url = f'/api/v1/places/{self.place}?embed=amenities'
+        etag = self.etag(url)
+        self.facade.update_user(self.owner.id, {"first_name": "Renamed"})
+        self.assertNotModified(url, etag)
+
+    def test_list_version_follows_the_page(self):
+        """Test that the page ETag changes with updates and inserts, and that bad cursors are rejected."""
+        url = '/api/v1/reviews/?limit=1'
+        etag = self.etag(url)
+        self.facade.update_review(self.review.id, {"rating": 3})
+        self.assertModified(url, etag)
+        etag = self.etag(url)
+        self.facade.create_review({"text": "Fine", "rating": 4, "user_id": self.owner.id, "place_id": self.place})
+        self.assertModified(url, etag)
+        self.assertEqual(self.client.get('/api/v1/reviews/?cursor=bogus').status_code, 400)
+
+    def test_if_modified_since(self):
+        """Test that Last-Modified is honored when no If-None-Match is sent."""
+        url = f'/api/v1/reviews/{self.review.id}'
+        last_modified = self.client.get(url).headers['Last-Modified']
+        response = self.client.get(url, headers={'If-Modified-Since': last_modified})
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(url, headers={'If-Modified-Since': last_modified, 'If-None-Match': '"stale"'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_if_modified_since_ignored_for_pages(self):
+        """Test that a page losing a row is not reported unmodified by its unchanged newest date."""
+        other = self.facade.create_review({"text": "Fine", "rating": 4, "user_id": self.owner.id,
+                                           "place_id": self.place})
+        url = '/api/v1/reviews/?limit=10'
+        last_modified = self.client.get(url).headers['Last-Modified']
+        self.facade.delete_review(self.review.id if other.updated_at >= self.review.updated_at else other.id)
+        response = self.client.get(url, headers={'If-Modified-Since': last_modified})
+        self.assertEqual(response.status_code, 200)
+
+    def test_missing_resources_stay_404(self):
+        """Test that a missing resource answers 404 without validators."""
+        response = self.client.get('/api/v1/places/missing', headers={'If-None-Match': '*'})
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn('ETag', response.headers)
+
+if __name__ == '__main__':
+    unittest.main()
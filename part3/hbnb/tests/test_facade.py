@@ -0,0 +1,65 @@
+import unittest
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.persistence.cache import CachedRepository
+from app.persistence.hooks import register_repository_hook
+from app.persistence.metrics import InstrumentedRepository
+from app.services.facade import HBnBFacade, get_facade
+
+class TestFacadeWiring(unittest.TestCase):
+    def setUp(self):
+        """Create the app on an in-memory database with a fresh schema."""
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_facade_is_built_once_per_app(self):
+        """Test that every request sees the same facade and repositories."""
+        seen = []
+        for _ in range(2):
+            with self.app.test_request_context():
+                seen.append(get_facade())
+        self.assertIs(seen[0], seen[1])
+        self.assertIs(seen[0], self.app.extensions['facade'])
+        self.assertIsNot(get_facade(), create_app("config.TestingConfig").extensions['facade'])
+
+    def test_repositories_go_through_hooks(self):
+        """Test that metrics wrap the cache, which wraps the SQLAlchemy repository."""
+        repository = get_facade().place_repository
+        self.assertIsInstance(repository, InstrumentedRepository)
+        self.assertIsInstance(repository.repository, CachedRepository)
+        self.assertEqual(repository.model.__tablename__, 'Place')
+
+    def test_custom_hook(self):
+        """Test that hooks registered on the app apply to facades built afterwards."""
+        wrapped = []
+        register_repository_hook(self.app, lambda repository: wrapped.append(repository.model) or repository)
+        HBnBFacade()
+        self.assertEqual(len(wrapped), 4)
+
+    def test_metrics_report_repository_calls(self):
+        """Test that repository calls made by requests show up in /api/v1/metrics."""
+        user = get_facade().create_user({
+            "first_name": "Admin",
+            "last_name": "User",
+            "email": "admin@example.com",
+            "password": "secret",
+            "is_admin": True
+        })
+        self.client.get('/api/v1/places/missing')
+        token = create_access_token(identity=user.id, additional_claims={'is_admin': True})
+        response = self.client.get('/api/v1/metrics/', headers={'Authorization': f'Bearer {token}'})
+        repositories = response.get_json()['repositories']
+        self.assertEqual(repositories['User']['add']['calls'], 1)
+        self.assertEqual(repositories['Place']['get_version_with_relations']['calls'], 1)
+        self.assertEqual(repositories['Place']['get_version_with_relations']['errors'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
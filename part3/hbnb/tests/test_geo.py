@@ -0,0 +1,101 @@
+import unittest
+from app import create_app, db
+from app.services.facade import HBnBFacade
+from app.utils.geo import bounding_box, geohash_encode, geohash_prefix_ranges, haversine_km
+
+class TestGeoUtils(unittest.TestCase):
+    def test_geohash_encode_known_value(self):
+        """Test the encoder against the reference example from the geohash spec."""
+        self.assertEqual(geohash_encode(57.64911, 10.40744, 11), 'u4pruydqqvj')
+
+    def test_prefix_ranges_cover_points_in_box(self):
+        """Test that every point inside a bounding box falls in one of its prefix ranges."""
+        box = bounding_box(48.8566, 2.3522, 25)
+        ranges = geohash_prefix_ranges(*box)
+        for lat, lon in ((box[0], box[1]), (box[2], box[3]), (48.8566, 2.3522), (box[0], box[3])):
+            code = geohash_encode(lat, lon)
+            self.assertTrue(any(start <= code < end for start, end in ranges), (lat, lon))
+
+    def test_bounding_box_across_antimeridian(self):
+        """Test that a circle straddling 180 degrees yields a wrapped box covered on both sides."""
+        min_lat, min_lon, max_lat, max_lon = bounding_box(0.0, 179.9, 50)
+        self.assertGreater(min_lon, max_lon)
+        ranges = geohash_prefix_ranges(min_lat, min_lon, max_lat, max_lon)
+        for lon in (179.95, -179.95):
+            code = geohash_encode(0.1, lon)
+            self.assertTrue(any(start <= code < end for start, end in ranges))
+
+    def test_haversine_km(self):
+        """Test the vectorized distance against a known city pair (New York - Los Angeles)."""
+        distances = haversine_km(40.7128, -74.0060, [40.7128, 34.0522], [-74.0060, -118.2437])
+        self.assertAlmostEqual(distances[0], 0.0)
+        self.assertAlmostEqual(distances[1], 3936, delta=5)
+
+class TestPlaceGeoSearch(unittest.TestCase):
+    def setUp(self):
+        """Create places around Paris plus one far away."""
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.facade = HBnBFacade()
+        owner = self.facade.create_user({
+            "first_name": "Owner",
+            "last_name": "User",
+            "email": "owner@example.com",
+            "password": "secret"
+        })
+        self.ids = {}
+        for title, lat, lon in (("Louvre", 48.8606, 2.3376), ("Versailles", 48.8049, 2.1204),
+                                ("Orly", 48.7262, 2.3652), ("Lyon", 45.7640, 4.8357)):
+            place = self.facade.create_place({
+                "title": title,
+                "description": "A place",
+                "price": 100,
+                "latitude": lat,
+                "longitude": lon,
+                "owner_id": owner.id
+            })
+            self.ids[title] = place["id"]
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_geohash_maintained_on_update(self):
+        """Test that moving a place recomputes its geohash."""
+        self.facade.update_place(self.ids["Lyon"], {"latitude": 43.2965, "longitude": 5.3698})
+        place = self.facade.place_repository.get(self.ids["Lyon"])
+        self.assertEqual(place.geohash, geohash_encode(43.2965, 5.3698))
+
+    def test_nearby_returns_places_in_radius_nearest_first(self):
+        """Test GET /api/v1/places/nearby ordering, radius cut-off and distances."""
+        response = self.client.get('/api/v1/places/nearby?lat=48.8566&lon=2.3522&radius_km=20&embed=')
+        self.assertEqual(response.status_code, 200)
+        items = response.get_json()['items']
+        self.assertEqual([item['title'] for item in items], ["Louvre", "Orly", "Versailles"])
+        self.assertLess(items[0]['distance_km'], items[1]['distance_km'])
+        response = self.client.get('/api/v1/places/nearby?lat=48.8566&lon=2.3522&radius_km=5&limit=1&fields=title')
+        self.assertEqual([item['title'] for item in response.get_json()['items']], ["Louvre"])
+
+    def test_nearby_rejects_invalid_coordinates(self):
+        """Test that out-of-range or missing parameters return 400."""
+        self.assertEqual(self.client.get('/api/v1/places/nearby?lat=91&lon=0&radius_km=5').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/places/nearby?lat=0&lon=0').status_code, 400)
+
+    def test_within_bounding_box(self):
+        """Test GET /api/v1/places/within with the regular listing filters."""
+        url = '/api/v1/places/within?min_lat=48.7&min_lon=2.0&max_lat=48.9&max_lon=2.4&embed='
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(item['title'] for item in response.get_json()['items']),
+                         ["Louvre", "Orly", "Versailles"])
+        response = self.client.get(url.replace('min_lon=2.0', 'min_lon=2.3'))
+        self.assertEqual(sorted(item['title'] for item in response.get_json()['items']), ["Louvre", "Orly"])
+        self.assertEqual(self.client.get(
+            '/api/v1/places/within?min_lat=49&min_lon=2.0&max_lat=48&max_lon=2.4').status_code, 400)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+from datetime import datetime
+from app import create_app, db
+from app.persistence.pagination import encode_cursor, decode_cursor
+from app.services.facade import HBnBFacade
+
+class TestKeysetPagination(unittest.TestCase):
+    def setUp(self):
+        """Create the app on an in-memory database with a few places sharing timestamps."""
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.facade = HBnBFacade()
+        self.owner = self.facade.create_user({
+            "first_name": "Owner",
+            "last_name": "User",
+            "email": "owner@example.com",
+            "password": "secret"
+        })
+        same_instant = datetime(2024, 1, 1, 12, 0, 0)
+        self.place_ids = set()
+        for i in range(7):
+            place = self.facade.create_place({
+                "title": f"Place {i}",
+                "description": "A place",
+                "price": 10 + i,
+                "latitude": 10.0,
+                "longitude": 20.0,
+                "owner_id": self.owner.id
+            })
+            self.place_ids.add(place["id"])
+            # Several rows share a timestamp so the id tie-breaker is exercised.
+            self.facade.place_repository.update(place["id"], {"created_at": same_instant})
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_cursor_round_trip(self):
+        """Test that a cursor decodes back to the row's (created_at, id)."""
+        cursor = encode_cursor(self.owner)
+        self.assertEqual(decode_cursor(cursor), (self.owner.created_at, self.owner.id))
+        order = (('rating_average', True), ('id', True))
+        place = self.facade.place_repository.get(next(iter(self.place_ids)))
+        self.assertEqual(decode_cursor(encode_cursor(place, order), order), (0.0, place.id))
+
+    def test_invalid_cursor(self):
+        """Test that a malformed cursor is rejected."""
+        with self.assertRaises(ValueError):
+            decode_cursor("not-a-cursor")
+
+    def test_iter_pages_visits_every_row_once(self):
+        """Test that the page generator walks the whole table without duplicates."""
+        pages = list(self.facade.place_repository.iter_pages(3))
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        seen = [place.id for page in pages for place in page]
+        self.assertEqual(len(seen), len(set(seen)))
+        self.assertEqual(set(seen), self.place_ids)
+
+    def test_mixed_direction_order(self):
+        """Test that an order mixing directions pages through ties without gaps or repeats."""
+        order = (('created_at', False), ('id', True))
+        pages = list(self.facade.place_repository.iter_pages(2, order=order))
+        seen = [place.id for page in pages for place in page]
+        self.assertEqual(seen, sorted(self.place_ids, reverse=True))
+
+    def test_list_endpoint_follows_next_cursor(self):
+        """Test that GET /api/v1/places/ pages through every place via next_cursor."""
+        seen, cursor = [], None
+        while True:
+            url = '/api/v1/places/?limit=2' + (f'&cursor={cursor}' if cursor else '')
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            data = response.get_json()
+            self.assertLessEqual(len(data['items']), 2)
+            seen.extend(place['id'] for place in data['items'])
+            cursor = data['next_cursor']
+            if not cursor:
+                break
+        self.assertEqual(len(seen), len(self.place_ids))
+        self.assertEqual(set(seen), self.place_ids)
+
+    def test_list_endpoint_rejects_bad_parameters(self):
+        """Test that invalid limit or cursor values return 400."""
+        self.assertEqual(self.client.get('/api/v1/places/?limit=0').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/places/?cursor=garbage').status_code, 400)
+
+if __name__ == '__main__':
+    unittest.main()
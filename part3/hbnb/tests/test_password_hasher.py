@@ -0,0 +1,71 @@
+import unittest
+from app import create_app, db, bcrypt
+from app.services.facade import HBnBFacade
+from app.utils.password_hasher import PasswordHasher, PasswordHasherBusy
+
+class TestPasswordHasher(unittest.TestCase):
+    def test_inline_round_trip(self):
+        """Test hashing and verifying on the calling thread."""
+        hasher = PasswordHasher(rounds=4)
+        password_hash = hasher.hash("secret")
+        self.assertTrue(password_hash.startswith("$2b$04$"))
+        self.assertTrue(hasher.verify(password_hash, "secret"))
+        self.assertFalse(hasher.verify(password_hash, "wrong"))
+
+    def test_accepts_existing_flask_bcrypt_hashes(self):
+        """Test that hashes stored before the pool existed still verify."""
+        legacy_hash = bcrypt.generate_password_hash("secret", 4).decode('utf-8')
+        self.assertTrue(PasswordHasher(rounds=4).verify(legacy_hash, "secret"))
+
+    def test_process_pool_round_trip(self):
+        """Test hashing and verifying on worker processes."""
+        hasher = PasswordHasher(rounds=4, workers=1)
+        try:
+            password_hash = hasher.hash("secret")
+            self.assertTrue(hasher.verify(password_hash, "secret"))
+        finally:
+            hasher.shutdown()
+
+    def test_raises_busy_when_queue_is_full(self):
+        """Test that work beyond max_pending is rejected rather than queued."""
+        hasher = PasswordHasher(rounds=4, workers=1, max_pending=1)
+        hasher._slots.acquire()
+        with self.assertRaises(PasswordHasherBusy):
+            hasher.hash("secret")
+
+class TestLoginBackpressure(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        HBnBFacade().create_user({
+            "first_name": "Login",
+            "last_name": "User",
+            "email": "login@example.com",
+            "password": "secret"
+        })
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_login_succeeds(self):
+        """Test that login verifies through the hasher."""
+        response = self.client.post('/api/v1/auth/login', json={"email": "login@example.com", "password": "secret"})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('access_token', response.get_json())
+
+    def test_login_returns_503_when_saturated(self):
+        """Test that a saturated hashing pool sheds logins with 503 and Retry-After."""
+        hasher = PasswordHasher(rounds=4, workers=1, max_pending=1)
+        hasher._slots.acquire()
+        self.app.extensions['password_hasher'] = hasher
+        response = self.client.post('/api/v1/auth/login', json={"email": "login@example.com", "password": "secret"})
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers.get('Retry-After'), '1')
+
+if __name__ == '__main__':
+    unittest.main()
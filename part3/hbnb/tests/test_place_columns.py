@@ -0,0 +1,95 @@
+import unittest
+from app import create_app, db
+from app.models.place import Place
+from app.services.facade import HBnBFacade, get_facade
+from app.utils.query_counter import QueryCounter
+from config import TestingConfig
+
+class ColumnIndexConfig(TestingConfig):
+    PLACE_COLUMN_INDEX = True
+
+class TestPlaceColumnIndex(unittest.TestCase):
+    def setUp(self):
+        """Seed places with varied prices, owners, amenities and ratings."""
+        self.app = create_app(ColumnIndexConfig)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.facade = get_facade()
+        self.index = self.app.extensions['place_column_index']
+        self.owners = [self.create_user(f"owner{i}") for i in range(2)]
+        self.reviewer = self.create_user("reviewer")
+        self.wifi = self.facade.amenity_repository.model("WiFi")
+        self.facade.amenity_repository.add(self.wifi)
+        self.places = []
+        for i in range(12):
+            place = self.facade.create_place({
+                "title": f"Place {i}", "description": "A place", "price": 10 + (i * 7) % 50,
+                "latitude": -60.0 + i * 10, "longitude": -170.0 + i * 30,
+                "owner_id": self.owners[i % 2].id, "amenities": [self.wifi.id] if i % 3 == 0 else []
+            })
+            if i % 4:
+                self.review(place["id"], 1 + i % 5)
+            self.places.append(place["id"])
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def create_user(self, name):
+        return self.facade.create_user({"first_name": name, "last_name": "User",
+                                        "email": f"{name}@example.com", "password": "secret"})
+
+    def review(self, place_id, rating):
+        return self.facade.create_review({"text": "Review", "rating": rating,
+                                          "user_id": self.reviewer.id, "place_id": place_id})
+
+    def all_pages(self, repository, filters, sort, limit=5):
+        ids, cursor = [], None
+        while True:
+            places, cursor = repository.get_page_with_relations(
+                limit, cursor, fields=('title',), embed=(), filters=filters, order=Place.SORT_ORDERS[sort])
+            ids.extend(place.id for place in places)
+            if cursor is None:
+                return ids
+
+    def test_pages_match_sql(self):
+        """Test that every filter and sort returns the same pages as the SQL path."""
+        sql = HBnBFacade(hooks=()).place_repository
+        self.assertIsNone(sql.column_index)
+        cases = [{}, {'max_price': 30}, {'min_price': 20, 'max_price': 40}, {'owner_id': self.owners[1].id},
+                 {'amenities': (self.wifi.id,)}, {'min_rating': 3}, {'max_rating': 2.5},
+                 {'owner_id': 'missing'}, {'bbox': (-50.0, 100.0, 60.0, -100.0)}]
+        for filters in cases:
+            for sort in Place.SORT_ORDERS:
+                # Small pages cut through runs of equal ratings, exercising the tie-breaking.
+                for limit in (2, 5):
+                    with self.subTest(filters=filters, sort=sort, limit=limit):
+                        self.assertEqual(self.all_pages(self.facade.place_repository, filters, sort, limit),
+                                         self.all_pages(sql, filters, sort, limit))
+
+    def test_writes_are_reflected(self):
+        """Test that updates, deletes and rating changes reach the arrays before the next page."""
+        cheap = lambda: self.all_pages(self.facade.place_repository, {'max_price': 10}, 'created_at')
+        self.assertEqual(cheap(), [self.places[0]])
+        self.facade.update_place(self.places[5], {'price': 5.0})
+        self.assertEqual(cheap(), [self.places[0], self.places[5]])
+        self.facade.delete_place(self.places[0])
+        self.assertEqual(cheap(), [self.places[5]])
+        rated = lambda: self.all_pages(self.facade.place_repository, {'min_rating': 5}, 'rating')
+        self.assertNotIn(self.places[8], rated())
+        self.review(self.places[8], 5)
+        self.assertIn(self.places[8], rated())
+
+    def test_page_reads_only_the_page_from_sql(self):
+        """Test that once loaded, a filtered page costs one primary-key query."""
+        self.index.sync()
+        with QueryCounter() as counter:
+            places, _ = self.facade.place_repository.get_page_with_relations(
+                3, fields=('title',), embed=(), filters={'max_price': 40})
+        self.assertEqual(len(places), 3)
+        self.assertEqual(counter.count, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.services.facade import get_facade
+from app.utils.query_counter import QueryCounter
+from config import TestingConfig
+
+class TestPlaceReviews(unittest.TestCase):
+    def setUp(self):
+        """Create a place with five reviews by five different users."""
+        self.app = create_app(TestingConfig)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        self.facade = get_facade()
+        users = [self.facade.create_user({"first_name": f"User{i}", "last_name": "Test",
+                                          "email": f"user{i}@example.com", "password": "secret"})
+                 for i in range(6)]
+        self.owner, self.reviewers = users[0], users[1:]
+        self.place = self.facade.create_place({"title": "Loft", "description": "Bright", "price": 80,
+                                               "latitude": 10.0, "longitude": 20.0, "owner_id": self.owner.id})["id"]
+        self.reviews = [self.facade.create_review({"text": f"Review {i}", "rating": rating, "user_id": user.id,
+                                                   "place_id": self.place})
+                        for i, (rating, user) in enumerate(zip((3, 5, 1, 5, 4), self.reviewers))]
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def read_all(self, url):
+        """Follow next_cursor from `url` to the last page; return the reviews and the page count."""
+        items, pages, cursor = [], 0, None
+        while True:
+            response = self.client.get(url + (f'&cursor={cursor}' if cursor else ''))
+            self.assertEqual(response.status_code, 200)
+            body = response.get_json()
+            items.extend(body['items'])
+            pages += 1
+            cursor = body['next_cursor']
+            if cursor is None:
+                return items, pages
+
+    def test_pages_by_date(self):
+        """Test that the reviews come oldest first, two per page, with their author names."""
+        expected = sorted(self.reviews, key=lambda review: (review.created_at, review.id))
+        items, pages = self.read_all(f'/api/v1/places/{self.place}/reviews?limit=2')
+        self.assertEqual(pages, 3)
+        self.assertEqual([review['id'] for review in items], [review.id for review in expected])
+        self.assertEqual(items[0]['user_name'], expected[0].user.display_name)
+
+    def test_pages_by_rating(self):
+        """Test that sort=rating returns the best reviews first, ties by descending id."""
+        expected = sorted(self.reviews, key=lambda review: (review.rating, review.id), reverse=True)
+        items, _ = self.read_all(f'/api/v1/places/{self.place}/reviews?limit=2&sort=rating')
+        self.assertEqual([review['id'] for review in items], [review.id for review in expected])
+        self.assertEqual([review['rating'] for review in items], [5, 5, 4, 3, 1])
+
+    def test_page_queries_do_not_grow(self):
+        """Test that a page costs the same queries, and the page revalidates with its ETag."""
+        url = f'/api/v1/places/{self.place}/reviews?limit=2'
+        db.session.expire_all()
+        with QueryCounter() as counter:
+            response = self.client.get(url)
+        # Place existence, the version probe, then the page with the authors joined in.
+        self.assertEqual(counter.count, 3)
+        revalidated = self.client.get(url, headers={'If-None-Match': response.headers['ETag']})
+        self.assertEqual(revalidated.status_code, 304)
+        self.reviewers[0].first_name = 'Renamed'
+        db.session.commit()
+        self.assertEqual(self.client.get(url, headers={'If-None-Match': response.headers['ETag']}).status_code, 200)
+
+    def test_errors(self):
+        """Test the unknown place, bad cursor and unknown sort responses."""
+        self.assertEqual(self.client.get('/api/v1/places/missing/reviews').status_code, 404)
+        self.assertEqual(self.client.get(f'/api/v1/places/{self.place}/reviews?cursor=bogus').status_code, 400)
+        self.assertEqual(self.client.get(f'/api/v1/places/{self.place}/reviews?sort=text').status_code, 400)
+
+    def test_duplicate_review_probe(self):
+        """Test that the duplicate check is one query, and that a second review is refused."""
+        reviewer_id = self.reviewers[0].id
+        with QueryCounter() as counter:
+            self.assertTrue(self.facade.has_reviewed(reviewer_id, self.place))
+        self.assertEqual(counter.count, 1)
+        self.assertFalse(self.facade.has_reviewed(self.owner.id, self.place))
+        token = create_access_token(identity=reviewer_id)
+        response = self.client.post('/api/v1/reviews/', json={"text": "Again", "rating": 2, "place_id": self.place},
+                                    headers={'Authorization': f'Bearer {token}'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()['error'], 'You have already reviewed this place.')
+        token = create_access_token(identity=self.owner.id)
+        response = self.client.post('/api/v1/reviews/', json={"text": "Mine", "rating": 5, "place_id": self.place},
+                                    headers={'Authorization': f'Bearer {token}'})
+        self.assertEqual(response.get_json()['error'], 'You cannot review your own place.')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,165 @@
+import unittest
+from app import create_app, db
+from app.services.facade import HBnBFacade
+from app.utils.query_counter import QueryCounter
+
+class TestPlaceListing(unittest.TestCase):
+    def setUp(self):
+        """Create the app on an in-memory database with a fresh schema."""
+        self.app = create_app("config.TestingConfig")
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.facade = HBnBFacade()
+        self.owner = self.facade.create_user({
+            "first_name": "Owner",
+            "last_name": "User",
+            "email": "owner@example.com",
+            "password": "secret"
+        })
+        self.reviewer = self.facade.create_user({
+            "first_name": "Reviewer",
+            "last_name": "User",
+            "email": "reviewer@example.com",
+            "password": "secret"
+        })
+        self.amenity = self.facade.amenity_repository.model("WiFi")
+        self.facade.amenity_repository.add(self.amenity)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def seed_places(self, count):
+        for i in range(count):
+            place = self.facade.create_place({
+                "title": f"Place {i}",
+                "description": "A place",
+                "price": 10 + i,
+                "latitude": 10.0,
+                "longitude": 20.0,
+                "owner_id": self.owner.id,
+                "amenities": [self.amenity.id]
+            })
+            self.facade.create_review({
+                "text": "Nice",
+                "rating": 4,
+                "user_id": self.reviewer.id,
+                "place_id": place["id"]
+            })
+        db.session.expire_all()
+
+    def count_listing_queries(self):
+        db.session.expire_all()
+        with QueryCounter() as counter:
+            places = self.facade.get_all_places()
+        return counter.count, places
+
+    def test_get_all_places_includes_relations(self):
+        """Test that the listing embeds owner, amenities and reviews."""
+        self.seed_places(2)
+        _, places = self.count_listing_queries()
+        self.assertEqual(len(places), 2)
+        for place in places:
+            self.assertEqual(place['owner']['id'], self.owner.id)
+            self.assertEqual(place['amenities'], [{'id': self.amenity.id, 'name': 'WiFi'}])
+            self.assertEqual(len(place['reviews']), 1)
+            self.assertEqual(place['reviews'][0]['user_id'], self.reviewer.id)
+            self.assertEqual(place['reviews'][0]['user_name'], 'Reviewer User')
+
+    def test_get_all_places_query_count_is_constant(self):
+        """Test that listing places issues the same number of queries regardless of N."""
+        self.seed_places(3)
+        small_count, _ = self.count_listing_queries()
+        self.seed_places(30)
+        large_count, places = self.count_listing_queries()
+        self.assertEqual(len(places), 33)
+        self.assertEqual(small_count, large_count)
+
+    def test_reviewer_names_do_not_add_queries(self):
+        """Test that a place's reviews carry their reviewer's name at a constant query count."""
+        place = self.facade.create_place({"title": "Busy", "description": "A place", "price": 10, "latitude": 10.0,
+                                          "longitude": 20.0, "owner_id": self.owner.id})
+        counts = []
+        for batch in range(2):
+            for i in range(5 * batch, 5 * batch + 5):
+                reviewer = self.facade.create_user({"first_name": f"Guest{i}", "last_name": "User",
+                                                    "email": f"guest{i}@example.com", "password": "secret"})
+                self.facade.create_review({"text": "Nice", "rating": 4, "user_id": reviewer.id,
+                                           "place_id": place["id"]})
+            db.session.expire_all()
+            with QueryCounter() as counter:
+                reviews = self.facade.get_place(place["id"])['reviews']
+            counts.append(counter.count)
+        self.assertEqual(sorted(review['user_name'] for review in reviews), [f"Guest{i} User" for i in range(10)])
+        self.assertEqual(counts[0], counts[1])
+
+    def test_sparse_fieldset_selects_only_requested_columns(self):
+        """Test that ?fields= limits the SELECTed columns and skips unrequested relations."""
+        self.seed_places(3)
+        db.session.expire_all()
+        with QueryCounter() as counter:
+            places = self.facade.get_all_places(fields=('title', 'price'), embed=())
+        self.assertEqual(counter.count, 1)
+        self.assertNotIn('description', counter.statements[0])
+        self.assertEqual(set(places[0]), {'id', 'title', 'price'})
+
+    def test_embed_loads_only_requested_relations(self):
+        """Test that ?embed=owner joins the owner without touching reviews or amenities."""
+        self.seed_places(3)
+        db.session.expire_all()
+        with QueryCounter() as counter:
+            places = self.facade.get_all_places(embed=('owner',))
+        self.assertEqual(counter.count, 1)
+        self.assertFalse(any('Review' in statement for statement in counter.statements))
+        self.assertEqual(places[0]['owner']['id'], self.owner.id)
+        self.assertNotIn('reviews', places[0])
+        self.assertNotIn('amenities', places[0])
+
+    def test_fieldset_query_parameters(self):
+        """Test ?fields= and ?embed= on the place endpoints, including invalid names."""
+        self.seed_places(1)
+        client = self.app.test_client()
+        response = client.get('/api/v1/places/?fields=title,latitude,longitude&embed=')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.get_json()['items'][0]), {'id', 'title', 'latitude', 'longitude'})
+        place_id = response.get_json()['items'][0]['id']
+        response = client.get(f'/api/v1/places/{place_id}?fields=price&embed=amenities')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.get_json()), {'id', 'price', 'amenities'})
+        self.assertEqual(client.get('/api/v1/places/?fields=password').status_code, 400)
+        self.assertEqual(client.get('/api/v1/places/?embed=owner,secrets').status_code, 400)
+
+    def test_filters_are_applied_in_sql(self):
+        """Test price, owner, amenity and rating filters on the listing."""
+        self.seed_places(5)  # prices 10..14, all with WiFi and a 4-star review
+        other = self.facade.create_place({
+            "title": "Other owner",
+            "description": "A place",
+            "price": 12,
+            "latitude": 0.0,
+            "longitude": 0.0,
+            "owner_id": self.reviewer.id
+        })
+        titles = lambda places: sorted(place['title'] for place in places)
+        filtered = self.facade.get_all_places(embed=(), filters={'min_price': 11, 'max_price': 13})
+        self.assertEqual(titles(filtered), ['Other owner', 'Place 1', 'Place 2', 'Place 3'])
+        filtered = self.facade.get_all_places(embed=(), filters={'owner_id': self.reviewer.id})
+        self.assertEqual([place['id'] for place in filtered], [other['id']])
+        filtered = self.facade.get_all_places(embed=(), filters={'amenities': (self.amenity.id,), 'max_price': 11})
+        self.assertEqual(titles(filtered), ['Place 0', 'Place 1'])
+        self.assertEqual(len(self.facade.get_all_places(embed=(), filters={'min_rating': 4})), 5)
+        self.assertEqual(self.facade.get_all_places(embed=(), filters={'min_rating': 4.5}), [])
+
+    def test_filter_query_parameters(self):
+        """Test that the listing endpoint forwards filters and validates their types."""
+        self.seed_places(5)
+        client = self.app.test_client()
+        response = client.get(f'/api/v1/places/?max_price=11&amenity={self.amenity.id}&embed=')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(place['price'] for place in response.get_json()['items']), [10.0, 11.0])
+        self.assertEqual(client.get('/api/v1/places/?min_price=cheap').status_code, 400)
+
+if __name__ == '__main__':
+    unittest.main()
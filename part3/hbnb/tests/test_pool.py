@@ -0,0 +1,93 @@
+import os
+import tempfile
+import threading
+import unittest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import exc, text
+from app import create_app, db
+from app.persistence.pool import TimedQueuePool, engine_options, get_pool_monitor
+from config import TestingConfig
+
+class TestPoolOptions(unittest.TestCase):
+    def options(self, url, **settings):
+        return engine_options(dict(vars(TestingConfig), SQLALCHEMY_DATABASE_URI=url, **settings))
+
+    def test_engine_options_follow_the_database(self):
+        """Test that sizing applies to real pools only, and timeouts use the backend's own setting."""
+        memory = self.options('sqlite://')
+        self.assertNotIn('pool_size', memory)
+        self.assertTrue(memory['pool_pre_ping'])
+        file_options = self.options('sqlite:////tmp/hbnb.db', DB_POOL_SIZE=5, DB_MAX_OVERFLOW=7)
+        self.assertIs(file_options['poolclass'], TimedQueuePool)
+        self.assertEqual((file_options['pool_size'], file_options['max_overflow']), (5, 7))
+        mysql = self.options('mysql+pymysql://u:p@localhost/hbnb', DB_STATEMENT_TIMEOUT_MS=2000)
+        self.assertEqual(mysql['connect_args'], {'init_command': 'SET SESSION max_execution_time=2000'})
+        explicit = self.options('sqlite:////tmp/hbnb.db', SQLALCHEMY_ENGINE_OPTIONS={'pool_size': 1})
+        self.assertEqual(explicit['pool_size'], 1)
+
+class TestPoolMonitor(unittest.TestCase):
+    def setUp(self):
+        """Run the app on a SQLite file with a pool of one connection and no overflow."""
+        handle, self.path = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+
+        class FileConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = f'sqlite:///{self.path}'
+            DB_POOL_SIZE = 1
+            DB_MAX_OVERFLOW = 0
+            DB_POOL_TIMEOUT = 1
+            DB_STATEMENT_TIMEOUT_MS = 100
+        self.app = create_app(FileConfig)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+        self.ctx.pop()
+        os.remove(self.path)
+
+    def test_stats_and_exhaustion(self):
+        """Test that checkouts, in-use connections and timeouts are counted."""
+        monitor = get_pool_monitor()
+        db.session.execute(text('SELECT 1'))
+        stats = monitor.stats()
+        self.assertEqual((stats['pool'], stats['size'], stats['in_use']), ('TimedQueuePool', 1, 1))
+        engine, errors = db.engine, []
+
+        def checkout():
+            try:
+                engine.connect().close()
+            except exc.TimeoutError as e:
+                errors.append(e)
+        thread = threading.Thread(target=checkout)
+        thread.start()
+        thread.join()
+        self.assertEqual(len(errors), 1)
+        db.session.remove()
+        stats = monitor.stats()
+        self.assertEqual((stats['in_use'], stats['timeouts'], stats['peak_in_use']), (0, 1, 1))
+        self.assertGreaterEqual(stats['checkout_wait_ms']['max'], 1000)
+
+    def test_sqlite_statement_timeout(self):
+        """Test that a runaway statement is interrupted and the connection stays usable."""
+        runaway = text('WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) SELECT max(i) FROM n')
+        with self.assertRaises(exc.OperationalError) as raised:
+            db.session.execute(runaway)
+        self.assertIn('interrupted', str(raised.exception))
+        db.session.rollback()
+        self.assertEqual(db.session.execute(text('SELECT 1')).scalar(), 1)
+
+    def test_metrics_endpoint(self):
+        """Test that /api/v1/metrics reports the pool."""
+        token = create_access_token(identity='admin', additional_claims={'is_admin': True})
+        response = self.app.test_client().get('/api/v1/metrics/', headers={'Authorization': f'Bearer {token}'})
+        self.assertEqual(response.status_code, 200)
+        pool = response.get_json()['db_pool']
+        self.assertEqual(pool['pool'], 'TimedQueuePool')
+        self.assertGreater(pool['checkouts'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+import unittest
+from sqlalchemy import update
+from app import create_app, db
+from app.models.review import Review
+from app.services.facade import HBnBFacade
+from app.utils.query_counter import QueryCounter
+
+class TestRatingAggregates(unittest.TestCase):
+    def setUp(self):
+        """Create an owner, three reviewers and two places."""
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.facade = HBnBFacade()
+        owner = self.create_user("owner")
+        self.reviewers = [self.create_user(f"reviewer{i}") for i in range(3)]
+        self.places = [self.facade.create_place({
+            "title": title,
+            "description": "A place",
+            "price": 50,
+            "latitude": 1.0,
+            "longitude": 1.0,
+            "owner_id": owner.id
+        })["id"] for title in ("First", "Second")]
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def create_user(self, name):
+        return self.facade.create_user({
+            "first_name": name,
+            "last_name": "User",
+            "email": f"{name}@example.com",
+            "password": "secret"
+        })
+
+    def review(self, reviewer, place_id, rating):
+        return self.facade.create_review({
+            "text": "Review",
+            "rating": rating,
+            "user_id": reviewer.id,
+            "place_id": place_id
+        })
+
+    def aggregates(self, place_id):
+        place = self.facade.get_place(place_id, fields=('review_count', 'rating_sum', 'rating_average',
+                                                        'rating_histogram'), embed=())
+        del place['id']
+        return place
+
+    def test_aggregates_follow_create_update_delete(self):
+        """Test that the counters track every review change without rescanning."""
+        first = self.review(self.reviewers[0], self.places[0], 5)
+        self.review(self.reviewers[1], self.places[0], 2)
+        self.assertEqual(self.aggregates(self.places[0]), {
+            'review_count': 2, 'rating_sum': 7, 'rating_average': 3.5,
+            'rating_histogram': {'1': 0, '2': 1, '3': 0, '4': 0, '5': 1}
+        })
+        with QueryCounter() as counter:
+            self.facade.update_review(first.id, {"rating": 3})
+        self.assertFalse(any('count(' in statement.lower() for statement in counter.statements))
+        self.assertEqual(self.aggregates(self.places[0])['rating_histogram'],
+                         {'1': 0, '2': 1, '3': 1, '4': 0, '5': 0})
+        self.assertEqual(self.aggregates(self.places[0])['rating_sum'], 5)
+        self.facade.delete_review(first.id)
+        self.assertEqual(self.aggregates(self.places[0])['review_count'], 1)
+        self.assertEqual(self.aggregates(self.places[0])['rating_average'], 2.0)
+
+    def test_delete_subtracts_current_rating(self):
+        """Test that deleting a review subtracts the stored rating, not a stale cached one."""
+        review_id = self.review(self.reviewers[0], self.places[0], 5).id
+        db.session.remove()
+        self.facade.get_review(review_id)
+        db.session.remove()
+        # Another worker re-rates the review; this process's cache still holds 5.
+        db.session.execute(update(Review).where(Review.id == review_id).values(rating=2))
+        self.facade.place_repository.apply_rating_change(self.places[0], added=2, removed=5)
+        db.session.commit()
+        db.session.remove()
+        self.assertEqual(self.facade.get_review(review_id).rating, 5)
+        self.facade.delete_review(review_id)
+        self.assertEqual(self.aggregates(self.places[0]), {
+            'review_count': 0, 'rating_sum': 0, 'rating_average': 0.0,
+            'rating_histogram': {'1': 0, '2': 0, '3': 0, '4': 0, '5': 0}
+        })
+
+    def test_update_rejects_invalid_rating(self):
+        """Test that an out-of-range rating cannot corrupt the histogram."""
+        review = self.review(self.reviewers[0], self.places[0], 4)
+        with self.assertRaises(ValueError):
+            self.facade.update_review(review.id, {"rating": 7})
+
+    def test_sort_by_rating(self):
+        """Test ?sort=rating orders best-rated first and pages with next_cursor."""
+        self.review(self.reviewers[0], self.places[0], 2)
+        self.review(self.reviewers[0], self.places[1], 5)
+        response = self.client.get('/api/v1/places/?sort=rating&limit=1&embed=')
+        data = response.get_json()
+        self.assertEqual(data['items'][0]['id'], self.places[1])
+        response = self.client.get(f"/api/v1/places/?sort=rating&limit=1&embed=&cursor={data['next_cursor']}")
+        self.assertEqual(response.get_json()['items'][0]['id'], self.places[0])
+        self.assertEqual(self.client.get('/api/v1/places/?sort=price').status_code, 400)
+
+    def test_rebuild_repairs_drift(self):
+        """Test that the rebuild command recomputes aggregates from the reviews."""
+        self.review(self.reviewers[0], self.places[0], 4)
+        self.review(self.reviewers[1], self.places[0], 5)
+        self.facade.place_repository.update(self.places[0], {"review_count": 40, "rating_sum": 1})
+        # A place whose last review is gone but whose counters were not moved back.
+        emptied = self.facade.create_place({
+            "title": "Third", "description": "A place", "price": 50, "latitude": 1.0, "longitude": 1.0,
+            "owner_id": self.reviewers[2].id
+        })["id"]
+        self.facade.place_repository.update(emptied, {"review_count": 1, "rating_sum": 3, "rating_count_3": 1})
+        db.session.remove()
+        self.assertEqual(self.facade.place_repository.get(self.places[0]).review_count, 40)  # Now cached
+        untouched = self.facade.place_repository.get(self.places[1]).updated_at
+        result = self.app.test_cli_runner().invoke(args=['rebuild-ratings'])
+        self.assertIn('repaired 2 place(s)', result.output)
+        db.session.expire_all()
+        self.assertEqual(self.facade.place_repository.get(self.places[0]).review_count, 2)
+        self.assertEqual(self.facade.place_repository.get(self.places[1]).updated_at, untouched)
+        self.assertEqual(self.aggregates(self.places[0]), {
+            'review_count': 2, 'rating_sum': 9, 'rating_average': 4.5,
+            'rating_histogram': {'1': 0, '2': 0, '3': 0, '4': 1, '5': 1}
+        })
+        self.assertEqual(self.aggregates(self.places[1])['review_count'], 0)
+        self.assertEqual(self.aggregates(emptied)['rating_histogram']['3'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from contextlib import contextmanager
+from sqlalchemy import exc
+from app import create_app, db
+from app.persistence.cache import get_repository_cache
+from app.persistence.replicas import get_replica_router
+from app.services.facade import get_facade
+from config import TestingConfig
+
+class TestReplicaRouting(unittest.TestCase):
+    def setUp(self):
+        """Run the app on a primary SQLite file with a second file standing in for its replica."""
+        self.paths = []
+        for _ in range(2):
+            handle, path = tempfile.mkstemp(suffix='.db')
+            os.close(handle)
+            self.paths.append(path)
+        primary, replica = self.paths
+
+        class ReplicaConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = f'sqlite:///{primary}'
+            DB_REPLICA_URIS = [f'sqlite:///{replica}']
+            DB_REPLICA_LAG_CHECK_INTERVAL = 0
+            PLACE_COLUMN_INDEX = True
+        self.app = create_app(ReplicaConfig)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.facade = get_facade()
+        self.router = get_replica_router()
+        owner = self.facade.create_user({"first_name": "Owner", "last_name": "User",
+                                         "email": "owner@example.com", "password": "secret"})
+        self.owner_id = owner.id
+        self.place = self.facade.create_place({
+            "title": "Old title", "description": "Sunny", "price": 80, "latitude": 10.0, "longitude": 20.0,
+            "owner_id": owner.id
+        })["id"]
+        self.replicate()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+        self.router.dispose()
+        self.ctx.pop()
+        for path in self.paths:
+            os.remove(path)
+
+    def replicate(self):
+        """Copy the primary file over the replica, as replication catching up would."""
+        db.session.remove()
+        source, target = (sqlite3.connect(path) for path in self.paths)
+        with source, target:
+            source.backup(target)
+        source.close()
+        target.close()
+
+    def rename(self, title):
+        self.facade.update_place(self.place, {"title": title})
+        db.session.remove()
+
+    @contextmanager
+    def request(self, method='GET'):
+        """One request's worth of session: the session is discarded on exit, as at teardown."""
+        with self.app.test_request_context('/', method=method):
+            try:
+                yield
+            finally:
+                db.session.remove()
+
+    def title(self):
+        return self.facade.get_place(self.place, embed=())['title']
+
+    def test_get_reads_from_replica(self):
+        """Test that GET requests read the replica, and other methods the primary."""
+        self.rename("New title")
+        response = self.app.test_client().get(f'/api/v1/places/{self.place}')
+        db.session.remove()
+        self.assertEqual(response.get_json()['title'], "Old title")
+        with self.request('POST'):
+            self.assertEqual(self.title(), "New title")
+        cache = get_repository_cache().backend
+        cache.clear()
+        with self.request():
+            self.assertEqual(self.facade.user_repository.get(self.owner_id).first_name, "Owner")
+        self.assertEqual(cache.info()['size'], 0, "cache filled from a replica")
+        self.replicate()
+        with self.request():
+            self.assertEqual(self.title(), "New title")
+        self.assertGreater(self.router.stats()['replicas']['replica_0']['reads'], 0)
+
+    def test_read_your_writes(self):
+        """Test that once a request writes, its later reads go to the primary."""
+        with self.request():
+            self.assertEqual(self.title(), "Old title")
+            self.facade.update_place(self.place, {"title": "Written"})
+            self.assertEqual(self.title(), "Written")
+        with self.request():
+            self.assertEqual(self.title(), "Old title")
+
+    def test_indexes_sync_from_primary(self):
+        """Test that the search and column indexes re-read a changed place on the primary."""
+        client = self.app.test_client()
+
+        def ids(url):
+            response = client.get(f'/api/v1/places/{url}')
+            db.session.remove()
+            return [place['id'] for place in response.get_json()['items']]
+        self.assertEqual(ids('search?q=old'), [self.place])
+        self.assertEqual(ids('?min_price=500'), [])
+        self.facade.update_place(self.place, {"title": "Zanzibar", "price": 999})
+        db.session.remove()
+        self.assertEqual(ids('search?q=zanzibar'), [self.place])
+        self.assertEqual(ids('?min_price=500'), [self.place])
+        self.replicate()
+        self.assertEqual(ids('search?q=old'), [])
+        self.assertEqual(ids('?min_price=500'), [self.place])
+
+    def test_lag_guard(self):
+        """Test that a replica lagging past DB_REPLICA_MAX_LAG, or failing its probe, is skipped."""
+        self.rename("New title")
+        self.router.lag_probe = lambda connection: 60.0
+        with self.request():
+            self.assertEqual(self.title(), "New title")
+
+        def broken(connection):
+            raise exc.OperationalError('probe', {}, Exception('replica down'))
+        self.router.lag_probe = broken
+        with self.request():
+            self.assertEqual(self.title(), "New title")
+        stats = self.router.stats()
+        self.assertEqual(stats['primary_fallbacks'], 2)
+        self.assertEqual(stats['replicas']['replica_0']['probe_errors'], 1)
+        self.assertFalse(stats['replicas']['replica_0']['within_lag'])
+        self.router.lag_probe = lambda connection: 1.0
+        with self.request():
+            self.assertEqual(self.title(), "Old title")
+
+if __name__ == '__main__':
+    unittest.main()
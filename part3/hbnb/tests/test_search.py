@@ -0,0 +1,85 @@
+import unittest
+from app import create_app, db
+from app.services.facade import get_facade
+from config import TestingConfig
+
+class TestPlaceSearch(unittest.TestCase):
+    def setUp(self):
+        """Seed places whose titles, descriptions and reviews mention different words."""
+        self.app = create_app(TestingConfig)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.facade = get_facade()
+        self.owner = self.facade.create_user({"first_name": "Owner", "last_name": "User",
+                                              "email": "owner@example.com", "password": "secret"})
+        self.reviewer = self.facade.create_user({"first_name": "Reviewer", "last_name": "User",
+                                                 "email": "reviewer@example.com", "password": "secret"})
+        self.beach = self.create_place("Beach house", "Sunny terrace near the sea")
+        self.cabin = self.create_place("Mountain cabin", "Wooden cabin, close to the beach trail")
+        self.loft = self.create_place("City loft", "Quiet street downtown")
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def create_place(self, title, description):
+        return self.facade.create_place({"title": title, "description": description, "price": 50,
+                                         "latitude": 10.0, "longitude": 20.0, "owner_id": self.owner.id})["id"]
+
+    def review(self, place_id, text):
+        return self.facade.create_review({"text": text, "rating": 4,
+                                          "user_id": self.reviewer.id, "place_id": place_id})
+
+    def search(self, query, limit=10, cursor=None):
+        places, next_cursor = self.facade.search_places(query, limit, cursor, fields=('title',), embed=())
+        return [place["id"] for place in places], next_cursor
+
+    def test_title_matches_rank_first(self):
+        """Test that a word in the title outranks the same word in a description."""
+        self.assertEqual(self.search("beach")[0], [self.beach, self.cabin])
+        self.assertEqual(self.search("BEACH, cabin!")[0], [self.cabin, self.beach])
+        self.assertEqual(self.search("volcano"), ([], None))
+
+    def test_pagination_follows_the_ranking(self):
+        """Test that cursor pages concatenate to the full ranking, without repeats."""
+        for i in range(7):
+            self.create_place(f"Garden room {i}", "garden " * (i % 3 + 1))
+        expected, _ = self.search("garden", limit=50)
+        ids, cursor = [], None
+        while True:
+            page, cursor = self.search("garden", limit=2, cursor=cursor)
+            ids.extend(page)
+            if cursor is None:
+                break
+        self.assertEqual(len(expected), 7)
+        self.assertEqual(ids, expected)
+
+    def test_writes_are_reflected(self):
+        """Test that place and review writes are searchable before the next query."""
+        self.assertEqual(self.search("pancakes")[0], [])
+        review = self.review(self.loft, "Lovely host, the pancakes were great")
+        self.assertEqual(self.search("pancakes")[0], [self.loft])
+        self.facade.update_place(self.beach, {"title": "Pancakes shack"})
+        self.assertEqual(self.search("pancakes")[0], [self.beach, self.loft])
+        self.facade.delete_review(review.id)
+        self.facade.delete_place(self.beach)
+        self.assertEqual(self.search("pancakes")[0], [])
+
+    def test_search_endpoint(self):
+        """Test the query parameters and the response envelope of /places/search."""
+        client = self.app.test_client()
+        response = client.get('/api/v1/places/search?q=beach&limit=1&fields=title&embed=')
+        self.assertEqual(response.status_code, 200)
+        body = response.get_json()
+        self.assertEqual([place["id"] for place in body["items"]], [self.beach])
+        self.assertGreater(body["items"][0]["score"], 0)
+        response = client.get(f'/api/v1/places/search?q=beach&limit=1&cursor={body["next_cursor"]}')
+        self.assertEqual([place["id"] for place in response.get_json()["items"]], [self.cabin])
+        self.assertEqual(client.get('/api/v1/places/search').status_code, 400)
+        self.assertEqual(client.get('/api/v1/places/search?q=+').status_code, 400)
+        self.assertEqual(client.get('/api/v1/places/search?q=beach&cursor=bogus').status_code, 400)
+
+if __name__ == '__main__':
+    unittest.main()
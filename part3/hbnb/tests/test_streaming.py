@@ -0,0 +1,77 @@
+import gzip
+import json
+import unittest
+from app import create_app, db
+from app.api.v1.streaming import encode_page_stream
+from app.services.facade import get_facade
+from config import TestingConfig
+
+class TestStreamingAndCompression(unittest.TestCase):
+    def setUp(self):
+        """Seed enough places for list responses to cross the compression threshold."""
+        self.app = create_app(TestingConfig)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        self.facade = get_facade()
+        self.owner = self.facade.create_user({"first_name": "Owner", "last_name": "User",
+                                              "email": "owner@example.com", "password": "secret"})
+        self.places = [self.facade.create_place({
+            "title": f"Place {i}", "description": "A quiet place with a view " * 3, "price": 10 + i,
+            "latitude": 10.0, "longitude": 20.0, "owner_id": self.owner.id
+        })["id"] for i in range(30)]
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_encode_page_stream_chunks(self):
+        """Test that the streamed envelope is valid JSON whatever the chunk boundaries."""
+        items = [{"id": i, "name": "é" * (i % 7)} for i in range(100)]
+        chunks = list(encode_page_stream(iter(items), chunk_size=50))
+        self.assertGreater(len(chunks), 10)
+        self.assertEqual(json.loads(b''.join(chunks)), {"items": items, "next_cursor": None})
+        self.assertEqual(json.loads(b''.join(encode_page_stream(iter(())))), {"items": [], "next_cursor": None})
+
+    def test_export_streams_every_matching_place(self):
+        """Test that /places/export returns all matching places in listing order, with filters."""
+        response = self.client.get('/api/v1/places/export?fields=title,price&embed=owner')
+        self.assertTrue(response.is_streamed)
+        items = response.get_json()["items"]
+        self.assertEqual([place["id"] for place in items], self.places)
+        self.assertEqual(items[0]["owner"]["id"], self.owner.id)
+        self.assertNotIn("description", items[0])
+        response = self.client.get('/api/v1/places/export?max_price=14&sort=created_at')
+        self.assertEqual([place["id"] for place in response.get_json()["items"]], self.places[:5])
+        self.assertEqual(self.client.get('/api/v1/places/export?fields=password').status_code, 400)
+
+    def test_export_is_gzip_compressed_when_accepted(self):
+        """Test that the stream is gzip-encoded on request and decodes to the same document."""
+        plain = self.client.get('/api/v1/places/export').data
+        response = self.client.get('/api/v1/places/export', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+        self.assertEqual(gzip.decompress(response.data), plain)
+        self.assertLess(len(response.data), len(plain))
+
+    def test_buffered_responses_are_compressed(self):
+        """Test that large JSON responses are compressed with their own ETag, and small ones are not."""
+        url = '/api/v1/places/?fields=title,description'
+        plain = self.client.get(url)
+        response = self.client.get(url, headers={'Accept-Encoding': 'br;q=0, gzip'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.data), plain.data)
+        etag = response.headers['ETag']
+        self.assertEqual(etag, plain.headers['ETag'][:-1] + '-gzip"')
+        revalidated = self.client.get(url, headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.headers['ETag'], etag)
+        small = self.client.get(f'/api/v1/users/{self.owner.id}', headers={'Accept-Encoding': 'gzip'})
+        self.assertNotIn('Content-Encoding', small.headers)
+        identity = self.client.get(url, headers={'Accept-Encoding': 'identity'})
+        self.assertNotIn('Content-Encoding', identity.headers)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+from app import create_app, db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.services.facade import HBnBFacade
+from app.utils.query_counter import CommitCounter
+
+class TestUnitOfWork(unittest.TestCase):
+    def setUp(self):
+        """Create an owner and a place to attach amenities and reviews to."""
+        self.app = create_app("config.TestingConfig")
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.facade = HBnBFacade()
+        self.owner = self.create_user("owner")
+        self.reviewer = self.create_user("reviewer")
+        self.place_id = self.facade.create_place({
+            "title": "Loft",
+            "description": "A loft",
+            "price": 80,
+            "latitude": 1.0,
+            "longitude": 1.0,
+            "owner_id": self.owner.id
+        })["id"]
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def create_user(self, name):
+        return self.facade.create_user({
+            "first_name": name,
+            "last_name": "User",
+            "email": f"{name}@example.com",
+            "password": "secret"
+        })
+
+    def test_create_amenity_commits_once(self):
+        """Test that the amenity and its place link are written in one transaction."""
+        with CommitCounter() as counter:
+            amenity = self.facade.create_amenity({"name": "WiFi", "place_id": self.place_id})
+        self.assertEqual(counter.count, 1)
+        db.session.expire_all()
+        self.assertEqual([a.id for a in db.session.get(Place, self.place_id).amenities], [amenity.id])
+
+    def test_review_and_aggregates_commit_once(self):
+        """Test that a review and its rating aggregate update share one commit."""
+        with CommitCounter() as counter:
+            self.facade.create_review({"text": "Nice", "rating": 4,
+                                       "user_id": self.reviewer.id, "place_id": self.place_id})
+        self.assertEqual(counter.count, 1)
+
+    def test_transaction_batches_writes(self):
+        """Test that facade calls inside transaction() share a single commit."""
+        with CommitCounter() as counter:
+            with self.facade.transaction():
+                for name in ("WiFi", "Pool", "Parking"):
+                    self.facade.create_amenity({"name": name, "place_id": self.place_id})
+                self.facade.update_place(self.place_id, {"price": 90})
+        self.assertEqual(counter.count, 1)
+        self.assertEqual(Amenity.query.count(), 3)
+
+    def test_transaction_rolls_back_on_error(self):
+        """Test that an error inside the unit of work discards every write made in it."""
+        with self.assertRaises(ValueError):
+            with self.facade.transaction():
+                self.facade.create_amenity({"name": "WiFi", "place_id": self.place_id})
+                self.facade.create_amenity({"name": "Pool", "place_id": "missing"})
+        self.assertEqual(Amenity.query.count(), 0)
+        self.assertEqual(db.session.get(Place, self.place_id).amenities, [])
+        # The session is usable again after the rollback.
+        self.facade.create_amenity({"name": "Pool", "place_id": self.place_id})
+        self.assertEqual(Amenity.query.count(), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+import unittest
+from unittest import mock
+from datetime import datetime, timedelta, timezone
+from flask_jwt_extended import create_access_token
+from werkzeug.http import http_date
+from app import create_app, db
+from app.models.place import Place
+from app.persistence.repository import UpdateConflict
+from app.services.facade import get_facade
+from app.utils.geo import geohash_encode
+from app.utils.query_counter import QueryCounter
+from config import TestingConfig
+
+class TestTargetedUpdates(unittest.TestCase):
+    def setUp(self):
+        """Seed a place, a review of it, and tokens for its owner and for the reviewer."""
+        self.app = create_app(TestingConfig)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        self.facade = get_facade()
+        self.owner = self.create_user("owner")
+        self.reviewer = self.create_user("reviewer")
+        self.place = self.facade.create_place({
+            "title": "Beach house", "description": "Sunny", "price": 80, "latitude": 10.0, "longitude": 20.0,
+            "owner_id": self.owner.id
+        })["id"]
+        self.review = self.facade.create_review({"text": "Great", "rating": 5,
+                                                 "user_id": self.reviewer.id, "place_id": self.place}).id
+        self.owner_headers = {'Authorization': f'Bearer {create_access_token(identity=self.owner.id)}'}
+        self.reviewer_headers = {'Authorization': f'Bearer {create_access_token(identity=self.reviewer.id)}'}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def create_user(self, name):
+        return self.facade.create_user({"first_name": name, "last_name": "User",
+                                        "email": f"{name}@example.com", "password": "secret"})
+
+    def stored(self, place_id):
+        db.session.expire_all()
+        return db.session.get(Place, place_id)
+
+    def test_update_is_one_statement(self):
+        """Test that facade updates issue a single UPDATE ... RETURNING and serialize from it."""
+        owner_id = self.owner.id
+        for update in (lambda: self.facade.update_place(self.place, {"price": 90.0}),
+                       lambda: self.facade.update_review(self.review, {"text": "Still great"}),
+                       lambda: self.facade.update_user(owner_id, {"first_name": "Renamed"})):
+            db.session.expire_all()
+            with QueryCounter() as counter:
+                result = update()
+                result = result if isinstance(result, dict) else result.to_dict()
+            self.assertEqual(len(counter.statements), 1, counter.statements)
+            self.assertTrue(counter.statements[0].startswith('UPDATE'))
+            self.assertIn('RETURNING', counter.statements[0])
+        self.assertEqual(result['first_name'], 'Renamed')
+        self.assertEqual(self.stored(self.place).price, 90.0)
+        self.assertIsNone(self.facade.update_place('missing', {"price": 1.0}))
+
+    def test_update_without_returning(self):
+        """Test the path for databases without UPDATE ... RETURNING: UPDATE, then SELECT by id."""
+        with mock.patch.object(db.engine.dialect, 'update_returning', False):
+            db.session.expire_all()
+            with QueryCounter() as counter:
+                place = self.facade.update_place(self.place, {"price": 90.0})
+            self.assertEqual(place['price'], 90.0)
+            self.assertEqual(len(counter.statements), 2, counter.statements)
+            self.assertTrue(counter.statements[0].startswith('UPDATE'))
+            self.assertNotIn('RETURNING', counter.statements[0])
+            self.assertTrue(counter.statements[1].startswith('SELECT'))
+            self.assertIsNone(self.facade.update_place('missing', {"price": 1.0}))
+            with self.assertRaises(UpdateConflict):
+                self.facade.update_place(self.place, {"price": 1.0}, owner_id=self.reviewer.id)
+            response = self.client.put(f'/api/v1/places/{self.place}', json={"price": 95.0},
+                                       headers=self.owner_headers)
+            self.assertEqual(response.get_json()['place']['price'], 95.0)
+        self.assertEqual(self.stored(self.place).price, 95.0)
+
+    def test_geohash_follows_coordinates(self):
+        """Test that the geohash is kept in sync whether one or both coordinates change."""
+        self.facade.update_place(self.place, {"latitude": 45.764, "longitude": 4.8357})
+        self.assertEqual(self.stored(self.place).geohash, geohash_encode(45.764, 4.8357))
+        with QueryCounter() as counter:
+            self.facade.update_place(self.place, {"latitude": 43.2965})
+        self.assertEqual(counter.count, 2)
+        self.assertEqual(self.stored(self.place).geohash, geohash_encode(43.2965, 4.8357))
+
+    def test_rating_update_is_guarded(self):
+        """Test that a rating change moves the aggregates and only overwrites the rating it read."""
+        self.facade.update_review(self.review, {"rating": 2})
+        self.assertEqual(self.stored(self.place).rating_sum, 2)
+        with self.assertRaises(UpdateConflict) as raised:
+            self.facade.review_repository.update(self.review, {"rating": 4}, expected={"rating": 5})
+        self.assertEqual(raised.exception.conditions, ('rating',))
+        self.assertEqual(self.stored(self.place).rating_sum, 2)
+
+    def test_put_checks_ownership_in_the_update(self):
+        """Test that PUT answers 403 to non-owners, 404 to missing places, and 200 in one statement."""
+        url = f'/api/v1/places/{self.place}'
+        response = self.client.put(url, json={"price": 1.0}, headers=self.reviewer_headers)
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self.stored(self.place).price, 80.0)
+        self.assertEqual(self.client.put('/api/v1/places/missing', json={"price": 1.0},
+                                         headers=self.owner_headers).status_code, 404)
+        with QueryCounter() as counter:
+            response = self.client.put(url, json={"price": 95.0}, headers=self.owner_headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['place']['price'], 95.0)
+        self.assertEqual(counter.count, 1)
+        response = self.client.put(f'/api/v1/reviews/{self.review}', json={"text": "Meh"}, headers=self.owner_headers)
+        self.assertEqual(response.status_code, 403)
+        response = self.client.put(f'/api/v1/reviews/{self.review}', json={"text": "Meh"},
+                                   headers=self.reviewer_headers)
+        self.assertEqual(response.get_json()['review']['text'], 'Meh')
+
+    def test_put_ignores_protected_fields(self):
+        """Test that PUT cannot overwrite a place's owner or rating aggregates, nor a review's author."""
+        response = self.client.put(f'/api/v1/places/{self.place}', headers=self.owner_headers, json={
+            "price": 85.0, "owner_id": self.reviewer.id, "review_count": 99, "rating_sum": 1, "rating_count_5": 0})
+        self.assertEqual(response.status_code, 200)
+        place = self.stored(self.place)
+        self.assertEqual((place.price, place.owner_id), (85.0, self.owner.id))
+        self.assertEqual((place.review_count, place.rating_sum, place.rating_count_5), (1, 5, 1))
+        response = self.client.put(f'/api/v1/reviews/{self.review}', headers=self.reviewer_headers,
+                                   json={"text": "Fine", "user_id": self.owner.id})
+        self.assertEqual(response.get_json()['review']['user_id'], self.reviewer.id)
+
+    def test_if_unmodified_since(self):
+        """Test the optimistic write: 412 once the place changed after the client's copy."""
+        url = f'/api/v1/places/{self.place}'
+        last_modified = self.client.get(url).headers['Last-Modified']
+        earlier = http_date(datetime.now(timezone.utc) - timedelta(hours=1))
+        response = self.client.put(url, json={"price": 70.0},
+                                   headers=dict(self.owner_headers, **{'If-Unmodified-Since': earlier}))
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual(self.stored(self.place).price, 80.0)
+        response = self.client.put(url, json={"price": 70.0},
+                                   headers=dict(self.owner_headers, **{'If-Unmodified-Since': last_modified}))
+        self.assertEqual(response.status_code, 200)
+
+    def test_password_update_is_hashed(self):
+        """Test that a password set through update_user is stored hashed."""
+        user = self.facade.update_user(self.owner.id, {"password": "changed"})
+        self.assertNotEqual(user.password, "changed")
+        self.assertTrue(user.verify_password("changed"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.services.facade import get_facade
+from app.utils.query_counter import QueryCounter
+from config import TestingConfig
+
+class TestUserBatchLookup(unittest.TestCase):
+    def setUp(self):
+        """Create a few users and a token to read them with."""
+        self.app = create_app(TestingConfig)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        facade = get_facade()
+        self.users = [facade.create_user({"first_name": f"User{i}", "last_name": "Test",
+                                          "email": f"user{i}@example.com", "password": "secret"})
+                      for i in range(4)]
+        token = create_access_token(identity=self.users[0].id)
+        self.headers = {'Authorization': f'Bearer {token}'}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_ids_lookup(self):
+        """Test that ?ids= returns the known users in the order asked, in one query."""
+        ids = [self.users[2].id, 'missing', self.users[0].id, self.users[2].id]
+        db.session.expire_all()
+        with QueryCounter() as counter:
+            response = self.client.get(f'/api/v1/users/?ids={",".join(ids)}', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        body = response.get_json()
+        self.assertEqual([user['id'] for user in body['items']], [self.users[2].id, self.users[0].id])
+        self.assertEqual(body['items'][0]['first_name'], 'User2')
+        self.assertIsNone(body['next_cursor'])
+        # The version probe, then the users themselves.
+        self.assertEqual(counter.count, 2)
+
+    def test_ids_lookup_limits(self):
+        """Test that the lookup is authenticated, bounded and revalidates with its ETag."""
+        url = f'/api/v1/users/?ids={self.users[1].id}'
+        self.assertEqual(self.client.get(url).status_code, 401)
+        etag = self.client.get(url, headers=self.headers).headers['ETag']
+        response = self.client.get(url, headers=dict(self.headers, **{'If-None-Match': etag}))
+        self.assertEqual(response.status_code, 304)
+        too_many = ','.join(f'id{i}' for i in range(501))
+        self.assertEqual(self.client.get(f'/api/v1/users/?ids={too_many}', headers=self.headers).status_code, 400)
+
+if __name__ == '__main__':
+    unittest.main()
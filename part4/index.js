@@ -48,23 +48,41 @@ document.addEventListener('DOMContentLoaded', () => {
     let allPlaces = [];
 
     // NOTE: URL includes a trailing slash to prevent redirects.
-    async function fetchPlaces() {
+    async function fetchPlaces(maxPrice) {
       const token = getCookie('token');
       const headers = { 'Content-Type': 'application/json' };
       if (token) {
         headers['Authorization'] = `Bearer ${token}`;
       }
       try {
-        const response = await fetch('http://localhost:5000/api/v1/places/', {
-          method: 'GET',
-          headers: headers
-        });
-        if (!response.ok) {
-          throw new Error('Failed to fetch places');
-        }
-        const data = await response.json();
-        console.log('[Index] Fetched places:', data);
-        return data; // Expected to be an array of place objects.
+        // The list endpoint is paginated: follow next_cursor until the last page.
+        const places = [];
+        let cursor = null;
+        do {
+          const url = new URL('http://localhost:5000/api/v1/places/');
+          url.searchParams.set('limit', '100');
+          // Listing cards only need these columns; skip owner/amenities/reviews.
+          url.searchParams.set('fields', 'title,description,price,latitude,longitude');
+          url.searchParams.set('embed', '');
+          if (maxPrice && maxPrice !== 'All') {
+            url.searchParams.set('max_price', maxPrice);
+          }
+          if (cursor) {
+            url.searchParams.set('cursor', cursor);
+          }
+          const response = await fetch(url, {
+            method: 'GET',
+            headers: headers
+          });
+          if (!response.ok) {
+            throw new Error('Failed to fetch places');
+          }
+          const data = await response.json();
+          places.push(...data.items);
+          cursor = data.next_cursor;
+        } while (cursor);
+        console.log('[Index] Fetched places:', places);
+        return places; // Array of place objects.
       } catch (error) {
         console.error('[Index] Error fetching places:', error);
         const errorMessageDiv = document.getElementById('error-message');
@@ -97,8 +115,8 @@ document.addEventListener('DOMContentLoaded', () => {
       });
     }
 
-    async function initializePlaces() {
-      allPlaces = await fetchPlaces();
+    async function initializePlaces(maxPrice) {
+      allPlaces = await fetchPlaces(maxPrice);
       renderPlaces(allPlaces);
     }
     // Call displayErrorMessage before rendering places
@@ -106,7 +124,7 @@ document.addEventListener('DOMContentLoaded', () => {
     initializePlaces();
 
     // -----------------------------------------------------------
-    // Client-Side Filtering by Price Using element.style.display
+    // Price Filter: the API filters by max_price server-side
     // -----------------------------------------------------------
     // Expected dropdown options: 10, 50, 100, All.
     const filterSelect = document.getElementById('max-price');
@@ -114,15 +132,7 @@ document.addEventListener('DOMContentLoaded', () => {
       filterSelect.addEventListener('change', () => {
         const selectedValue = filterSelect.value;
         console.log('[Index] Filter selected:', selectedValue);
-        const placeCards = document.querySelectorAll('.place-card');
-        placeCards.forEach(card => {
-          const price = parseFloat(card.getAttribute('data-price'));
-          if (selectedValue === "All" || price <= parseFloat(selectedValue)) {
-            card.style.display = 'block';
-          } else {
-            card.style.display = 'none';
-          }
-        });
+        initializePlaces(selectedValue);
       });
     }
   }
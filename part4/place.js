@@ -48,30 +48,8 @@ document.addEventListener('DOMContentLoaded', () => {
         return null;
     };
 
-    // Function to fetch user details by user_id
-    const fetchUserDetails = async (userId) => {
-        const token = getCookie('token');
-        try {
-            const response = await fetch(`http://localhost:5000/api/v1/users/${userId}`, {
-                method: 'GET',
-                headers: {
-                    'Content-Type': 'application/json',
-                    'Authorization': token ? `Bearer ${token}` : ''
-                }
-            });
-            if (!response.ok) {
-                throw new Error(`Failed to fetch user details for user_id: ${userId}, Status: ${response.status}`);
-            }
-            const userData = await response.json();
-            return userData;
-        } catch (error) {
-            console.error('[Place] Error fetching user details:', error);
-            return null;
-        }
-    };
-
     // Function to render reviews dynamically
-    const renderReviews = async (reviews) => {
+    const renderReviews = (reviews) => {
         const reviewsSection = document.getElementById('reviews');
         const reviewsContainer = reviewsSection.querySelector('h3').nextElementSibling || document.createElement('div');
         reviewsContainer.innerHTML = ''; // Clear existing reviews
@@ -87,11 +65,8 @@ document.addEventListener('DOMContentLoaded', () => {
             reviewCard.classList.add('review-card');
             const stars = '★'.repeat(review.rating) + '☆'.repeat(5 - review.rating);
 
-            // Fetch user details for the reviewer
-            const user = await fetchUserDetails(review.user_id);
-            const reviewerName = user && user.first_name && user.last_name 
-                ? `${user.first_name} ${user.last_name}`
-                : `User ID: ${review.user_id}`;
+            // The place payload carries each reviewer's name, so no per-review user lookup is needed.
+            const reviewerName = review.user_name || `User ID: ${review.user_id}`;
 
             reviewCard.innerHTML = `
                 <p><strong>${reviewerName}</strong></p>